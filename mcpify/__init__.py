@@ -3,19 +3,37 @@ MCPify - Automatically detect APIs and generate MCP server configurations.
 
 This package provides tools to analyze existing projects and transform them into
 Model Context Protocol (MCP) servers.
+
+Public names are imported on first access (PEP 562), so serving a config
+never loads the detectors and the LLM SDKs they depend on.
 """
 
-from .detect import (
-    BaseDetector,
-    CamelDetector,
-    OpenaiDetector,
-    create_detector,
-)
-from .validate import validate_config_dict, validate_config_file
-from .wrapper import MCPWrapper
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .detect import (
+        BaseDetector,
+        CamelDetector,
+        OpenaiDetector,
+        create_detector,
+    )
+    from .validate import validate_config_dict, validate_config_file
+    from .wrapper import MCPWrapper
 
 __version__ = "0.1.0"
 
+# Public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    "MCPWrapper": ".wrapper",
+    "validate_config_dict": ".validate",
+    "validate_config_file": ".validate",
+    "BaseDetector": ".detect",
+    "CamelDetector": ".detect",
+    "OpenaiDetector": ".detect",
+    "create_detector": ".detect",
+}
+
 __all__ = [
     # Core functionality
     "MCPWrapper",
@@ -29,3 +47,18 @@ __all__ = [
     # Version
     "__version__",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names from their submodule on first access."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the lazy public names alongside the loaded ones."""
+    return sorted(set(globals()) | set(__all__))
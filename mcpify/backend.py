@@ -4,22 +4,237 @@ Backend adapter module - supports multiple backend program types
 """
 
 import asyncio
-import subprocess
+import codecs
+import contextlib
+import importlib
+import importlib.util
+import inspect
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Any
+from collections import OrderedDict, deque
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote
 
-import aiohttp
+if TYPE_CHECKING:
+    # Imported on first use, commandline and server backends don't need it
+    import aiohttp
+
+
+class ToolExecutionError(Exception):
+    """Raised by streaming tool calls, the message is the tool's error result"""
+
+    pass
+
+
+class ToolTemplate:
+    """A tool's args or command template compiled into a render plan
+
+    Elements are strings with {name} placeholders anywhere in them, or
+    lists of such strings that are rendered or left out together. Elements
+    referring to an optional parameter are left out when it is missing or
+    None, and a list value repeats the element once per item.
+    """
+
+    # Doubled braces are literal braces
+    PLACEHOLDER = re.compile(r"\{\{|\}\}|\{(\w+)\}")
+    # Separates the tokens of a command string, kept by split()
+    WHITESPACE = re.compile(r"(\s+)")
+
+    def __init__(self, template: list[Any] | str, optional: Any = ()) -> None:
+        self.optional = frozenset(optional)
+        elements = [template] if isinstance(template, str) else template
+        # Each group is (pieces, names), a piece alternates literal text and
+        # parameter names, starting and ending with literal text
+        self.groups: list[tuple[list[tuple[str, ...]], tuple[str, ...]]] = []
+        for element in elements:
+            strings = element if isinstance(element, list) else [element]
+            pieces = [self._compile(str(text)) for text in strings]
+            names = tuple(dict.fromkeys(n for piece in pieces for n in piece[1::2]))
+            self.groups.append((pieces, names))
+
+    @classmethod
+    def _compile(cls, text: str) -> tuple[str, ...]:
+        """Split a string into alternating literal text and parameter names"""
+        parts: list[str] = []
+        literal = ""
+        position = 0
+        for match in cls.PLACEHOLDER.finditer(text):
+            literal += text[position : match.start()]
+            position = match.end()
+            if match.group(1) is None:
+                literal += match.group(0)[0]
+            else:
+                parts += [literal, match.group(1)]
+                literal = ""
+        parts.append(literal + text[position:])
+        return tuple(parts)
+
+    @classmethod
+    def for_tool(cls, tool_config: dict[str, Any], key: str = "args") -> "ToolTemplate":
+        """Compile a tool's template, taking optional parameters from its config"""
+        optional = [
+            param["name"]
+            for param in tool_config.get("parameters", [])
+            if not param.get("required", True)
+        ]
+        return cls(tool_config.get(key, []), optional)
+
+    def plan(self) -> tuple[Any, ...]:
+        """Return the compiled template as plain data for snapshots"""
+        return (sorted(self.optional), self.groups)
+
+    @classmethod
+    def from_plan(cls, plan: tuple[Any, ...] | list[Any]) -> "ToolTemplate":
+        """Rebuild a template from plan() output without recompiling it"""
+        template = cls.__new__(cls)
+        optional, groups = plan
+        template.optional = frozenset(optional)
+        template.groups = [
+            ([tuple(piece) for piece in pieces], tuple(names))
+            for pieces, names in groups
+        ]
+        return template
+
+    def render_args(self, parameters: dict[str, Any]) -> list[str]:
+        """Render the template into an argument list"""
+        argv: list[str] = []
+        for pieces, names in self.groups:
+            if not names:
+                argv.extend(piece[0] for piece in pieces)
+                continue
+            values = self._values(names, parameters)
+            if values is None:
+                continue
+            expand = [name for name in names if isinstance(values[name], list)]
+            if len(expand) > 1:
+                raise ValueError(
+                    f"Parameters {', '.join(expand)} can't be expanded together"
+                )
+            if not expand:
+                argv.extend(self._fill(piece, values) for piece in pieces)
+                continue
+            for item in values[expand[0]]:
+                item_values = {**values, expand[0]: item}
+                argv.extend(self._fill(piece, item_values) for piece in pieces)
+        return argv
+
+    def render_string(self, parameters: dict[str, Any]) -> str:
+        """Render a command string, joining list values with spaces
+
+        A whitespace-separated token referring to a missing optional
+        parameter is left out, like an element of an args template.
+        """
+        return "".join(
+            self._render_tokens(piece, parameters)
+            for pieces, _ in self.groups
+            for piece in pieces
+        )
+
+    def _render_tokens(self, piece: tuple[str, ...], parameters: dict[str, Any]) -> str:
+        """Render one compiled string token by token"""
+        # (separator before, text, left out) for each token
+        tokens: list[tuple[str, str, bool]] = []
+        separator = ""
+        text: list[str] = []
+        missing = False
+        for i, part in enumerate(piece):
+            if i % 2 == 1:
+                value = parameters.get(part)
+                if value is None:
+                    if part not in self.optional:
+                        raise ValueError(f"Missing required parameter '{part}'")
+                    missing = True
+                elif isinstance(value, list):
+                    text.append(" ".join(str(item) for item in value))
+                else:
+                    text.append(str(value))
+                continue
+            for j, chunk in enumerate(self.WHITESPACE.split(part)):
+                if j % 2 == 0:
+                    text.append(chunk)
+                    continue
+                tokens.append((separator, "".join(text), missing))
+                separator, text, missing = chunk, [], False
+        tokens.append((separator, "".join(text), missing))
+
+        kept = [(sep, token) for sep, token, left_out in tokens if not left_out]
+        if not kept:
+            return ""
+        # Nothing is left in front of the first kept token to separate
+        return kept[0][1] + "".join(sep + token for sep, token in kept[1:])
+
+    def _values(
+        self, names: tuple[str, ...], parameters: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Look up an element's parameters, None if it should be left out"""
+        values = {}
+        for name in names:
+            value = parameters.get(name)
+            if value is None:
+                if name in self.optional:
+                    return None
+                raise ValueError(f"Missing required parameter '{name}'")
+            values[name] = value
+        return values
+
+    @staticmethod
+    def _fill(piece: tuple[str, ...], values: dict[str, Any]) -> str:
+        """Substitute values into one compiled string"""
+        if len(piece) == 1:
+            return piece[0]
+        if len(piece) == 3 and not piece[0] and not piece[2]:
+            return str(values[piece[1]])
+        return "".join(
+            part if i % 2 == 0 else str(values[part]) for i, part in enumerate(piece)
+        )
 
 
 class BackendAdapter(ABC):
     """Backend program adapter base class"""
 
+    def compile_tool(self, tool_config: dict[str, Any]) -> Any:
+        """Build the tool's render plan as plain data, None if there is none"""
+        return None
+
+    def prepare_tool(  # noqa: B027
+        self, tool_config: dict[str, Any], plan: Any = None
+    ) -> None:
+        """Precompile what the adapter needs for a tool, called at registration
+
+        plan is compile_tool() output loaded from a config snapshot.
+        """
+        pass
+
+    def is_up(self) -> bool:
+        """Whether the backend can currently serve calls"""
+        return True
+
     @abstractmethod
     async def execute_tool(self, tool_config: dict[str, Any], parameters: Any) -> str:
         """Execute tool call"""
         pass
 
+    async def execute_tool_stream(
+        self, tool_config: dict[str, Any], parameters: Any
+    ) -> AsyncGenerator[str, None]:
+        """Execute tool call, yielding output as it arrives
+
+        Backends that can't stream yield the whole result at once.
+        """
+        yield await self.execute_tool(tool_config, parameters)
+
     @abstractmethod
     async def start(self) -> None:
         """Start backend program"""
@@ -39,253 +254,1432 @@ class CommandLineAdapter(BackendAdapter):
         self.command = config["command"]
         self.base_args = config.get("args", [])
         self.cwd = config.get("cwd", ".")
+        # Optional cap on the number of child processes running at once
+        self.max_concurrency: int | None = config.get("max_concurrency")
+        self._semaphore: asyncio.Semaphore | None = (
+            asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        )
+        # Compiled args templates, keyed on tool name
+        self._templates: dict[str, ToolTemplate] = {}
+        # Python scripts can run through a warm fork server instead of
+        # starting a fresh interpreter per call
+        self.fork_server: ServerWorker | None = None
+        if config.get("fork_server", False):
+            if self._can_fork_server():
+                self.fork_server = ServerWorker(
+                    {
+                        "command": self.command,
+                        "args": [
+                            str(Path(__file__).parent / "forkserver.py"),
+                            self.base_args[0],
+                        ],
+                        "cwd": self.cwd,
+                        "startup_timeout": config.get("startup_timeout", 30),
+                        "ready_signal": "mcpify-forkserver ready",
+                        "protocol": "jsonl",
+                        "send_cancel": True,
+                        "stream_limit": config.get(
+                            "stream_limit", ServerWorker.STREAM_LIMIT
+                        ),
+                    }
+                )
+            else:
+                print(
+                    "⚠️  fork_server needs a Python command with a script as its "
+                    "first argument, running tools as plain commands",
+                    file=sys.stderr,
+                )
+
+    def _can_fork_server(self) -> bool:
+        """Check whether the backend runs a Python script on a forking OS"""
+        return (
+            hasattr(os, "fork")
+            and Path(self.command).name.startswith("python")
+            and bool(self.base_args)
+            and self.base_args[0].endswith(".py")
+        )
 
     async def start(self) -> None:
-        """Command line programs don't need startup"""
-        pass
+        """Start the fork server, plain command line programs need no startup"""
+        if self.fork_server is not None:
+            await self.fork_server.start()
 
     async def stop(self) -> None:
-        """Command line programs don't need shutdown"""
-        pass
+        """Stop the fork server, plain command line programs need no shutdown"""
+        if self.fork_server is not None:
+            await self.fork_server.stop()
+
+    def compile_tool(self, tool_config: dict[str, Any]) -> Any:
+        """Compile the tool's args template"""
+        return ToolTemplate.for_tool(tool_config).plan()
+
+    def prepare_tool(self, tool_config: dict[str, Any], plan: Any = None) -> None:
+        """Compile the tool's args template, or load its compiled plan"""
+        self._templates[tool_config["name"]] = (
+            ToolTemplate.from_plan(plan)
+            if plan is not None
+            else ToolTemplate.for_tool(tool_config)
+        )
+
+    def _render_args(self, tool_config: dict[str, Any], parameters: Any) -> list[str]:
+        """Substitute parameters into the tool's compiled args template"""
+        if tool_config["name"] not in self._templates:
+            self.prepare_tool(tool_config)
+        return self._templates[tool_config["name"]].render_args(parameters)
 
     async def execute_tool(self, tool_config: dict[str, Any], parameters: Any) -> str:
         """Execute command line tool"""
-        cmd_args = []
-        args_template = tool_config.get("args", [])
-
-        for arg in args_template:
-            if arg.startswith("{") and arg.endswith("}"):
-                param_name = arg.strip("{}")
-                value = parameters.get(param_name, "")
-                cmd_args.append(str(value))
-            else:
-                cmd_args.append(arg)
+        try:
+            cmd_args = self._render_args(tool_config, parameters)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+
+        limit = self._semaphore or contextlib.nullcontext()
+        if self.fork_server is not None:
+            async with limit:
+                return await self.fork_server.request(self.base_args[1:] + cmd_args)
+
+        full_command = [self.command] + self.base_args + cmd_args
+
+        async with limit:
+            returncode, stdout, stderr = await self._run(full_command)
+
+        if returncode != 0:
+            return f"Error: {stderr.strip()}"
+        return stdout.strip()
+
+    async def execute_tool_stream(
+        self, tool_config: dict[str, Any], parameters: Any
+    ) -> AsyncGenerator[str, None]:
+        """Execute command line tool, yielding stdout as it is written"""
+        if self.fork_server is not None:
+            # Fork server replies arrive whole
+            yield await self.execute_tool(tool_config, parameters)
+            return
 
+        try:
+            cmd_args = self._render_args(tool_config, parameters)
+        except ValueError as e:
+            raise ToolExecutionError(f"Error: {str(e)}") from e
         full_command = [self.command] + self.base_args + cmd_args
 
-        result = subprocess.run(
-            full_command, capture_output=True, text=True, cwd=self.cwd
+        limit = self._semaphore or contextlib.nullcontext()
+        async with limit:
+            process = await asyncio.create_subprocess_exec(
+                *full_command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.cwd,
+            )
+            if process.stdout is None or process.stderr is None:
+                raise RuntimeError("Process output is not available")
+            stderr_reader = asyncio.ensure_future(process.stderr.read())
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+            try:
+                while chunk := await process.stdout.read(65536):
+                    if text := decoder.decode(chunk):
+                        yield text
+                if text := decoder.decode(b"", final=True):
+                    yield text
+                await process.wait()
+            finally:
+                # The caller stopped reading or was cancelled
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                stderr = await stderr_reader
+
+        if process.returncode != 0:
+            raise ToolExecutionError(
+                f"Error: {stderr.decode(errors='replace').strip()}"
+            )
+
+    async def _run(self, full_command: list[str]) -> tuple[int, str, str]:
+        """Run a child process without blocking the event loop"""
+        process = await asyncio.create_subprocess_exec(
+            *full_command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
         )
 
-        if result.returncode != 0:
-            return f"Error: {result.stderr.strip()}"
-        return result.stdout.strip()
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            # The MCP request was cancelled or timed out, don't leave the
+            # child running
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
 
+        return (
+            process.returncode if process.returncode is not None else -1,
+            stdout.decode(errors="replace"),
+            stderr.decode(errors="replace"),
+        )
 
-class ServerAdapter(BackendAdapter):
-    """Server program adapter"""
+
+class ServerWorker:
+    """A single interactive server process driven over stdin/stdout"""
+
+    # Supported ways of finding the end of a response
+    FRAMINGS = ("line", "sentinel", "length", "idle")
+
+    # Supported wire protocols: plain text commands answered in order, or
+    # JSON lines tagged with request ids that may be answered out of order
+    PROTOCOLS = ("text", "jsonl")
+
+    # Default longest line the server may write, asyncio's own is only 64 KiB
+    STREAM_LIMIT = 16 * 1024 * 1024
 
     def __init__(self, config: dict[str, Any]) -> None:
-        self.config = config
         self.command = config["command"]
         self.args = config.get("args", [])
         self.cwd = config.get("cwd", ".")
         self.startup_timeout = config.get("startup_timeout", 5)
         self.ready_signal = config.get("ready_signal", "")
-        self.process: subprocess.Popen | None = None
+        self.framing = config.get("framing", "line")
+        self.terminator = config.get("terminator", "END")
+        self.idle_timeout = config.get("idle_timeout", 0.2)
+        self.protocol = config.get("protocol", "text")
+        self.stream_limit = config.get("stream_limit", self.STREAM_LIMIT)
+        # Tell JSON-lines servers about requests that were cancelled
+        self.send_cancel = config.get("send_cancel", False)
+        if self.framing not in self.FRAMINGS:
+            raise ValueError(f"Unsupported response framing: {self.framing}")
+        if self.protocol not in self.PROTOCOLS:
+            raise ValueError(f"Unsupported server protocol: {self.protocol}")
+        self.process: asyncio.subprocess.Process | None = None
         self.ready = False
+        self.outstanding = 0
+        # Set while the supervisor waits for calls to finish before a restart
+        self.draining = False
         self.lock = asyncio.Lock()
+        # Last stderr lines, drained continuously so the child never blocks
+        self.stderr_tail: deque[str] = deque(maxlen=20)
+        self._stderr_task: asyncio.Task | None = None
+        # In-flight JSON-lines requests by id
+        self._pending: dict[int, asyncio.Future[str]] = {}
+        self._request_ids = itertools.count(1)
+        self._reader_task: asyncio.Task | None = None
 
     async def start(self) -> None:
         """Start server program"""
         if self.process is not None:
             return
 
-        print(f"🚀 Starting server: {self.command} {' '.join(self.args)}")
+        print(
+            f"🚀 Starting server: {self.command} {' '.join(self.args)}", file=sys.stderr
+        )
 
-        self.process = subprocess.Popen(
-            [self.command] + self.args,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        self.process = await asyncio.create_subprocess_exec(
+            self.command,
+            *self.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             cwd=self.cwd,
-            bufsize=0,
+            limit=self.stream_limit,
         )
+        self.stderr_tail.clear()
+        self._stderr_task = asyncio.create_task(self._drain_stderr(self.process))
 
         # Wait for server to be ready
         if self.ready_signal:
-            await self._wait_for_ready()
+            try:
+                await asyncio.wait_for(
+                    self._wait_for_ready(), timeout=self.startup_timeout
+                )
+            except asyncio.TimeoutError:
+                await self._kill()
+                raise TimeoutError(
+                    f"Server startup timeout ({self.startup_timeout}s)"
+                ) from None
         else:
             await asyncio.sleep(1)  # Default wait 1 second
+            self.ready = True
+
+        if self.protocol == "jsonl":
+            self._reader_task = asyncio.create_task(self._read_replies(self.process))
 
-        print("✅ Server startup complete")
+        print("✅ Server startup complete", file=sys.stderr)
+
+    @property
+    def up(self) -> bool:
+        """Whether the server process is running and ready"""
+        return (
+            self.ready and self.process is not None and self.process.returncode is None
+        )
 
     async def _wait_for_ready(self) -> None:
         """Wait for server ready signal"""
-        if self.process is None:
-            raise RuntimeError("Server process is not started")
+        stdout = self._stdout()
 
-        start_time = time.time()
-
-        while time.time() - start_time < self.startup_timeout:
-            if self.process.poll() is not None:
-                if self.process.stderr is not None:
-                    stderr = self.process.stderr.read()
-                else:
-                    raise RuntimeError("Process stderr is not available")
+        while True:
+            line = await stdout.readline()
+            if not line:
+                if self._stderr_task is not None:
+                    await self._stderr_task
+                await self._kill()
+                stderr = "\n".join(self.stderr_tail)
                 raise RuntimeError(f"Server startup failed: {stderr}")
-
-            # Non-blocking read output
-            try:
-                if self.process.stdout is not None:
-                    line = self.process.stdout.readline()
-                    if line and self.ready_signal in line:
-                        self.ready = True
-                        return
-                else:
-                    raise RuntimeError("Process stdout is not available")
-            except Exception:
-                pass
-
-            await asyncio.sleep(0.1)
-
-        raise TimeoutError(f"Server startup timeout ({self.startup_timeout}s)")
+            if self.ready_signal in line.decode(errors="replace"):
+                self.ready = True
+                return
 
     async def stop(self) -> None:
         """Stop server program"""
         if self.process is None:
             return
 
-        print("🛑 Stopping server...")
+        print("🛑 Stopping server...", file=sys.stderr)
 
         try:
             if self.process.stdin is not None:
                 # Send quit command
-                self.process.stdin.write("quit\n")
-                self.process.stdin.flush()
+                self.process.stdin.write(b"quit\n")
+                await self.process.stdin.drain()
 
                 # Wait for process to end
                 try:
-                    self.process.wait(timeout=3)
-                except subprocess.TimeoutExpired:
+                    await asyncio.wait_for(self.process.wait(), timeout=3)
+                except asyncio.TimeoutError:
                     self.process.terminate()
-                    self.process.wait(timeout=3)
+                    await asyncio.wait_for(self.process.wait(), timeout=3)
             else:
                 raise RuntimeError(
                     "Process stdin is not available for sending quit command"
                 )
         except Exception:
-            if self.process.poll() is None:
-                self.process.kill()
+            await self._kill()
 
         self.process = None
         self.ready = False
-        print("✅ Server stopped")
+        self._fail_pending(RuntimeError("Server stopped"))
+        print("✅ Server stopped", file=sys.stderr)
 
-    async def execute_tool(self, tool_config: dict[str, Any], parameters: Any) -> str:
-        """Execute server tool"""
-        if not self.ready or self.process is None:
-            await self.start()
+    async def _drain_stderr(self, process: asyncio.subprocess.Process) -> None:
+        """Keep the tail of the server's stderr"""
+        if process.stderr is None:
+            return
+        while line := await process.stderr.readline():
+            self.stderr_tail.append(line.decode(errors="replace").rstrip())
+
+    async def _kill(self) -> None:
+        """Kill the server process without a shutdown handshake"""
+        if self.process is not None and self.process.returncode is None:
+            self.process.kill()
+            await self.process.wait()
+        self.process = None
+        self.ready = False
+        self._fail_pending(RuntimeError("Server process was killed"))
+
+    async def _discard_output(self) -> None:
+        """Kill the server process and drop the output it has left
+
+        A line over stream_limit leaves the stdout pipe paused, which keeps
+        it from reaching EOF and wait() from returning.
+        """
+        if self.process is None:
+            return
+        if self.process.returncode is None:
+            self.process.kill()
+        if self.process.stdout is not None:
+            await self.process.stdout.read()
 
+    async def restart(self) -> None:
+        """Kill the server process and start a fresh one"""
         async with self.lock:
-            command_template = tool_config.get("command", "")
+            await self._kill()
+            await self.start()
+
+    def _stdout(self) -> asyncio.StreamReader:
+        """Return the server's stdout stream"""
+        if self.process is None or self.process.stdout is None:
+            raise RuntimeError("Process stdout is not available for reading response")
+        return self.process.stdout
+
+    async def request(self, command: str | list[str]) -> str:
+        """Send one command and read its response
 
-            # Replace parameters
-            command = command_template
-            for param_name, value in parameters.items():
-                command = command.replace(f"{{{param_name}}}", str(value))
+        JSON-lines servers may also take an argv list as the command.
+        """
+        if self.protocol == "jsonl":
+            return await self._multiplexed_request(command)
+
+        async with self.lock:
+            if not self.ready or self.process is None:
+                await self.start()
 
             try:
-                if self.process is None:
-                    raise RuntimeError("Server process is not running")
+                return await self._exchange(str(command))
+            except ValueError:
+                # E.g. a line longer than stream_limit
+                await self._discard_output()
+                await self._kill()
+                raise
+            except BaseException:
+                # A half-read response would be handed to the next call,
+                # restart the process instead
+                await self._kill()
+                raise
+
+    async def _multiplexed_request(self, command: str | list[str]) -> str:
+        """Send a command tagged with an id and wait for the matching reply"""
+        request_id = next(self._request_ids)
+        reply: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+
+        # The lock only covers startup and the write, replies are awaited
+        # without it so many requests can be in flight at once
+        async with self.lock:
+            if not self.ready or self.process is None:
+                await self.start()
+            if self.process is None or self.process.stdin is None:
+                raise RuntimeError(
+                    "Process stdin is not available for sending commands"
+                )
 
-                if self.process.stdin is not None:
-                    # Send command
-                    self.process.stdin.write(f"{command}\n")
-                    self.process.stdin.flush()
+            self._pending[request_id] = reply
+            message = json.dumps({"id": request_id, "command": command})
+            self.process.stdin.write(f"{message}\n".encode())
+            await self.process.stdin.drain()
+
+        try:
+            return await reply
+        except asyncio.CancelledError:
+            if self.send_cancel:
+                self._cancel(request_id)
+            raise
+        finally:
+            # A late reply to a cancelled request is simply dropped
+            self._pending.pop(request_id, None)
+
+    def _cancel(self, request_id: int) -> None:
+        """Ask the server to abandon a request, without waiting for it"""
+        if self.process is None or self.process.stdin is None:
+            return
+        if self.process.stdin.is_closing():
+            return
+        message = json.dumps({"id": request_id, "cancel": True})
+        self.process.stdin.write(f"{message}\n".encode())
+
+    async def _read_replies(self, process: asyncio.subprocess.Process) -> None:
+        """Route JSON-lines replies to the requests waiting for them"""
+        if process.stdout is None:
+            return
+
+        try:
+            while line := await process.stdout.readline():
+                try:
+                    message = json.loads(line)
+                    reply = self._pending.get(message["id"])
+                except (ValueError, KeyError, TypeError):
+                    # Not a reply, e.g. log output from the server
+                    continue
+                if reply is None or reply.done():
+                    continue
+
+                if "error" in message:
+                    reply.set_result(f"Error: {message['error']}")
                 else:
-                    raise RuntimeError(
-                        "Process stdin is not available for sending commands"
+                    result = message.get("result", "")
+                    reply.set_result(
+                        result if isinstance(result, str) else json.dumps(result)
                     )
+        except (ValueError, asyncio.LimitOverrunError) as e:
+            # A reply longer than stream_limit, the rest of the stream can't
+            # be framed any more. Killing the process first unblocks a write
+            # holding the lock, later requests then start a fresh process
+            if process.returncode is None:
+                process.kill()
+            async with self.lock:
+                if self.process is process:
+                    await self._discard_output()
+                    self._fail_pending(RuntimeError(f"Server reply too long: {e}"))
+                    await self._kill()
+            return
 
-                if self.process.stdout is not None:
-                    # Read response
-                    response: str = self.process.stdout.readline().strip()
-                    return response
-                else:
-                    raise RuntimeError(
-                        "Process stdout is not available for reading response"
+        self._fail_pending(RuntimeError("Server closed its output"))
+        if self.process is process:
+            await self._kill()
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every in-flight JSON-lines request"""
+        for reply in self._pending.values():
+            if not reply.done():
+                reply.set_exception(error)
+        self._pending.clear()
+
+    async def _exchange(self, command: str) -> str:
+        """Write a command to the server and read its framed response"""
+        if self.process is None:
+            raise RuntimeError("Server process is not running")
+
+        if self.process.stdin is not None:
+            # Send command
+            self.process.stdin.write(f"{command}\n".encode())
+            await self.process.stdin.drain()
+        else:
+            raise RuntimeError("Process stdin is not available for sending commands")
+
+        return await self._read_response()
+
+    async def _read_response(self) -> str:
+        """Read one response according to the configured framing"""
+        stdout = self._stdout()
+
+        if self.framing == "length":
+            # Header line with the byte length of the body
+            header = await self._readline(stdout)
+            body = await stdout.readexactly(int(header))
+            return body.decode(errors="replace").strip()
+
+        if self.framing == "sentinel":
+            lines: list[str] = []
+            while True:
+                line = await self._readline(stdout)
+                if line.strip() == self.terminator:
+                    return "\n".join(lines).strip()
+                lines.append(line)
+
+        first = await self._readline(stdout)
+        if self.framing == "line":
+            return first.strip()
+
+        # Idle framing: keep reading until the server goes quiet
+        chunks = [first.encode() + b"\n"]
+        while True:
+            try:
+                chunk = await asyncio.wait_for(
+                    stdout.read(65536), timeout=self.idle_timeout
+                )
+            except asyncio.TimeoutError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks).decode(errors="replace").strip()
+
+    async def _readline(self, stdout: asyncio.StreamReader) -> str:
+        """Read one line, failing if the server closed its output"""
+        line = await stdout.readline()
+        if not line:
+            raise RuntimeError("Server closed its output")
+        return line.decode(errors="replace").rstrip("\r\n")
+
+
+class ServerAdapter(BackendAdapter):
+    """Server program adapter"""
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        self.config = config
+        self.command = config["command"]
+        self.args = config.get("args", [])
+        self.pool_size = config.get("pool_size", 1)
+        # Seconds a call may wait for a free worker, None waits forever
+        self.queue_timeout: float | None = config.get("queue_timeout")
+        self.workers = [ServerWorker(config) for _ in range(self.pool_size)]
+        # JSON-lines workers pipeline several requests each
+        if config.get("protocol", "text") == "jsonl":
+            self.max_in_flight = config.get("max_in_flight", 32)
+        else:
+            self.max_in_flight = 1
+        self._slots = asyncio.Semaphore(self.pool_size * self.max_in_flight)
+        # Compiled command templates, keyed on tool name
+        self._templates: dict[str, ToolTemplate] = {}
+
+        # Supervision: optional health probe, restart backoff and draining
+        self.supervise = config.get("supervise", True)
+        self.health_command: str | None = config.get("health_command")
+        self.health_expect: str | None = config.get("health_expect")
+        self.health_interval = config.get("health_interval", 10)
+        self.health_timeout = config.get("health_timeout", 5)
+        self.restart_delay = config.get("restart_delay", 0.5)
+        self.max_restart_delay = config.get("max_restart_delay", 30)
+        self.drain_timeout = config.get("drain_timeout", 10)
+        self._supervisors: list[asyncio.Task] = []
+        # Set whenever a worker comes back up
+        self._worker_up = asyncio.Event()
+
+    async def start(self) -> None:
+        """Start all server workers and their supervisors"""
+        await asyncio.gather(*(worker.start() for worker in self.workers))
+        if self.supervise and not self._supervisors:
+            self._supervisors = [
+                asyncio.create_task(self._supervise(worker)) for worker in self.workers
+            ]
+
+    async def stop(self) -> None:
+        """Stop the supervisors and all server workers"""
+        for task in self._supervisors:
+            task.cancel()
+        await asyncio.gather(*self._supervisors, return_exceptions=True)
+        self._supervisors = []
+        await asyncio.gather(*(worker.stop() for worker in self.workers))
+
+    def is_up(self) -> bool:
+        """Whether any worker can serve calls, unsupervised workers start lazily"""
+        return not self._supervisors or any(worker.up for worker in self.workers)
+
+    async def _supervise(self, worker: ServerWorker) -> None:
+        """Watch a worker and restart it with exponential backoff when it fails"""
+        failures = 0
+        while True:
+            if worker.up and worker.process is not None:
+                try:
+                    await asyncio.wait_for(
+                        asyncio.shield(worker.process.wait()),
+                        timeout=self.health_interval,
                     )
+                except asyncio.TimeoutError:
+                    if await self._probe(worker):
+                        failures = 0
+                        continue
 
+            failures += 1
+            delay = min(
+                self.restart_delay * 2 ** (failures - 1), self.max_restart_delay
+            )
+            print(
+                f"⚠️  Server worker is down, restarting in {delay:.1f}s", file=sys.stderr
+            )
+            worker.draining = True
+            try:
+                await self._drain(worker)
+                await asyncio.sleep(delay)
+                await worker.restart()
+                print("✅ Server worker restarted", file=sys.stderr)
             except Exception as e:
-                return f"Error communicating with server: {str(e)}"
+                print(f"❌ Server worker restart failed: {str(e)}", file=sys.stderr)
+            finally:
+                worker.draining = False
+                if worker.up:
+                    self._worker_up.set()
+
+    async def _probe(self, worker: ServerWorker) -> bool:
+        """Send the health command to a worker and check its reply"""
+        if self.health_command is None:
+            return True
+        if worker.protocol == "text" and worker.outstanding:
+            # The worker is busy with a call and can't answer until it ends
+            return True
+
+        worker.outstanding += 1
+        try:
+            reply = await asyncio.wait_for(
+                worker.request(self.health_command), timeout=self.health_timeout
+            )
+        except Exception:
+            return False
+        finally:
+            worker.outstanding -= 1
+        return self.health_expect is None or reply.strip() == self.health_expect
+
+    async def _drain(self, worker: ServerWorker) -> None:
+        """Wait for calls already sent to a worker to finish"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.drain_timeout
+        while worker.outstanding and worker.up and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+
+    def compile_tool(self, tool_config: dict[str, Any]) -> Any:
+        """Compile the tool's command template"""
+        return ToolTemplate.for_tool(tool_config, "command").plan()
+
+    def prepare_tool(self, tool_config: dict[str, Any], plan: Any = None) -> None:
+        """Compile the tool's command template, or load its compiled plan"""
+        self._templates[tool_config["name"]] = (
+            ToolTemplate.from_plan(plan)
+            if plan is not None
+            else ToolTemplate.for_tool(tool_config, "command")
+        )
+
+    async def _pick_worker(self) -> ServerWorker:
+        """Choose the least busy worker, waiting while every worker is down"""
+        while True:
+            workers = [
+                worker
+                for worker in self.workers
+                if not worker.draining and (worker.up or not self._supervisors)
+            ]
+            if workers:
+                return min(workers, key=lambda worker: worker.outstanding)
+            self._worker_up.clear()
+            await self._worker_up.wait()
+
+    async def execute_tool(self, tool_config: dict[str, Any], parameters: Any) -> str:
+        """Execute server tool"""
+        if tool_config["name"] not in self._templates:
+            self.prepare_tool(tool_config)
+        try:
+            command = self._templates[tool_config["name"]].render_string(parameters)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+
+        # Admission: at most max_in_flight calls per worker, the rest queue
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            return "Error: All server workers are busy"
+
+        try:
+            # Calls wait for a restarting worker rather than failing
+            worker = await asyncio.wait_for(
+                self._pick_worker(), timeout=self.queue_timeout
+            )
+        except asyncio.TimeoutError:
+            self._slots.release()
+            return "Error: No server worker is up"
+        except BaseException:
+            self._slots.release()
+            raise
+
+        worker.outstanding += 1
+        try:
+            return await worker.request(command)
+        except Exception as e:
+            return f"Error communicating with server: {str(e)}"
+        finally:
+            worker.outstanding -= 1
+            self._slots.release()
+
+
+@dataclass
+class CachedResponse:
+    """A cached HTTP response body with its validators"""
+
+    body: str
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class ResponseCache:
+    """In-process LRU cache of GET responses for one tool"""
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        self.ttl: float = config.get("ttl", 60)
+        self.max_entries: int = config.get("max_entries", 256)
+        # Parameters that make up the cache key, None means all of them
+        self.vary_on: list[str] | None = config.get("vary_on")
+        self.entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+
+    def key(self, parameters: dict[str, Any]) -> tuple:
+        """Build the cache key for a set of call parameters"""
+        names = sorted(parameters) if self.vary_on is None else self.vary_on
+        return tuple((name, str(parameters.get(name))) for name in names)
+
+    def get(self, key: tuple) -> CachedResponse | None:
+        """Look up an entry, marking it as recently used"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple, entry: CachedResponse) -> None:
+        """Store an entry, evicting the least recently used one if full"""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class CircuitBreaker:
+    """Fail calls fast while an upstream keeps failing
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are refused for reset_timeout seconds. Then a single trial call is let
+    through, and its outcome closes the circuit or opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        # A threshold of 0 disables the breaker
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        # When the current trial call started, it expires like the open state
+        # so an abandoned trial can't hold the circuit open forever
+        self._trial_at: float | None = None
+
+    @property
+    def open(self) -> bool:
+        """Whether the circuit is refusing calls"""
+        return 0 < self.failure_threshold <= self.failures
+
+    @property
+    def half_open(self) -> bool:
+        """Whether an open circuit is due for a trial call"""
+        return self.open and time.monotonic() >= self.opened_at + self.reset_timeout
+
+    def allow(self) -> bool:
+        """Check whether a call may go through, claiming the trial if due"""
+        if not self.open:
+            return True
+        now = time.monotonic()
+        if now < self.opened_at + self.reset_timeout:
+            return False
+        if self._trial_at is not None and now < self._trial_at + self.reset_timeout:
+            return False
+        self._trial_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit"""
+        self.failures = 0
+        self._trial_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold"""
+        self.failures += 1
+        self._trial_at = None
+        if self.open:
+            self.opened_at = time.monotonic()
+
+
+class _RetryableResponse(Exception):
+    """An upstream response worth retrying, e.g. 503 Service Unavailable"""
+
+    def __init__(self, status: int, body: str, retry_after: float | None) -> None:
+        super().__init__(f"HTTP Error {status}: {body}")
+        self.retry_after = retry_after
+
+
+def _retry_after(headers: Any) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
 
 class HttpAdapter(BackendAdapter):
     """HTTP API adapter"""
 
+    METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+    # Methods that are safe to send again after a failure
+    IDEMPOTENT_METHODS = ("GET", "PUT", "DELETE")
+
+    # Statuses that mean the upstream is unhealthy rather than the request bad
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    # {name} placeholders in an endpoint filled from the parameters
+    PATH_PARAM = re.compile(r"\{(\w+)\}")
+
     def __init__(self, config: dict[str, Any]) -> None:
         self.config = config
         self.base_url = config["base_url"]
         self.timeout = config.get("timeout", 10)
+        self.connect_timeout: float | None = config.get("connect_timeout")
+        self.read_timeout: float | None = config.get("read_timeout")
         self.headers = config.get("headers", {})
+        # Connection pool tuning, defaults match aiohttp's
+        self.max_connections = config.get("max_connections", 100)
+        self.max_connections_per_host = config.get("max_connections_per_host", 0)
+        self.keepalive_timeout: float = config.get("keepalive_timeout", 15)
+        self.dns_cache_ttl: int | None = config.get("dns_cache_ttl", 10)
+        # Talk to the upstream over a Unix domain socket instead of TCP
+        self.unix_socket: str | None = config.get("unix_socket")
         self.session: aiohttp.ClientSession | None = None
+        # Response caches for tools with a "cache" block, by tool name
+        self.caches: dict[str, ResponseCache] = {}
+        # Retries for idempotent methods, with jittered exponential backoff
+        self.retries = config.get("retries", 2)
+        self.retry_backoff = config.get("retry_backoff", 0.2)
+        self.max_retry_backoff = config.get("max_retry_backoff", 5)
+        self.breaker = CircuitBreaker(
+            config.get("circuit_failure_threshold", 5),
+            config.get("circuit_reset_timeout", 30),
+        )
+
+    def _create_connector(self) -> "aiohttp.BaseConnector":
+        """Create the connection pool for the HTTP session"""
+        import aiohttp
+
+        if self.unix_socket:
+            return aiohttp.UnixConnector(
+                path=self.unix_socket,
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+        return aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
 
     async def start(self) -> None:
         """Start HTTP session"""
+        import aiohttp
+
         if self.session is None:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout, headers=self.headers)
-            print(f"🌐 HTTP session started: {self.base_url}")
+            timeout = aiohttp.ClientTimeout(
+                total=self.timeout,
+                sock_connect=self.connect_timeout,
+                sock_read=self.read_timeout,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=self._create_connector(),
+                timeout=timeout,
+                headers=self.headers,
+            )
+            print(f"🌐 HTTP session started: {self.base_url}", file=sys.stderr)
 
     async def stop(self) -> None:
         """Close HTTP session"""
         if self.session:
             await self.session.close()
             self.session = None
-            print("🌐 HTTP session closed")
+            print("🌐 HTTP session closed", file=sys.stderr)
+
+    def is_up(self) -> bool:
+        """Whether the circuit breaker lets calls through, or is due to try"""
+        return not self.breaker.open or self.breaker.half_open
+
+    def _retry_delay(self, attempt: int, retry_after: float | None) -> float | None:
+        """Seconds to wait before the next attempt, None to give up"""
+        if attempt >= self.retries or self.breaker.open:
+            return None
+        if retry_after is not None:
+            # Honour the upstream's hint unless it is longer than we'd wait
+            return retry_after if retry_after <= self.max_retry_backoff else None
+        # Full jitter keeps retrying clients from arriving in lockstep
+        backoff = min(self.retry_backoff * 2**attempt, self.max_retry_backoff)
+        return random.uniform(0, backoff)
+
+    def _resolve_url(self, endpoint: str, parameters: Any) -> tuple[str, Any]:
+        """Fill the endpoint's path parameters, returning the URL and the rest
+
+        Parameters used in the path are left out of the query or body.
+        """
+        names = self.PATH_PARAM.findall(endpoint)
+        if not names or not isinstance(parameters, dict):
+            return f"{self.base_url}{endpoint}", parameters
+        rest = dict(parameters)
+        for name in names:
+            value = rest.pop(name, None)
+            if value is None:
+                raise ValueError(f"Missing required parameter '{name}'")
+            endpoint = endpoint.replace(f"{{{name}}}", quote(str(value), safe=""))
+        return f"{self.base_url}{endpoint}", rest
 
     async def execute_tool(self, tool_config: dict[str, Any], parameters: Any) -> str:
         """Execute HTTP API call"""
+        import aiohttp
+
         if self.session is None:
             await self.start()
 
         endpoint = tool_config.get("endpoint", "/")
         method = tool_config.get("method", "GET").upper()
 
-        url = f"{self.base_url}{endpoint}"
+        try:
+            url, parameters = self._resolve_url(endpoint, parameters)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+
+        if method not in self.METHODS:
+            return f"Unsupported HTTP method: {method}"
+
+        # Fresh cached responses don't touch the upstream, so they are
+        # served even while the circuit is open and never count as a trial
+        cached = method == "GET" and "cache" in tool_config
+        body = self._fresh_response(tool_config, url, parameters) if cached else None
+        if body is not None:
+            return body
+        if not self.breaker.allow():
+            return "HTTP request failed: upstream is unavailable (circuit open)"
+
+        attempt = 0
+        while True:
+            try:
+                result = await self._send(tool_config, method, url, parameters)
+            except _RetryableResponse as e:
+                error, retry_after = str(e), e.retry_after
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error, retry_after = f"HTTP request failed: {str(e)}", None
+            except Exception as e:
+                return f"HTTP request failed: {str(e)}"
+            else:
+                self.breaker.record_success()
+                return result
+
+            self.breaker.record_failure()
+            delay = (
+                self._retry_delay(attempt, retry_after)
+                if method in self.IDEMPOTENT_METHODS
+                else None
+            )
+            if delay is None:
+                return error
+            await asyncio.sleep(delay)
+            attempt += 1
+            body = (
+                self._fresh_response(tool_config, url, parameters) if cached else None
+            )
+            if body is not None:
+                # Another call refreshed the entry while this one waited
+                return body
+
+    async def _send(
+        self, tool_config: dict[str, Any], method: str, url: str, parameters: Any
+    ) -> str:
+        """Send one request, raising for responses worth retrying"""
+        if self.session is None:
+            raise RuntimeError("HTTP session is not started")
+
+        if method == "GET" and "cache" in tool_config:
+            return await self._cached_get(tool_config, url, parameters)
+
+        # GET and DELETE send parameters as the query, the others as JSON
+        if method in ("GET", "DELETE"):
+            request_args = {"params": parameters}
+        else:
+            request_args = {"json": parameters}
+
+        async with self.session.request(method, url, **request_args) as response:
+            result: str = await response.text()
+            if response.status in self.RETRY_STATUSES:
+                raise _RetryableResponse(
+                    response.status, result, _retry_after(response.headers)
+                )
+            if response.status >= 400:
+                return f"HTTP Error {response.status}: {result}"
+            return result
+
+    async def execute_tool_stream(
+        self, tool_config: dict[str, Any], parameters: Any
+    ) -> AsyncGenerator[str, None]:
+        """Execute HTTP API call, yielding the body as it arrives"""
+        import aiohttp
+
+        if "cache" in tool_config:
+            # Cached bodies are already held in memory
+            yield await self.execute_tool(tool_config, parameters)
+            return
+
+        if self.session is None:
+            await self.start()
+        if self.session is None:
+            raise RuntimeError("HTTP session is not started")
 
+        endpoint = tool_config.get("endpoint", "/")
+        method = tool_config.get("method", "GET").upper()
         try:
-            result: str
-            if self.session is None:
-                raise RuntimeError("HTTP session is not started")
-
-            if method == "GET":
-                # GET request uses parameters as query parameters
-                async with self.session.get(url, params=parameters) as response:
-                    result = await response.text()
-                    if response.status >= 400:
-                        return f"HTTP Error {response.status}: {result}"
-                    return result
+            url, parameters = self._resolve_url(endpoint, parameters)
+        except ValueError as e:
+            raise ToolExecutionError(f"Error: {str(e)}") from e
 
-            elif method == "POST":
-                # POST request uses parameters as JSON body
-                async with self.session.post(url, json=parameters) as response:
-                    result = await response.text()
-                    if response.status >= 400:
-                        return f"HTTP Error {response.status}: {result}"
-                    return result
+        if method in ("GET", "DELETE"):
+            request_args = {"params": parameters}
+        elif method in ("POST", "PUT", "PATCH"):
+            request_args = {"json": parameters}
+        else:
+            raise ToolExecutionError(f"Unsupported HTTP method: {method}")
+        if not self.breaker.allow():
+            raise ToolExecutionError(
+                "HTTP request failed: upstream is unavailable (circuit open)"
+            )
 
-            elif method == "PUT":
-                async with self.session.put(url, json=parameters) as response:
-                    result = await response.text()
+        # Retries are only possible until the first chunk has been yielded
+        attempt = 0
+        streaming = False
+        while True:
+            try:
+                async with self.session.request(
+                    method, url, **request_args
+                ) as response:
+                    if response.status in self.RETRY_STATUSES:
+                        raise _RetryableResponse(
+                            response.status,
+                            await response.text(),
+                            _retry_after(response.headers),
+                        )
+                    self.breaker.record_success()
                     if response.status >= 400:
-                        return f"HTTP Error {response.status}: {result}"
-                    return result
+                        result = await response.text()
+                        raise ToolExecutionError(
+                            f"HTTP Error {response.status}: {result}"
+                        )
 
-            elif method == "DELETE":
-                async with self.session.delete(url, params=parameters) as response:
-                    result = await response.text()
-                    if response.status >= 400:
-                        return f"HTTP Error {response.status}: {result}"
-                    return result
+                    streaming = True
+                    decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(
+                        errors="replace"
+                    )
+                    async for chunk in response.content.iter_chunked(65536):
+                        if text := decoder.decode(chunk):
+                            yield text
+                    if text := decoder.decode(b"", final=True):
+                        yield text
+                    return
+            except ToolExecutionError:
+                raise
+            except _RetryableResponse as e:
+                error, retry_after = str(e), e.retry_after
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if streaming:
+                    raise ToolExecutionError(f"HTTP request failed: {str(e)}") from e
+                error, retry_after = f"HTTP request failed: {str(e)}", None
+            except Exception as e:
+                raise ToolExecutionError(f"HTTP request failed: {str(e)}") from e
+
+            self.breaker.record_failure()
+            delay = (
+                self._retry_delay(attempt, retry_after)
+                if method in self.IDEMPOTENT_METHODS
+                else None
+            )
+            if delay is None:
+                raise ToolExecutionError(error)
+            await asyncio.sleep(delay)
+            attempt += 1
 
+    def _cache_entry(
+        self, tool_config: dict[str, Any], url: str, parameters: Any
+    ) -> tuple[ResponseCache, tuple, CachedResponse | None]:
+        """Return the tool's cache, the call's key and its entry, if any"""
+        cache = self.caches.get(tool_config["name"])
+        if cache is None:
+            cache = ResponseCache(tool_config["cache"])
+            self.caches[tool_config["name"]] = cache
+
+        # The URL carries the path parameters
+        key = (url, *cache.key(parameters))
+        return cache, key, cache.get(key)
+
+    def _fresh_response(
+        self, tool_config: dict[str, Any], url: str, parameters: Any
+    ) -> str | None:
+        """Return the cached body for a GET if it hasn't expired"""
+        _, _, entry = self._cache_entry(tool_config, url, parameters)
+        if entry is not None and entry.expires_at > time.monotonic():
+            return entry.body
+        return None
+
+    async def _cached_get(
+        self, tool_config: dict[str, Any], url: str, parameters: Any
+    ) -> str:
+        """Fetch a GET for the tool's cache, revalidating a stale entry
+
+        Fresh entries are served by the caller, so this always reaches the
+        upstream.
+        """
+        if self.session is None:
+            raise RuntimeError("HTTP session is not started")
+
+        cache, key, entry = self._cache_entry(tool_config, url, parameters)
+        now = time.monotonic()
+
+        # Stale entries are revalidated with a conditional request
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        async with self.session.get(
+            url, params=parameters, headers=headers
+        ) as response:
+            if response.status == 304 and entry is not None:
+                entry.expires_at = now + cache.ttl
+                return entry.body
+
+            result: str = await response.text()
+            if response.status in self.RETRY_STATUSES:
+                raise _RetryableResponse(
+                    response.status, result, _retry_after(response.headers)
+                )
+            if response.status >= 400:
+                return f"HTTP Error {response.status}: {result}"
+
+            if "no-store" not in response.headers.get("Cache-Control", ""):
+                cache.put(
+                    key,
+                    CachedResponse(
+                        body=result,
+                        expires_at=now + cache.ttl,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                    ),
+                )
+            return result
+
+
+class _StdoutRedirect:
+    """Send sys.stdout to stderr while any in-process call is running
+
+    Unlike contextlib.redirect_stdout, overlapping calls share a single
+    redirect, so the original stdout is restored when the last one ends.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.active = 0
+        self.saved: Any = None
+
+    def __enter__(self) -> None:
+        with self.lock:
+            if self.active == 0:
+                self.saved = sys.stdout
+                sys.stdout = sys.stderr
+            self.active += 1
+
+    def __exit__(self, *exc_info: Any) -> None:
+        with self.lock:
+            self.active -= 1
+            if self.active == 0:
+                sys.stdout = self.saved
+                self.saved = None
+
+
+_stdout_to_stderr = _StdoutRedirect()
+
+
+class PythonAdapter(BackendAdapter):
+    """In-process Python module adapter"""
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        self.config = config
+        # Dotted module name, or a path to a .py file
+        self.module_name = config["module"]
+        self.cwd = config.get("cwd", ".")
+        self.module: ModuleType | None = None
+
+    async def start(self) -> None:
+        """Import the target module once"""
+        if self.module is not None:
+            return
+
+        # Let the module import its sibling files and packages
+        cwd = str(Path(self.cwd).resolve())
+        if cwd not in sys.path:
+            sys.path.insert(0, cwd)
+
+        if self.module_name.endswith(".py"):
+            module_path = Path(cwd) / self.module_name
+            name = module_path.stem
+            spec = importlib.util.spec_from_file_location(name, module_path)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"Cannot load Python module from {module_path}")
+            module = importlib.util.module_from_spec(spec)
+            # Registered first, as a regular import would, so the module's
+            # own imports and dataclasses can look it up
+            sys.modules[name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                sys.modules.pop(name, None)
+                raise
+            self.module = module
+        else:
+            self.module = importlib.import_module(self.module_name)
+
+        print(f"🐍 Python module loaded: {self.module_name}", file=sys.stderr)
+
+    async def stop(self) -> None:
+        """Release the imported module"""
+        self.module = None
+
+    async def execute_tool(self, tool_config: dict[str, Any], parameters: Any) -> str:
+        """Call the tool's function directly"""
+        if self.module is None:
+            await self.start()
+
+        function_name = tool_config.get("function", tool_config["name"])
+        function = getattr(self.module, function_name, None)
+        if not callable(function):
+            return f"Error: Function '{function_name}' not found in {self.module_name}"
+
+        try:
+            # Output printed by the function must not reach the stdio
+            # transport's stdout
+            with _stdout_to_stderr:
+                if inspect.iscoroutinefunction(function):
+                    result = await function(**parameters)
+                else:
+                    # Run sync functions in a thread so they can't block the loop
+                    result = await asyncio.to_thread(function, **parameters)
+        except Exception as e:
+            return f"Error calling {function_name}: {str(e)}"
+
+        if isinstance(result, str):
+            return result
+        try:
+            return json.dumps(result)
+        except (TypeError, ValueError):
+            return str(result)
+
+
+class WebSocketAdapter(BackendAdapter):
+    """WebSocket adapter multiplexing tool calls over one connection"""
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        self.config = config
+        self.url = config["url"]
+        self.headers = config.get("headers", {})
+        # Seconds a call waits for the connection to come up
+        self.timeout = config.get("timeout", 10)
+        self.heartbeat: float | None = config.get("heartbeat")
+        # Reconnect backoff, doubling from reconnect_delay up to the maximum
+        self.reconnect_delay = config.get("reconnect_delay", 0.5)
+        self.max_reconnect_delay = config.get("max_reconnect_delay", 30)
+        # Seconds a connection must stay up before the backoff starts over
+        self.reconnect_reset = config.get("reconnect_reset", 10)
+        self.session: aiohttp.ClientSession | None = None
+        self.ws: aiohttp.ClientWebSocketResponse | None = None
+        self.connected = asyncio.Event()
+        # In-flight calls by correlation id
+        self._pending: dict[int, asyncio.Future[str]] = {}
+        self._request_ids = itertools.count(1)
+        self._connection_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Open the session and keep the connection up in the background"""
+        import aiohttp
+
+        if self._connection_task is not None:
+            return
+
+        self.session = aiohttp.ClientSession(headers=self.headers)
+        self._connection_task = asyncio.create_task(self._maintain_connection())
+        print(f"🔌 WebSocket backend started: {self.url}", file=sys.stderr)
+
+    async def stop(self) -> None:
+        """Close the connection and the session"""
+        if self._connection_task is not None:
+            self._connection_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._connection_task
+            self._connection_task = None
+        if self.ws is not None:
+            await self.ws.close()
+            self.ws = None
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        self.connected.clear()
+        self._fail_pending(RuntimeError("WebSocket backend stopped"))
+        print("🔌 WebSocket backend stopped", file=sys.stderr)
+
+    def is_up(self) -> bool:
+        """Whether the connection task holds an open socket"""
+        return (
+            self._connection_task is not None
+            and not self._connection_task.done()
+            and self.connected.is_set()
+            and self.ws is not None
+            and not self.ws.closed
+        )
+
+    async def _maintain_connection(self) -> None:
+        """Connect, route replies, and reconnect with backoff when dropped"""
+        import aiohttp
+
+        delay = self.reconnect_delay
+        while True:
+            try:
+                if self.session is None:
+                    raise RuntimeError("WebSocket session is not started")
+                self.ws = await self.session.ws_connect(
+                    self.url, heartbeat=self.heartbeat
+                )
+            except (aiohttp.ClientError, OSError, asyncio.TimeoutError) as e:
+                print(
+                    f"⚠️  WebSocket connect failed, retrying in {delay}s: {e}",
+                    file=sys.stderr,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            connected_at = time.monotonic()
+            self.connected.set()
+            try:
+                await self._read_replies(self.ws)
+            finally:
+                self.connected.clear()
+                self._fail_pending(RuntimeError("WebSocket connection lost"))
+
+            # A server dropping every connection right away is retried ever
+            # more slowly, only a connection that stayed up resets the backoff
+            if time.monotonic() - connected_at >= self.reconnect_reset:
+                delay = self.reconnect_delay
+            print(
+                f"⚠️  WebSocket connection lost, reconnecting in {delay}s",
+                file=sys.stderr,
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _read_replies(self, ws: "aiohttp.ClientWebSocketResponse") -> None:
+        """Route replies to the calls waiting for them until the socket closes"""
+        import aiohttp
+
+        async for message in ws:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                continue
+            try:
+                data = json.loads(message.data)
+                reply = self._pending.get(data["id"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            if reply is None or reply.done():
+                continue
+
+            if "error" in data:
+                reply.set_result(f"Error: {data['error']}")
             else:
-                return f"Unsupported HTTP method: {method}"
+                result = data.get("result", "")
+                reply.set_result(
+                    result if isinstance(result, str) else json.dumps(result)
+                )
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every in-flight call"""
+        for reply in self._pending.values():
+            if not reply.done():
+                reply.set_exception(error)
+        self._pending.clear()
+
+    async def execute_tool(self, tool_config: dict[str, Any], parameters: Any) -> str:
+        """Send a tool call tagged with an id and wait for the matching reply"""
+        if self._connection_task is None:
+            await self.start()
 
+        try:
+            await asyncio.wait_for(self.connected.wait(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return "Error: WebSocket backend is not connected"
+        if self.ws is None:
+            return "Error: WebSocket backend is not connected"
+
+        request_id = next(self._request_ids)
+        reply: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = reply
+        try:
+            await self.ws.send_json(
+                {
+                    "id": request_id,
+                    "tool": tool_config["name"],
+                    "parameters": parameters,
+                }
+            )
+            return await reply
         except Exception as e:
-            return f"HTTP request failed: {str(e)}"
+            return f"WebSocket request failed: {str(e)}"
+        finally:
+            self._pending.pop(request_id, None)
 
 
 def create_adapter(backend_config: dict[str, Any]) -> BackendAdapter:
@@ -299,5 +1693,9 @@ def create_adapter(backend_config: dict[str, Any]) -> BackendAdapter:
         return ServerAdapter(config)
     elif backend_type == "http":
         return HttpAdapter(config)
+    elif backend_type == "python":
+        return PythonAdapter(config)
+    elif backend_type == "websocket":
+        return WebSocketAdapter(config)
     else:
         raise ValueError(f"Unsupported backend type: {backend_type}")
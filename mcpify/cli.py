@@ -2,13 +2,14 @@
 
 import argparse
 import json
-import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from .detect import BaseDetector, CamelDetector, OpenaiDetector
-from .validate import print_validation_results, validate_config_file
-from .wrapper import MCPWrapper
+# Each command imports what it needs, so "mcpify serve" doesn't pay for
+# loading the detectors and their LLM SDKs
+if TYPE_CHECKING:
+    from .detect import BaseDetector
 
 
 def _get_output_filename(project_path: Path, suffix: str = "") -> str:
@@ -25,8 +26,13 @@ def _get_output_filename(project_path: Path, suffix: str = "") -> str:
         return f"{project_name}.json"
 
 
+def _enhance_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Detector options for the enhancement pass requested on the command line."""
+    return {"enhance": args.enhance, "enhance_concurrency": args.enhance_concurrency}
+
+
 def _run_detection(
-    detector: BaseDetector, project_path: Path, output_file: Path
+    detector: "BaseDetector", project_path: Path, output_file: Path
 ) -> None:
     """Common detection logic for all detector types."""
     print(f"Analyzing project: {project_path}")
@@ -63,6 +69,26 @@ def _run_detection(
         sys.exit(1)
 
 
+def ast_detect_command(args: argparse.Namespace) -> None:
+    """Handle the ast-detect command."""
+    project_path = Path(args.project_path)
+
+    if not project_path.exists():
+        print(f"❌ Error: Project path does not exist: {project_path}")
+        sys.exit(1)
+
+    # Determine output file
+    if args.output:
+        output_file = Path(args.output)
+    else:
+        output_file = Path(_get_output_filename(project_path, "ast"))
+
+    from .detect.ast import AstDetector
+
+    print("🔍 Using AST static analysis (offline)...")
+    _run_detection(AstDetector(), project_path, output_file)
+
+
 def openai_detect_command(args: argparse.Namespace) -> None:
     """Handle the openai-detect command."""
     project_path = Path(args.project_path)
@@ -79,7 +105,13 @@ def openai_detect_command(args: argparse.Namespace) -> None:
 
     # Create OpenAI detector (let it handle env var checking)
     try:
-        detector = OpenaiDetector(openai_api_key=args.openai_key)
+        from .detect.openai import OpenaiDetector
+
+        detector = OpenaiDetector(
+            openai_api_key=args.openai_key,
+            use_cache=not args.no_cache,
+            **_enhance_options(args),
+        )
         print("🤖 Using OpenAI GPT-4 for intelligent detection...")
         _run_detection(detector, project_path, output_file)
     except ValueError as e:
@@ -106,7 +138,13 @@ def camel_detect_command(args: argparse.Namespace) -> None:
 
     # Create Camel-AI detector
     try:
-        detector = CamelDetector(model_name=args.model_name)
+        from .detect.camel import CamelDetector
+
+        detector = CamelDetector(
+            model_name=args.model_name,
+            use_cache=not args.no_cache,
+            **_enhance_options(args),
+        )
         print("🐪 Using Camel-AI ChatAgent for intelligent detection...")
         _run_detection(detector, project_path, output_file)
     except ImportError as e:
@@ -137,33 +175,22 @@ def detect_command(args: argparse.Namespace) -> None:
 
     print("🎯 Auto-detecting best strategy...")
 
-    detector: BaseDetector
-    # Try Camel-AI if available (most advanced)
+    # Static analysis settles well structured projects offline, the others
+    # go to the best available model detector
     try:
-        detector = CamelDetector()
-        print("🐪 Using Camel-AI detection (best available)...")
-        _run_detection(detector, project_path, output_file)
-        return
-    except Exception as e:
-        print(f"⚠️  Camel-AI detection failed: {e}")
-        print("📉 Falling back to OpenAI detection...")
+        from .detect.factory import create_detector
 
-    # Try OpenAI if API key is available (either via CLI or env var)
-    if args.openai_key or os.getenv("OPENAI_API_KEY"):
-        try:
-            detector = OpenaiDetector(openai_api_key=args.openai_key)
-            print("🤖 Using OpenAI detection...")
-            _run_detection(detector, project_path, output_file)
-            return
-        except Exception as e:
-            print(f"⚠️  OpenAI detection failed: {e}")
-            print("📉 No more fallback strategies available")
+        detector = create_detector(
+            "auto",
+            openai_api_key=args.openai_key,
+            use_cache=not args.no_cache,
+            **_enhance_options(args),
+        )
+    except Exception as e:
+        print(f"❌ Error creating detector: {e}")
+        sys.exit(1)
 
-    # No more fallback options
-    print(
-        "❌ No detection strategies available. Please ensure you have API keys for OpenAI or Camel-AI."
-    )
-    sys.exit(1)
+    _run_detection(detector, project_path, output_file)
 
 
 def view_command(args: argparse.Namespace) -> None:
@@ -231,35 +258,26 @@ def serve_command(args: argparse.Namespace) -> None:
         with open(config_file, encoding="utf-8") as f:
             config = json.load(f)
 
+        from .wrapper import MCPWrapper
+
         # Direct serve mode
         print(f"🚀 Starting MCP server for {config.get('name', 'Unknown')}...")
         print(f"📡 Mode: {args.mode}")
 
-        wrapper = MCPWrapper(str(config_file))
+        wrapper = MCPWrapper(str(config_file), snapshot_path=args.snapshot)
 
         if args.mode == "stdio":
             # Use existing wrapper for stdio mode
             wrapper.run()
         elif args.mode == "streamable-http":
-            # Use wrapper with HTTP mode
+            # Use wrapper with HTTP mode; the backend runs for the lifetime
+            # of the HTTP app, not of each client session
             mcp_server = wrapper.server()
 
-            # Start backend if needed
-            if wrapper.adapter:
-                import asyncio
-
-                asyncio.run(wrapper.start_backend())
-
-            try:
-                print(f"🌐 Starting HTTP server on {args.host}:{args.port}")
-                mcp_server.settings.host = args.host
-                mcp_server.settings.port = args.port
-                mcp_server.run(transport="streamable-http")
-            finally:
-                if wrapper.adapter:
-                    import asyncio
-
-                    asyncio.run(wrapper.stop_backend())
+            print(f"🌐 Starting HTTP server on {args.host}:{args.port}")
+            mcp_server.settings.host = args.host
+            mcp_server.settings.port = args.port
+            mcp_server.run(transport="streamable-http")
         else:
             print(f"❌ Error: Unsupported mode '{args.mode}'")
             sys.exit(1)
@@ -285,6 +303,8 @@ def validate_command(args: argparse.Namespace) -> None:
     print(f"Validating configuration: {config_file}")
 
     try:
+        from .validate import print_validation_results, validate_config_file
+
         # Validate the configuration
         result = validate_config_file(config_file)
 
@@ -300,6 +320,32 @@ def validate_command(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
+def compile_command(args: argparse.Namespace) -> None:
+    """Handle the compile command."""
+    config_file = Path(args.config_file)
+
+    if not config_file.exists():
+        print(f"❌ Error: Configuration file does not exist: {config_file}")
+        sys.exit(1)
+
+    try:
+        from .snapshot import compile_config
+        from .validate import print_validation_results, validate_config_file
+
+        # Only valid configurations are worth snapshotting
+        result = validate_config_file(config_file)
+        if not result.is_valid:
+            print_validation_results(result)
+            sys.exit(1)
+
+        snapshot_path = compile_config(config_file, args.output)
+        print(f"✅ Snapshot written to: {snapshot_path}")
+
+    except Exception as e:
+        print(f"❌ Error compiling configuration: {e}")
+        sys.exit(1)
+
+
 def ui_command(args) -> None:
     """Launch the web UI for repository analysis."""
     try:
@@ -370,6 +416,31 @@ def main() -> None:
     detect_parser.add_argument(
         "--openai-key", help="OpenAI API key for enhanced detection if available"
     )
+    detect_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the model instead of reusing cached responses",
+    )
+    detect_parser.add_argument(
+        "--enhance",
+        action="store_true",
+        help="Refine detected tools with a second, concurrent model pass",
+    )
+    detect_parser.add_argument(
+        "--enhance-concurrency",
+        type=int,
+        default=8,
+        help="Tools refined at the same time with --enhance (default: 8)",
+    )
+
+    # AST detection command
+    ast_parser = subparsers.add_parser(
+        "ast-detect", help="Detect APIs offline with static analysis"
+    )
+    ast_parser.add_argument("project_path", help="Path to the project directory")
+    ast_parser.add_argument(
+        "--output", "-o", help="Output file path (default: <project-name>-ast.json)"
+    )
 
     # OpenAI detection command
     openai_parser = subparsers.add_parser(
@@ -382,6 +453,22 @@ def main() -> None:
     openai_parser.add_argument(
         "--openai-key", help="OpenAI API key (or set OPENAI_API_KEY env var)"
     )
+    openai_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the model instead of reusing cached responses",
+    )
+    openai_parser.add_argument(
+        "--enhance",
+        action="store_true",
+        help="Refine detected tools with a second, concurrent model pass",
+    )
+    openai_parser.add_argument(
+        "--enhance-concurrency",
+        type=int,
+        default=8,
+        help="Tools refined at the same time with --enhance (default: 8)",
+    )
 
     # Camel-AI detection command
     camel_parser = subparsers.add_parser(
@@ -394,6 +481,22 @@ def main() -> None:
     camel_parser.add_argument(
         "--model-name", default="gpt-4", help="Model name to use (default: gpt-4)"
     )
+    camel_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the model instead of reusing cached responses",
+    )
+    camel_parser.add_argument(
+        "--enhance",
+        action="store_true",
+        help="Refine detected tools with a second, concurrent model pass",
+    )
+    camel_parser.add_argument(
+        "--enhance-concurrency",
+        type=int,
+        default=8,
+        help="Tools refined at the same time with --enhance (default: 8)",
+    )
 
     # View command
     view_parser = subparsers.add_parser(
@@ -429,6 +532,10 @@ def main() -> None:
         default=8080,
         help="Port for HTTP mode (default: 8080)",
     )
+    serve_parser.add_argument(
+        "--snapshot",
+        help="Snapshot from 'mcpify compile' (default: <config>.snapshot)",
+    )
 
     # Validate command
     validate_parser = subparsers.add_parser(
@@ -444,6 +551,19 @@ def main() -> None:
         help="Show detailed validation results",
     )
 
+    # Compile command
+    compile_parser = subparsers.add_parser(
+        "compile", help="Compile a configuration into a snapshot for fast start"
+    )
+    compile_parser.add_argument(
+        "config_file", help="Path to the configuration file to compile"
+    )
+    compile_parser.add_argument(
+        "--output",
+        "-o",
+        help="Snapshot file path (default: <config>.snapshot)",
+    )
+
     # UI command
     ui_parser = subparsers.add_parser(
         "ui", help="Launch the web UI for repository analysis"
@@ -469,6 +589,8 @@ def main() -> None:
 
     if args.command == "detect":
         detect_command(args)
+    elif args.command == "ast-detect":
+        ast_detect_command(args)
     elif args.command == "openai-detect":
         openai_detect_command(args)
     elif args.command == "camel-detect":
@@ -479,6 +601,8 @@ def main() -> None:
         serve_command(args)
     elif args.command == "validate":
         validate_command(args)
+    elif args.command == "compile":
+        compile_command(args)
     elif args.command == "ui":
         ui_command(args)
     else:
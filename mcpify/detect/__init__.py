@@ -2,23 +2,60 @@
 Detection module for MCPify.
 
 This module provides various detectors for analyzing projects and extracting
-API information to generate MCP configurations.
+API information to generate MCP configurations. Detectors are imported on
+first access, so using one doesn't load the SDKs of the others.
 """
 
-from .base import BaseDetector
-from .camel import CamelDetector
-from .factory import create_detector
-from .openai import OpenaiDetector
-from .types import ProjectInfo, ToolSpec
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .ast import AstDetector
+    from .base import BaseDetector
+    from .cache import LLMResponseCache
+    from .camel import CamelDetector
+    from .factory import create_detector
+    from .openai import OpenaiDetector
+    from .types import ProjectInfo, ToolSpec
+
+# Public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    "AstDetector": ".ast",
+    "BaseDetector": ".base",
+    "CamelDetector": ".camel",
+    "LLMResponseCache": ".cache",
+    "OpenaiDetector": ".openai",
+    "ProjectInfo": ".types",
+    "ToolSpec": ".types",
+    "create_detector": ".factory",
+}
 
 __all__ = [
     # Core detector classes
+    "AstDetector",
     "BaseDetector",
     "CamelDetector",
     "OpenaiDetector",
     # Type definitions
     "ProjectInfo",
     "ToolSpec",
+    # LLM response cache
+    "LLMResponseCache",
     # Factory function
     "create_detector",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names from their submodule on first access."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the lazy public names alongside the loaded ones."""
+    return sorted(set(globals()) | set(__all__))
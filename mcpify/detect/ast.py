@@ -0,0 +1,1268 @@
+"""
+AST-based project detector.
+
+This module contains the AstDetector class that finds tools by statically
+analysing Python source with the standard library's ast module. It covers
+argparse, click and typer command lines, FastAPI and Flask routes, and
+public functions with type hints. It needs no API key or network access
+and gives the same result on every run.
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .base import BaseDetector
+from .context import digest_sources, read_sources
+from .types import DetectionResult, ProjectInfo, ToolSpec
+
+# Annotations and argparse/click types that map to parameter types
+SIMPLE_TYPES = {
+    "str": "string",
+    "Path": "string",
+    "int": "integer",
+    "float": "number",
+    "bool": "boolean",
+    "list": "array",
+    "List": "array",
+    "tuple": "array",
+    "Tuple": "array",
+    "Sequence": "array",
+    "set": "array",
+    "Set": "array",
+    "dict": "object",
+    "Dict": "object",
+    "Mapping": "object",
+    "Literal": "string",
+    "INT": "integer",
+    "FLOAT": "number",
+    "STRING": "string",
+    "BOOL": "boolean",
+    "Choice": "string",
+    "File": "string",
+}
+
+HTTP_METHODS = ("get", "post", "put", "delete", "patch")
+
+# FastAPI parameters filled in by the framework rather than the client
+FRAMEWORK_PARAMS = {
+    "BackgroundTasks",
+    "HTTPConnection",
+    "Request",
+    "Response",
+    "WebSocket",
+}
+
+# FastAPI parameter sources the HTTP backend can't send
+UNSUPPORTED_SOURCES = {"Cookie", "Depends", "File", "Form", "Header", "Security"}
+
+FLASK_CONVERTER = re.compile(r"<(?:(\w+):)?(\w+)>")
+PATH_PARAM = re.compile(r"\{(\w+)(?::\w+)?\}")
+
+# argparse actions that take no value
+FLAG_ACTIONS = {"store_true", "store_false", "store_const", "count"}
+
+# Function definitions, sync or async
+_Function = ast.FunctionDef | ast.AsyncFunctionDef
+
+
+def _name(node: ast.AST | None) -> str:
+    """Return the dotted name of a Name or Attribute node, or ""."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = _name(node.value)
+        return f"{base}.{node.attr}" if base else ""
+    return ""
+
+
+def _last(node: ast.AST | None) -> str:
+    """Return the last part of a dotted name, or of a called one."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    return _name(node).rsplit(".", 1)[-1]
+
+
+def _const(node: ast.AST | None) -> Any:
+    """Return the value of a literal node, or None."""
+    if node is None:
+        return None
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+
+def _is_missing(node: ast.AST | None) -> bool:
+    """Whether a default is absent or the Ellipsis that marks it required."""
+    return node is None or (isinstance(node, ast.Constant) and node.value is ...)
+
+
+def _kwargs(call: ast.Call) -> dict[str, ast.expr]:
+    """Return a call's keyword arguments by name."""
+    return {kw.arg: kw.value for kw in call.keywords if kw.arg}
+
+
+def _strings(nodes: list[ast.expr]) -> list[str]:
+    """Return the string literals among nodes."""
+    return [
+        node.value
+        for node in nodes
+        if isinstance(node, ast.Constant) and isinstance(node.value, str)
+    ]
+
+
+def _identifier(text: str) -> str:
+    """Turn a command, flag or metavar into a tool or parameter name."""
+    name = re.sub(r"\W+", "_", text).strip("_").lower()
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def _first_line(docstring: str | None) -> str:
+    """Return the first line of a docstring."""
+    if not docstring or not docstring.strip():
+        return ""
+    return docstring.strip().splitlines()[0].strip()
+
+
+def _defaults(
+    function: _Function,
+) -> list[tuple[ast.arg, ast.expr | None]]:
+    """Pair a function's parameters with their defaults."""
+    arguments = function.args
+    positional = arguments.posonlyargs + arguments.args
+    defaults: list[ast.expr | None] = [None] * (
+        len(positional) - len(arguments.defaults)
+    )
+    defaults += arguments.defaults
+    return list(
+        zip(
+            positional + arguments.kwonlyargs,
+            defaults + arguments.kw_defaults,
+            strict=True,
+        )
+    )
+
+
+def _annotated_extra(annotation: ast.expr | None) -> list[ast.expr]:
+    """Return the metadata of an Annotated[...] annotation."""
+    if (
+        isinstance(annotation, ast.Subscript)
+        and _last(annotation.value) == "Annotated"
+        and isinstance(annotation.slice, ast.Tuple)
+    ):
+        return annotation.slice.elts[1:]
+    return []
+
+
+def _param(
+    name: str, param_type: str | None, description: str | None, required: bool = True
+) -> dict[str, Any]:
+    """Build a tool parameter specification."""
+    return {
+        "name": name,
+        "type": param_type or "string",
+        "description": description or name.replace("_", " ").capitalize(),
+        "required": required,
+    }
+
+
+@dataclass
+class _Module:
+    """A parsed source file."""
+
+    path: str
+    tree: ast.Module
+    imports: set[str]
+
+
+@dataclass
+class _Annotation:
+    """What a type annotation says about a value."""
+
+    type: str | None
+    optional: bool = False
+    model: ast.ClassDef | None = None
+
+
+@dataclass
+class _Parser:
+    """An argparse parser or subparser."""
+
+    command: list[str]
+    description: str
+    arguments: list[ast.Call] = field(default_factory=list)
+    # Positions in arguments of mutually exclusive group members
+    exclusive: set[int] = field(default_factory=set)
+    has_subcommands: bool = False
+
+
+@dataclass
+class _Value:
+    """Parameters and the argv elements that pass them to a command."""
+
+    parameters: list[dict[str, Any]] = field(default_factory=list)
+    elements: list[Any] = field(default_factory=list)
+
+    def extend(self, other: "_Value") -> None:
+        """Append another value's parameters and elements."""
+        self.parameters.extend(other.parameters)
+        self.elements.extend(other.elements)
+
+
+class AstDetector(BaseDetector):
+    """Static analysis detector that works without a model or network."""
+
+    # Confidence from which "auto" detection trusts this detector's result
+    # instead of asking a model
+    HIGH_CONFIDENCE = 0.8
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize the detector, model detector options are ignored."""
+        pass
+
+    def detect_project(self, project_path: str) -> dict[str, Any]:
+        """
+        Analyze a project directory and generate MCP configuration.
+
+        Args:
+            project_path: Path to the project directory
+
+        Returns:
+            Dictionary containing the MCP configuration
+        """
+        return self._result_to_config(self.analyze_project(project_path))
+
+    def analyze_project(self, project_path: str | Path) -> DetectionResult:
+        """
+        Analyze a project directory and return the structured result.
+
+        Args:
+            project_path: Path to the project directory, or to a single file
+
+        Returns:
+            DetectionResult whose confidence reflects what was found
+        """
+        proj_path = Path(project_path)
+        if not proj_path.exists():
+            raise ValueError(f"Project path does not exist: {proj_path}")
+
+        root = proj_path if proj_path.is_dir() else proj_path.parent
+        project_info = self._extract_project_info(root)
+        return self._analyze(read_sources(proj_path), project_info, root)
+
+    def _detect_tools(
+        self, project_path: Path, project_info: ProjectInfo
+    ) -> list[ToolSpec]:
+        """Detect tools by parsing the project's Python files."""
+        sources = read_sources(project_path)
+        return self._analyze(sources, project_info, project_path).tools
+
+    def _detect_from_content(self, code_content: str) -> DetectionResult:
+        """
+        Analyze code content and return detection result.
+
+        Args:
+            code_content: The code content to analyze (from GitIngest)
+
+        Returns:
+            DetectionResult with detected tools and project info
+        """
+        sources = digest_sources(code_content)
+        project_info = ProjectInfo(
+            name="detected-project",
+            description="Project analyzed from code content using static analysis",
+            main_files=list(sources),
+            readme_content="",
+            project_type="library",
+            dependencies=[],
+        )
+        return self._analyze(sources, project_info, None)
+
+    def _detect_chunk(
+        self, chunk: str, project_info: ProjectInfo
+    ) -> list[dict[str, Any]]:
+        """Detect tools in one chunk of a code digest."""
+        result = self._analyze(digest_sources(chunk), project_info, None)
+        return [self._tool_spec_to_dict(tool) for tool in result.tools]
+
+    def _analyze(
+        self,
+        sources: dict[str, str],
+        project_info: ProjectInfo,
+        project_path: Path | None,
+    ) -> DetectionResult:
+        """Find tools in the sources and pick the backend that runs them."""
+        modules = []
+        for path, source in sources.items():
+            try:
+                tree = ast.parse(source, filename=path)
+            except (SyntaxError, ValueError):
+                continue
+            modules.append(_Module(path, tree, self._imports(tree)))
+
+        classes: dict[str, ast.ClassDef] = {}
+        for module in modules:
+            for node in ast.walk(module.tree):
+                if isinstance(node, ast.ClassDef):
+                    classes.setdefault(node.name, node)
+
+        def located(path: str) -> str:
+            return str(project_path / path) if project_path else path
+
+        # Web routes come first, servers often parse a --port on the side
+        web_tools: list[ToolSpec] = []
+        web_modules = set()
+        frameworks = set()
+        port = None
+        for module in modules:
+            framework = self._web_framework(module)
+            if framework is None:
+                continue
+            tools = self._find_routes(module, framework, classes)
+            if tools:
+                web_tools.extend(tools)
+                web_modules.add(module.path)
+                frameworks.add(framework)
+                port = port or self._find_port(module)
+
+        command_lines = [
+            (module, tools)
+            for module in modules
+            if module.path not in web_modules
+            and (tools := self._find_cli_tools(module, classes))
+        ]
+        if command_lines and not web_tools:
+            module, tools = max(command_lines, key=lambda item: len(item[1]))
+            project_info.project_type = "cli"
+            return DetectionResult(
+                project_info=project_info,
+                tools=tools,
+                backend_config={
+                    "type": "commandline",
+                    "config": {
+                        "command": "python3",
+                        "args": [located(module.path)],
+                        "cwd": ".",
+                    },
+                },
+                confidence_score=0.9,
+            )
+
+        if web_tools:
+            project_info.project_type = "web"
+            default_port = 5000 if frameworks == {"flask"} else 8000
+            return DetectionResult(
+                project_info=project_info,
+                tools=self._unique(web_tools),
+                backend_config={
+                    "type": "http",
+                    "config": {
+                        "base_url": f"http://localhost:{port or default_port}",
+                        "timeout": 30,
+                    },
+                },
+                confidence_score=0.9,
+            )
+
+        libraries = [
+            (module, tools)
+            for module in modules
+            if (tools := self._find_functions(module, classes))
+        ]
+        if libraries:
+            module, tools = max(libraries, key=lambda item: len(item[1]))
+            project_info.project_type = "library"
+            return DetectionResult(
+                project_info=project_info,
+                tools=tools,
+                backend_config={
+                    "type": "python",
+                    "config": {
+                        "module": module.path,
+                        "cwd": str(project_path) if project_path else ".",
+                    },
+                },
+                confidence_score=0.7,
+            )
+
+        return DetectionResult(
+            project_info=project_info,
+            tools=[],
+            backend_config={
+                "type": "commandline",
+                "config": {"command": "python3", "args": [], "cwd": "."},
+            },
+            confidence_score=0.1,
+        )
+
+    def _imports(self, tree: ast.Module) -> set[str]:
+        """Return the top-level packages a module imports."""
+        imports = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imports.update(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                imports.add(node.module.split(".")[0])
+        return imports
+
+    def _unique(self, tools: list[ToolSpec]) -> list[ToolSpec]:
+        """Number tools whose name was already used."""
+        seen: dict[str, int] = {}
+        for tool in tools:
+            count = seen.get(tool.name, 0) + 1
+            seen[tool.name] = count
+            if count > 1:
+                tool.name = f"{tool.name}_{count}"
+        return tools
+
+    def _annotation(
+        self, node: ast.expr | None, classes: dict[str, ast.ClassDef]
+    ) -> _Annotation:
+        """Interpret a type annotation."""
+        if node is None:
+            return _Annotation(None)
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            # Forward references are annotations in a string
+            try:
+                node = ast.parse(node.value, mode="eval").body
+            except SyntaxError:
+                return _Annotation(None)
+
+        members = None
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            members = [node.left, node.right]
+        elif isinstance(node, ast.Subscript):
+            outer = _last(node.value)
+            inner = node.slice
+            elements = inner.elts if isinstance(inner, ast.Tuple) else [inner]
+            if outer == "Optional":
+                members = [elements[0], ast.Constant(None)]
+            elif outer == "Union":
+                members = elements
+            elif outer == "Annotated":
+                return self._annotation(elements[0], classes)
+            else:
+                return _Annotation(SIMPLE_TYPES.get(outer))
+        if members is not None:
+            # X | None and Optional[X] are an optional X
+            rest = [
+                member
+                for member in members
+                if not (isinstance(member, ast.Constant) and member.value is None)
+            ]
+            optional = len(rest) < len(members)
+            if len(rest) == 1:
+                annotation = self._annotation(rest[0], classes)
+                annotation.optional = annotation.optional or optional
+                return annotation
+            return _Annotation("string", optional=optional)
+
+        name = _last(node)
+        if name in SIMPLE_TYPES:
+            return _Annotation(SIMPLE_TYPES[name])
+        model = classes.get(name)
+        if model is None:
+            return _Annotation(None)
+        bases = {_last(base) for base in model.bases}
+        if bases & {"IntEnum", "IntFlag", "int"}:
+            return _Annotation("integer")
+        if bases & {"Enum", "StrEnum", "str"}:
+            return _Annotation("string")
+        return _Annotation("object", model=model)
+
+    def _model_fields(
+        self, model: ast.ClassDef, classes: dict[str, ast.ClassDef], depth: int = 0
+    ) -> list[dict[str, Any]]:
+        """Return a pydantic model's or dataclass's fields as parameters."""
+        fields: dict[str, dict[str, Any]] = {}
+        if depth < 5:
+            # Inherited fields come first and are overridden by the subclass
+            for base in model.bases:
+                parent = classes.get(_last(base))
+                if parent is not None and parent is not model:
+                    for param in self._model_fields(parent, classes, depth + 1):
+                        fields[param["name"]] = param
+
+        for statement in model.body:
+            if not isinstance(statement, ast.AnnAssign) or not isinstance(
+                statement.target, ast.Name
+            ):
+                continue
+            name = statement.target.id
+            if name.startswith("_") or name == "model_config":
+                continue
+            if _last(statement.annotation) == "ClassVar":
+                continue
+
+            annotation = self._annotation(statement.annotation, classes)
+            description = None
+            default = statement.value
+            if isinstance(default, ast.Call) and _last(default) in ("Field", "field"):
+                keywords = _kwargs(default)
+                description = _const(keywords.get("description"))
+                if "default_factory" in keywords:
+                    default = keywords["default_factory"]
+                else:
+                    default = (
+                        default.args[0] if default.args else keywords.get("default")
+                    )
+            fields[name] = _param(
+                name,
+                annotation.type,
+                description,
+                _is_missing(default) and not annotation.optional,
+            )
+        return list(fields.values())
+
+    # Command lines
+
+    def _find_cli_tools(
+        self, module: _Module, classes: dict[str, ast.ClassDef]
+    ) -> list[ToolSpec]:
+        """Find the tools of the command line a module defines."""
+        if "argparse" in module.imports:
+            tools = self._find_argparse_tools(module)
+            if tools:
+                return tools
+        if "typer" in module.imports:
+            tools = self._find_typer_tools(module, classes)
+            if tools:
+                return tools
+        if "click" in module.imports:
+            return self._find_click_tools(module)
+        return []
+
+    def _find_argparse_tools(self, module: _Module) -> list[ToolSpec]:
+        """Find argparse parsers and turn their arguments into tools."""
+        # Names that assignments bind call results to
+        targets: dict[int, str] = {}
+        for node in ast.walk(module.tree):
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call):
+                name = _name(node.targets[0])
+                if name:
+                    targets[id(node.value)] = name
+
+        # Calls are replayed in source order, the way argparse sees them
+        calls = sorted(
+            (node for node in ast.walk(module.tree) if isinstance(node, ast.Call)),
+            key=lambda node: (node.lineno, node.col_offset),
+        )
+        parsers: list[_Parser] = []
+        by_name: dict[str, _Parser] = {}
+        subparsers: dict[str, _Parser] = {}
+        groups: dict[str, tuple[_Parser, bool]] = {}
+        for call in calls:
+            target = targets.get(id(call))
+            if _last(call) == "ArgumentParser":
+                description = _const(_kwargs(call).get("description"))
+                parser = _Parser([], description or "")
+                parsers.append(parser)
+                if target:
+                    by_name[target] = parser
+                continue
+            if not isinstance(call.func, ast.Attribute):
+                continue
+
+            owner = _name(call.func.value)
+            method = call.func.attr
+            if owner in subparsers and method == "add_parser" and call.args:
+                command = _const(call.args[0])
+                if not isinstance(command, str):
+                    continue
+                keywords = _kwargs(call)
+                description = _const(keywords.get("help")) or _const(
+                    keywords.get("description")
+                )
+                parser = _Parser(
+                    subparsers[owner].command + [command], description or ""
+                )
+                parsers.append(parser)
+                if target:
+                    by_name[target] = parser
+                continue
+            if owner in by_name:
+                parser, exclusive = by_name[owner], False
+            elif owner in groups:
+                parser, exclusive = groups[owner]
+            else:
+                continue
+
+            if method == "add_argument":
+                if exclusive:
+                    parser.exclusive.add(len(parser.arguments))
+                parser.arguments.append(call)
+            elif method == "add_subparsers" and target:
+                parser.has_subcommands = True
+                subparsers[target] = parser
+            elif method == "add_mutually_exclusive_group" and target:
+                groups[target] = (parser, True)
+            elif method == "add_argument_group" and target:
+                groups[target] = (parser, exclusive)
+
+        tools: list[ToolSpec] = []
+        for parser in parsers:
+            if not parser.has_subcommands and (parser.arguments or parser.command):
+                tools.extend(self._argparse_parser_tools(parser, module.path))
+        return self._unique(tools)
+
+    def _argparse_parser_tools(self, parser: _Parser, path: str) -> list[ToolSpec]:
+        """Turn one parser into tools, one per mutually exclusive choice."""
+        shared = _Value()
+        choices: list[tuple[str, str, _Value]] = []
+        for index, call in enumerate(parser.arguments):
+            exclusive = index in parser.exclusive
+            found = self._argparse_value(call, exclusive)
+            if found is None:
+                continue
+            if exclusive:
+                choices.append(found)
+            else:
+                shared.extend(found[2])
+
+        prefix = list(parser.command)
+        base_name = "_".join(_identifier(part) for part in parser.command)
+        if not choices:
+            return [
+                ToolSpec(
+                    name=base_name or _identifier(Path(path).stem),
+                    description=parser.description
+                    or f"Run {' '.join([path, *prefix])}",
+                    args=prefix + shared.elements,
+                    parameters=shared.parameters,
+                )
+            ]
+
+        # Each choice of a mutually exclusive group is a tool of its own,
+        # sharing the parser's other arguments
+        return [
+            ToolSpec(
+                name="_".join(filter(None, [base_name, dest])),
+                description=description or f"Run with --{dest.replace('_', '-')}",
+                args=prefix + value.elements + shared.elements,
+                parameters=value.parameters + shared.parameters,
+            )
+            for dest, description, value in choices
+        ]
+
+    def _argparse_value(
+        self, call: ast.Call, exclusive: bool
+    ) -> tuple[str, str, _Value] | None:
+        """Turn an add_argument() call into its dest, help and value."""
+        flags = _strings(call.args)
+        if not flags:
+            return None
+        keywords = _kwargs(call)
+        action = _const(keywords.get("action"))
+        help_node = keywords.get("help")
+        if action in ("help", "version") or _last(help_node) == "SUPPRESS":
+            return None
+        description = _const(help_node) or ""
+        description = re.sub(r"\s*\(?default:? %\(default\)s\)?", "", description)
+
+        positional = not flags[0].startswith("-")
+        long_flags = [flag for flag in flags if flag.startswith("--")]
+        flag = long_flags[0] if long_flags else flags[0]
+        dest = _identifier(_const(keywords.get("dest")) or flag.lstrip("-"))
+
+        if action in FLAG_ACTIONS:
+            # A flag is a tool of its own in a mutually exclusive group, a
+            # parameter can't toggle it otherwise
+            return (dest, description, _Value([], [flag])) if exclusive else None
+
+        nargs = _const(keywords.get("nargs"))
+        metavar = _const(keywords.get("metavar"))
+        value_type = SIMPLE_TYPES.get(_last(keywords.get("type")), "string")
+        choices = _const(keywords.get("choices"))
+        if isinstance(choices, list | tuple) and choices:
+            listed = ", ".join(str(choice) for choice in choices)
+            description = f"{description} (one of: {listed})".strip()
+        if positional:
+            required = nargs not in ("?", "*")
+        else:
+            required = exclusive or _const(keywords.get("required")) is True
+
+        if (isinstance(nargs, int) and nargs > 1) or isinstance(metavar, tuple):
+            # Several values, each a parameter named after its metavar
+            count = nargs if isinstance(nargs, int) else len(metavar)
+            if isinstance(metavar, tuple) and len(metavar) == count:
+                names = [_identifier(str(part)) for part in metavar]
+            else:
+                names = [f"{dest}_{i}" for i in range(1, count + 1)]
+            parameters = [
+                _param(name, value_type, description, required) for name in names
+            ]
+        else:
+            name = _identifier(metavar) if isinstance(metavar, str) else dest
+            repeated = action in ("append", "extend")
+            many = nargs in ("+", "*") or repeated
+            if many and not positional and not required and not repeated:
+                # The flag would be repeated per item, keeping only the last
+                return None
+            parameters = [
+                _param(name, "array" if many else value_type, description, required)
+            ]
+            names = [name]
+
+        values = [f"{{{name}}}" for name in names]
+        if positional:
+            elements: list[Any] = values
+        elif required and action not in ("append", "extend"):
+            elements = [flag, *values]
+        else:
+            elements = [[flag, *values]]
+        return dest, description, _Value(parameters, elements)
+
+    def _find_click_tools(self, module: _Module) -> list[ToolSpec]:
+        """Find click commands and groups."""
+        groups: dict[str, list[str]] = {}
+        commands: dict[str, tuple[_Function, list[str]]] = {}
+        standalone: list[str] = []
+        for node in module.tree.body:
+            if not isinstance(node, _Function):
+                continue
+            for decorator in node.decorator_list:
+                if not isinstance(decorator, ast.Call):
+                    continue
+                kind = _last(decorator)
+                if kind not in ("command", "group"):
+                    continue
+                names = _strings(decorator.args)
+                command = (
+                    names[0]
+                    if names
+                    else _const(_kwargs(decorator).get("name"))
+                    or node.name.replace("_", "-")
+                )
+                owner = _name(decorator.func).rpartition(".")[0]
+                if owner in groups:
+                    path = groups[owner] + [command]
+                elif owner in ("click", ""):
+                    path = []
+                else:
+                    continue
+                if kind == "group":
+                    groups[node.name] = path
+                else:
+                    commands[node.name] = (node, path)
+                    if not path:
+                        standalone.append(node.name)
+
+        for node in ast.walk(module.tree):
+            # Commands attached with group.add_command(command, name)
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr == "add_command"
+                and _name(node.func.value) in groups
+                and node.args
+                and _name(node.args[0]) in commands
+            ):
+                name = _name(node.args[0])
+                function, _ = commands[name]
+                names = _strings(node.args[1:])
+                command = names[0] if names else function.name.replace("_", "-")
+                commands[name] = (function, groups[_name(node.func.value)] + [command])
+                if name in standalone:
+                    standalone.remove(name)
+
+        if groups:
+            entries = [
+                entry for name, entry in commands.items() if name not in standalone
+            ]
+        else:
+            # A script without groups runs the one command it calls
+            called = {
+                _name(node.func)
+                for node in ast.walk(module.tree)
+                if isinstance(node, ast.Call)
+            }
+            chosen = [name for name in standalone if name in called] or standalone[:1]
+            entries = [commands[name] for name in chosen]
+
+        tools = []
+        for function, path in entries:
+            value = _Value()
+            # click keeps parameters in the order the decorators are written
+            for decorator in function.decorator_list:
+                if isinstance(decorator, ast.Call) and _last(decorator) in (
+                    "option",
+                    "argument",
+                ):
+                    found = self._click_value(decorator)
+                    if found is not None:
+                        value.extend(found)
+            tools.append(
+                ToolSpec(
+                    name="_".join(_identifier(part) for part in path) or function.name,
+                    description=_first_line(ast.get_docstring(function))
+                    or f"Run {' '.join([module.path, *path])}",
+                    args=list(path) + value.elements,
+                    parameters=value.parameters,
+                )
+            )
+        return self._unique(tools)
+
+    def _click_value(self, decorator: ast.Call) -> _Value | None:
+        """Turn a click.option() or click.argument() into a value."""
+        declarations = _strings(decorator.args)
+        if not declarations:
+            return None
+        keywords = _kwargs(decorator)
+        if _const(keywords.get("is_flag")) or _const(keywords.get("count")):
+            return None
+        if "/" in declarations[0] or _const(keywords.get("hidden")):
+            return None
+        value_type = SIMPLE_TYPES.get(_last(keywords.get("type")), "string")
+        if value_type == "boolean":
+            return None
+        description = _const(keywords.get("help"))
+
+        if _last(decorator) == "argument":
+            name = _identifier(declarations[0])
+            many = _const(keywords.get("nargs")) == -1
+            required = _const(keywords.get("required"))
+            if required is None:
+                required = not many and "default" not in keywords
+            return _Value(
+                [_param(name, "array" if many else value_type, description, required)],
+                [f"{{{name}}}"],
+            )
+
+        flags = [text for text in declarations if text.startswith("-")]
+        identifiers = [text for text in declarations if not text.startswith("-")]
+        if not flags:
+            return None
+        long_flags = [flag for flag in flags if flag.startswith("--")]
+        flag = long_flags[0] if long_flags else flags[0]
+        name = _identifier(identifiers[0] if identifiers else flag.lstrip("-"))
+        many = bool(_const(keywords.get("multiple")))
+        required = _const(keywords.get("required")) is True
+        param = _param(name, "array" if many else value_type, description, required)
+        if required and not many:
+            return _Value([param], [flag, f"{{{name}}}"])
+        return _Value([param], [[flag, f"{{{name}}}"]])
+
+    def _find_typer_tools(
+        self, module: _Module, classes: dict[str, ast.ClassDef]
+    ) -> list[ToolSpec]:
+        """Find typer apps and their commands."""
+        apps: dict[str, list[str]] = {}
+        for node in ast.walk(module.tree):
+            if (
+                isinstance(node, ast.Assign)
+                and isinstance(node.value, ast.Call)
+                and _last(node.value) == "Typer"
+            ):
+                apps[_name(node.targets[0])] = []
+
+        # Sub-apps run under the name add_typer() gives them
+        parents = set()
+        calls = sorted(
+            (node for node in ast.walk(module.tree) if isinstance(node, ast.Call)),
+            key=lambda node: (node.lineno, node.col_offset),
+        )
+        for call in calls:
+            if (
+                isinstance(call.func, ast.Attribute)
+                and call.func.attr == "add_typer"
+                and _name(call.func.value) in apps
+                and call.args
+                and _name(call.args[0]) in apps
+            ):
+                parent = _name(call.func.value)
+                child = _name(call.args[0])
+                name = _const(_kwargs(call).get("name")) or child
+                apps[child] = apps[parent] + [name]
+                parents.add(parent)
+
+        commands: list[tuple[_Function, str, str]] = []
+        by_name = {}
+        for node in module.tree.body:
+            if not isinstance(node, _Function):
+                continue
+            by_name[node.name] = node
+            for decorator in node.decorator_list:
+                if (
+                    isinstance(decorator, ast.Call)
+                    and isinstance(decorator.func, ast.Attribute)
+                    and decorator.func.attr == "command"
+                    and _name(decorator.func.value) in apps
+                ):
+                    names = _strings(decorator.args)
+                    command = (
+                        names[0]
+                        if names
+                        else _const(_kwargs(decorator).get("name"))
+                        or node.name.replace("_", "-")
+                    )
+                    commands.append((node, _name(decorator.func.value), command))
+
+        per_app: dict[str, int] = {}
+        for _, app, _ in commands:
+            per_app[app] = per_app.get(app, 0) + 1
+        entries: list[tuple[_Function, list[str]]] = []
+        for function, app, command in commands:
+            # An app with one command and no sub-apps runs it without its name
+            single = per_app[app] == 1 and app not in parents
+            entries.append((function, apps[app] + ([] if single else [command])))
+
+        for call in calls:
+            # typer.run(main) turns one function into a command line
+            if _name(call.func) == "typer.run" and call.args:
+                function = by_name.get(_name(call.args[0]))
+                if function is not None:
+                    entries.append((function, []))
+
+        tools = []
+        for function, path in entries:
+            value = self._typer_value(function, classes)
+            tools.append(
+                ToolSpec(
+                    name="_".join(_identifier(part) for part in path) or function.name,
+                    description=_first_line(ast.get_docstring(function))
+                    or f"Run {' '.join([module.path, *path])}",
+                    args=list(path) + value.elements,
+                    parameters=value.parameters,
+                )
+            )
+        return self._unique(tools)
+
+    def _typer_value(
+        self,
+        function: _Function,
+        classes: dict[str, ast.ClassDef],
+    ) -> _Value:
+        """Turn a typer command's parameters into a value."""
+        value = _Value()
+        for argument, default in _defaults(function):
+            if _last(argument.annotation) == "Context":
+                continue
+            annotation = self._annotation(argument.annotation, classes)
+            if annotation.type == "boolean":
+                # Boolean options are --flag/--no-flag switches
+                continue
+
+            # The typer.Option or typer.Argument is in Annotated or the default
+            info = next(
+                (
+                    extra
+                    for extra in _annotated_extra(argument.annotation)
+                    if _last(extra) in ("Option", "Argument")
+                ),
+                None,
+            )
+            fallback = default
+            declarations = _strings(info.args) if isinstance(info, ast.Call) else []
+            if isinstance(default, ast.Call) and _last(default) in (
+                "Option",
+                "Argument",
+            ):
+                # Without Annotated, the first argument is the default
+                info = default
+                keywords = _kwargs(default)
+                fallback = default.args[0] if default.args else keywords.get("default")
+                declarations = _strings(default.args[1:])
+
+            keywords = _kwargs(info) if isinstance(info, ast.Call) else {}
+            name = argument.arg
+            required = _is_missing(fallback) and not annotation.optional
+            param_type = annotation.type if annotation.model is None else "string"
+            param = _param(name, param_type, _const(keywords.get("help")), required)
+            placeholder = f"{{{name}}}"
+            if (info is None and default is None) or _last(info) == "Argument":
+                value.extend(_Value([param], [placeholder]))
+                continue
+
+            flags = [text for text in declarations if text.startswith("-")]
+            flag = next((f for f in flags if f.startswith("--")), None) or (
+                flags[0] if flags else f"--{name.replace('_', '-')}"
+            )
+            if required and param_type != "array":
+                value.extend(_Value([param], [flag, placeholder]))
+            else:
+                value.extend(_Value([param], [[flag, placeholder]]))
+        return value
+
+    # Web routes
+
+    def _web_framework(self, module: _Module) -> str | None:
+        """Return the web framework a module defines routes with."""
+        if "fastapi" in module.imports:
+            return "fastapi"
+        if "flask" in module.imports:
+            return "flask"
+        return None
+
+    def _find_routes(
+        self, module: _Module, framework: str, classes: dict[str, ast.ClassDef]
+    ) -> list[ToolSpec]:
+        """Find the routes of FastAPI apps and routers or Flask blueprints."""
+        prefixes: dict[str, str] = {}
+        for node in ast.walk(module.tree):
+            if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)):
+                continue
+            kind = _last(node.value)
+            keywords = _kwargs(node.value)
+            target = _name(node.targets[0])
+            if kind in ("FastAPI", "Flask"):
+                prefixes[target] = ""
+            elif kind == "APIRouter":
+                prefixes[target] = _const(keywords.get("prefix")) or ""
+            elif kind == "Blueprint":
+                prefixes[target] = _const(keywords.get("url_prefix")) or ""
+
+        for node in ast.walk(module.tree):
+            # Routers included into an app in the same module
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr in ("include_router", "register_blueprint")
+                and node.args
+                and _name(node.args[0]) in prefixes
+            ):
+                keywords = _kwargs(node)
+                prefix = _const(keywords.get("prefix")) or _const(
+                    keywords.get("url_prefix")
+                )
+                if isinstance(prefix, str):
+                    router = _name(node.args[0])
+                    prefixes[router] = prefix.rstrip("/") + prefixes[router]
+
+        tools = []
+        for node in ast.walk(module.tree):
+            if not isinstance(node, _Function):
+                continue
+            for decorator in node.decorator_list:
+                route = self._route(decorator, prefixes)
+                if route is None:
+                    continue
+                path, methods = route
+                for method in methods:
+                    if framework == "flask":
+                        tool = self._flask_tool(node, path, method)
+                    else:
+                        tool = self._fastapi_tool(
+                            node, decorator, path, method, classes
+                        )
+                    if len(methods) > 1:
+                        tool.name = f"{tool.name}_{method.lower()}"
+                    tools.append(tool)
+        return tools
+
+    def _route(
+        self, decorator: ast.expr, prefixes: dict[str, str]
+    ) -> tuple[str, list[str]] | None:
+        """Return a route decorator's full path and methods."""
+        if not isinstance(decorator, ast.Call) or not isinstance(
+            decorator.func, ast.Attribute
+        ):
+            return None
+        owner = _name(decorator.func.value)
+        if owner not in prefixes or not decorator.args:
+            return None
+        path = _const(decorator.args[0])
+        if not isinstance(path, str):
+            return None
+
+        kind = decorator.func.attr
+        if kind in HTTP_METHODS:
+            methods = [kind.upper()]
+        elif kind in ("route", "api_route"):
+            listed = _const(_kwargs(decorator).get("methods")) or ["GET"]
+            methods = [
+                method.upper()
+                for method in listed
+                if isinstance(method, str) and method.lower() in HTTP_METHODS
+            ]
+        else:
+            return None
+        return prefixes[owner] + path, methods
+
+    def _fastapi_tool(
+        self,
+        function: _Function,
+        decorator: ast.Call,
+        path: str,
+        method: str,
+        classes: dict[str, ast.ClassDef],
+    ) -> ToolSpec:
+        """Turn a FastAPI route into a tool."""
+        path_params = set(PATH_PARAM.findall(path))
+        parameters = []
+        for argument, default in _defaults(function):
+            if argument.arg in ("self", "cls"):
+                continue
+            if _last(argument.annotation) in FRAMEWORK_PARAMS:
+                continue
+            annotation = self._annotation(argument.annotation, classes)
+
+            # Query(), Path() and friends are in Annotated or the default
+            source = next(
+                (
+                    e
+                    for e in _annotated_extra(argument.annotation)
+                    if isinstance(e, ast.Call)
+                ),
+                default,
+            )
+            kind = _last(source) if isinstance(source, ast.Call) else None
+            if kind in UNSUPPORTED_SOURCES:
+                continue
+
+            name = argument.arg
+            description = None
+            fallback = default
+            if isinstance(source, ast.Call) and kind in ("Query", "Path", "Body"):
+                keywords = _kwargs(source)
+                description = _const(keywords.get("description"))
+                name = _const(keywords.get("alias")) or name
+                if source is default:
+                    fallback = (
+                        source.args[0] if source.args else keywords.get("default")
+                    )
+
+            if annotation.model is not None and name not in path_params:
+                # A model is the JSON body, its fields are parameters of their own
+                parameters.extend(self._model_fields(annotation.model, classes))
+                continue
+            required = name in path_params or (
+                _is_missing(fallback) and not annotation.optional
+            )
+            parameters.append(_param(name, annotation.type, description, required))
+
+        keywords = _kwargs(decorator)
+        description = (
+            _const(keywords.get("summary"))
+            or _first_line(ast.get_docstring(function))
+            or _const(keywords.get("description"))
+            or f"{method} {path}"
+        )
+        return ToolSpec(
+            name=function.name,
+            description=description,
+            args=[],
+            parameters=parameters,
+            options={"endpoint": path, "method": method},
+        )
+
+    def _flask_tool(self, function: _Function, path: str, method: str) -> ToolSpec:
+        """Turn a Flask route into a tool."""
+        converters = {"int": "integer", "float": "number"}
+        parameters = [
+            _param(name, converters.get(converter, "string"), None)
+            for converter, name in FLASK_CONVERTER.findall(path)
+        ]
+        known = {param["name"] for param in parameters}
+
+        # Query parameters are read with request.args.get() or request.args[]
+        for node in ast.walk(function):
+            name = None
+            required = False
+            value_type = "string"
+            if (
+                isinstance(node, ast.Call)
+                and _name(node.func) == "request.args.get"
+                and node.args
+            ):
+                name = _const(node.args[0])
+                value_type = SIMPLE_TYPES.get(
+                    _last(_kwargs(node).get("type")), "string"
+                )
+            elif (
+                isinstance(node, ast.Subscript) and _name(node.value) == "request.args"
+            ):
+                name = _const(node.slice)
+                required = True
+            if isinstance(name, str) and name not in known:
+                known.add(name)
+                parameters.append(_param(name, value_type, None, required))
+
+        return ToolSpec(
+            name=function.name,
+            description=_first_line(ast.get_docstring(function)) or f"{method} {path}",
+            args=[],
+            parameters=parameters,
+            options={"endpoint": FLASK_CONVERTER.sub(r"{\2}", path), "method": method},
+        )
+
+    def _find_port(self, module: _Module) -> int | None:
+        """Return the port from a module's run(port=...) call."""
+        for node in ast.walk(module.tree):
+            if isinstance(node, ast.Call) and _last(node) == "run":
+                port = _const(_kwargs(node).get("port"))
+                if isinstance(port, int):
+                    return port
+        return None
+
+    # Functions
+
+    def _find_functions(
+        self, module: _Module, classes: dict[str, ast.ClassDef]
+    ) -> list[ToolSpec]:
+        """Find a module's public functions that have type hints."""
+        exported = None
+        for node in module.tree.body:
+            if isinstance(node, ast.Assign) and _name(node.targets[0]) == "__all__":
+                listed = _const(node.value)
+                if isinstance(listed, list | tuple):
+                    exported = set(listed)
+
+        tools = []
+        for node in module.tree.body:
+            if not isinstance(node, _Function):
+                continue
+            if node.name.startswith("_") or node.name == "main" or node.decorator_list:
+                continue
+            if exported is not None and node.name not in exported:
+                continue
+            tool = self._function_tool(node, classes)
+            if tool is not None:
+                tools.append(tool)
+        return tools
+
+    def _function_tool(
+        self,
+        function: _Function,
+        classes: dict[str, ast.ClassDef],
+    ) -> ToolSpec | None:
+        """Turn a fully annotated function into a tool, None if it isn't one."""
+        arguments = function.args
+        if arguments.vararg or arguments.kwarg or arguments.posonlyargs:
+            return None
+        if not arguments.args and not arguments.kwonlyargs and not function.returns:
+            return None
+
+        parameters = []
+        for argument, default in _defaults(function):
+            annotation = self._annotation(argument.annotation, classes)
+            if annotation.type is None:
+                return None
+            parameters.append(
+                _param(
+                    argument.arg,
+                    annotation.type,
+                    self._docstring_param(function, argument.arg),
+                    default is None and not annotation.optional,
+                )
+            )
+
+        return ToolSpec(
+            name=function.name,
+            description=_first_line(ast.get_docstring(function))
+            or f"Call {function.name}",
+            args=[],
+            parameters=parameters,
+        )
+
+    def _docstring_param(self, function: _Function, name: str) -> str | None:
+        """Return a parameter's description from a Google or Sphinx docstring."""
+        docstring = ast.get_docstring(function) or ""
+        match = re.search(
+            rf"^\s*(?::param\s+)?{re.escape(name)}\s*(?:\([^)]*\))?\s*:\s*(.+)$",
+            docstring,
+            re.M,
+        )
+        return match.group(1).strip() if match else None
@@ -12,12 +12,35 @@ from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+from .cache import LLMResponseCache
+from .chunking import merge_tool_specs, split_digest
+from .context import build_context, read_sources
 from .types import DetectionResult, ProjectInfo, ToolSpec
 
 
 class BaseDetector(ABC):
     """Base class for project detection and analysis."""
 
+    # Bump when prompts or response parsing change to retire cached responses
+    PROMPT_VERSION = 1
+
+    # Cache of LLM responses, None when caching is disabled
+    response_cache: LLMResponseCache | None = None
+
+    # Token budget for each chunk of a code digest sent to the model
+    CHUNK_TOKENS = 12000
+
+    # Chunks of a code digest analysed at the same time
+    max_parallel_chunks = 4
+
+    # Budget for the summary of a project's code sent to the model
+    CONTEXT_CHARS = 8000
+
+    # Whether detected tools get a second model pass to refine them, and
+    # how many tools are refined at the same time
+    enhance = False
+    enhance_concurrency = 8
+
     @abstractmethod
     def __init__(self, **kwargs: Any) -> None:
         """Initialize the detector with configuration options."""
@@ -109,6 +132,103 @@ class BaseDetector(ABC):
             confidence_score=0.5,
         )
 
+    def _code_context(self, project_path: Path) -> str:
+        """
+        Summarize a project's code for a prompt, most relevant parts first.
+
+        A static pre-pass keeps argument parsers, entry points, routes,
+        commands and signatures instead of the start of each file.
+
+        Args:
+            project_path: Path to the project directory
+
+        Returns:
+            The summary, empty if the project has no Python code to summarize
+        """
+        return build_context(read_sources(project_path), self.CONTEXT_CHARS)
+
+    def _detect_chunk(
+        self, chunk: str, project_info: ProjectInfo
+    ) -> list[dict[str, Any]]:
+        """
+        Detect tools in one chunk of a code digest.
+
+        The default runs the detector's single-shot content detection on the
+        chunk. Detectors whose _detect_from_content calls
+        _detect_tools_chunked must override this.
+
+        Args:
+            chunk: Part of the code digest, split on file boundaries
+            project_info: Information extracted from the whole digest
+
+        Returns:
+            List of tool specifications as dictionaries
+        """
+        result = self._detect_from_content(chunk)
+        return [self._tool_spec_to_dict(tool) for tool in result.tools]
+
+    def _detect_tools_chunked(
+        self, code_content: str, project_info: ProjectInfo
+    ) -> list[ToolSpec]:
+        """
+        Detect tools in a code digest too large for a single prompt.
+
+        The digest is split on file boundaries into chunks of at most
+        CHUNK_TOKENS tokens, up to max_parallel_chunks chunks are analysed
+        concurrently, and the tools found are merged by name.
+
+        Args:
+            code_content: The code content to analyze (from GitIngest)
+            project_info: Information extracted from the digest
+
+        Returns:
+            List of detected tools without duplicates
+        """
+        chunks = split_digest(code_content, self.CHUNK_TOKENS)
+        if len(chunks) <= 1:
+            return self._tool_specs(self._detect_chunk(code_content, project_info))
+
+        workers = max(1, min(self.max_parallel_chunks, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda chunk: self._detect_chunk(chunk, project_info), chunks
+            )
+            return merge_tool_specs(self._tool_specs(data) for data in results)
+
+    def _enhance_tools(self, tools: list[ToolSpec], context: str) -> list[ToolSpec]:
+        """
+        Refine detected tools' descriptions and parameters.
+
+        Detectors backed by a model override this; by default tools are
+        returned unchanged.
+
+        Args:
+            tools: Detected tools
+            context: Project context the tools were detected in
+
+        Returns:
+            List of refined tools, in the same order
+        """
+        return tools
+
+    def _tool_specs(self, tools_data: list[dict[str, Any]]) -> list[ToolSpec]:
+        """Convert tool dictionaries returned by a model to ToolSpec objects."""
+        tools = []
+        for tool_data in tools_data:
+            try:
+                tool = ToolSpec(
+                    name=tool_data["name"],
+                    description=tool_data["description"],
+                    args=tool_data.get("args", []),
+                    parameters=tool_data.get("parameters", []),
+                )
+                tools.append(tool)
+            except Exception as e:
+                print(
+                    f"Warning: Failed to create tool spec for {tool_data.get('name', 'unknown')}: {e}"
+                )
+        return tools
+
     def _extract_project_info(self, project_path: Path) -> ProjectInfo:
         """Extract basic information about the project."""
         # Get project name from directory or pyproject.toml/setup.py
@@ -386,6 +506,23 @@ class BaseDetector(ABC):
                 },
             }
 
+    def _response_cache_key(self, model: str, *prompt: Any) -> str:
+        """Build the cache key for an LLM response to a prompt."""
+        return LLMResponseCache.key(
+            type(self).__name__, model, self.PROMPT_VERSION, *prompt
+        )
+
+    def _cached_response(self, key: str) -> str | None:
+        """Return a cached LLM response, or None on a miss."""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.get(key)
+
+    def _cache_response(self, key: str, response: str) -> None:
+        """Cache an LLM response that was parsed successfully."""
+        if self.response_cache is not None:
+            self.response_cache.put(key, response)
+
     def _map_python_type_to_json(self, python_type: str) -> str:
         """Map Python types to JSON schema types."""
         type_mapping = {
@@ -397,6 +534,15 @@ class BaseDetector(ABC):
         }
         return type_mapping.get(python_type, "string")
 
+    def _result_to_config(self, result: DetectionResult) -> dict[str, Any]:
+        """Convert a detection result to the MCP configuration format."""
+        return {
+            "name": result.project_info.name,
+            "description": result.project_info.description,
+            "backend": result.backend_config,
+            "tools": [self._tool_spec_to_dict(tool) for tool in result.tools],
+        }
+
     def _tool_spec_to_dict(self, tool: ToolSpec) -> dict[str, Any]:
         """Convert ToolSpec to dictionary format."""
         return {
@@ -404,4 +550,5 @@ class BaseDetector(ABC):
             "description": tool.description,
             "args": tool.args,
             "parameters": tool.parameters,
+            **tool.options,
         }
@@ -0,0 +1,106 @@
+"""
+On-disk cache of LLM responses for detectors.
+
+Responses are stored as files sharded by the first two characters of a
+content hash of everything that shapes the response: the model, the prompt
+template version and the prompt itself. Re-running a detection on an
+unchanged project then reuses the earlier responses. Once the cache grows
+past its size limit the least recently used entries are evicted.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+# Default size limit for the cache directory
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory, MCPIFY_CACHE_DIR overrides the default."""
+    configured = os.getenv("MCPIFY_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    return Path.home() / ".mcpify" / "cache"
+
+
+class LLMResponseCache:
+    """Content-addressed store of LLM responses with LRU size eviction."""
+
+    def __init__(
+        self, directory: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """Initialize the cache, creating its directory on first write."""
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Hash the inputs that determine a response into a cache key."""
+        data = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Return the file holding an entry."""
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> str | None:
+        """Return a cached response, or None on a miss."""
+        path = self._path(key)
+        try:
+            response = path.read_text(encoding="utf-8")
+            # The modification time doubles as the last use for eviction
+            os.utime(path)
+        except OSError:
+            return None
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response, evicting old entries if the cache is too big."""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(response)
+            os.replace(temp_path, path)
+            self._evict()
+        except OSError as e:
+            # A cache that can't be written only costs speed
+            print(f"Warning: Failed to write LLM response cache: {e}")
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits."""
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        for path in self.directory.glob("*/*"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
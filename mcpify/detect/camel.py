@@ -7,10 +7,13 @@ framework for intelligent project analysis and tool detection.
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from .base import BaseDetector
+from .cache import LLMResponseCache
+from .context import compact_digest
 from .types import DetectionResult, ProjectInfo, ToolSpec
 
 try:
@@ -28,7 +31,18 @@ except ImportError:
 class CamelDetector(BaseDetector):
     """Camel-AI based project detector using ChatAgent framework."""
 
-    def __init__(self, model_name: str = "gpt-4o-mini", **kwargs: Any) -> None:
+    # GPT-4o mini has a 128K context, smaller chunks keep each call quick
+    CHUNK_TOKENS = 24000
+
+    def __init__(
+        self,
+        model_name: str = "gpt-4o-mini",
+        use_cache: bool = True,
+        max_parallel_chunks: int = 4,
+        enhance: bool = False,
+        enhance_concurrency: int = 8,
+        **kwargs: Any,
+    ) -> None:
         """Initialize the detector with Camel-AI ChatAgent."""
         # super().__init__(**kwargs)
 
@@ -46,11 +60,23 @@ class CamelDetector(BaseDetector):
             )
 
         self.model_name = model_name
+        if use_cache:
+            self.response_cache = LLMResponseCache()
+        self.max_parallel_chunks = max_parallel_chunks
+        if enhance_concurrency < 1:
+            raise ValueError("enhance_concurrency must be at least 1")
+        self.enhance = enhance
+        self.enhance_concurrency = enhance_concurrency
+        self.system_message = ""
         self.agent: ChatAgent | None = None
         self._initialize_agent()
 
     def _initialize_agent(self) -> None:
         """Initialize the ChatAgent with correct API usage."""
+        self.agent = self._create_agent()
+
+    def _create_agent(self) -> "ChatAgent":
+        """Create a ChatAgent with the detection system prompt."""
         # Create model using ModelFactory
         model = ModelFactory.create(
             model_platform=ModelPlatformType.OPENAI,
@@ -71,9 +97,10 @@ You excel at:
 - Extracting parameter information and types
 
 Always provide detailed, accurate analysis in JSON format."""
+        self.system_message = system_message
 
         # Create ChatAgent using the new API
-        self.agent = ChatAgent(
+        return ChatAgent(
             system_message=system_message, model=model, message_window_size=10
         )
 
@@ -102,6 +129,9 @@ Always provide detailed, accurate analysis in JSON format."""
                 )
             )
 
+        if self.enhance:
+            tools = self._enhance_tools(tools, context)
+
         return tools
 
     def _gather_project_context(
@@ -129,16 +159,22 @@ Always provide detailed, accurate analysis in JSON format."""
         structure = self._get_directory_structure(project_path)
         context_parts.append(f"Directory Structure:\n{structure}")
 
-        # Code samples from main files
-        context_parts.append("\nKey Code Files:")
-        for main_file in project_info.main_files[:5]:  # Limit to first 5 files
-            file_path = project_path / main_file
-            try:
-                with open(file_path, encoding="utf-8") as f:
-                    content = f.read()[:2500]  # First 2500 chars
-                    context_parts.append(f"\n=== {main_file} ===\n{content}")
-            except Exception as e:
-                context_parts.append(f"\n=== {main_file} ===\nError: {e}")
+        # Parsers, routes and signatures found by a static pre-pass, with
+        # the start of the main files for projects it can't summarize
+        code_context = self._code_context(project_path)
+        if code_context:
+            context_parts.append("\nRelevant code:")
+            context_parts.append(code_context)
+        else:
+            context_parts.append("\nKey Code Files:")
+            for main_file in project_info.main_files[:5]:  # Limit to first 5 files
+                file_path = project_path / main_file
+                try:
+                    with open(file_path, encoding="utf-8") as f:
+                        content = f.read()[:2500]  # First 2500 chars
+                        context_parts.append(f"\n=== {main_file} ===\n{content}")
+                except Exception as e:
+                    context_parts.append(f"\n=== {main_file} ===\nError: {e}")
 
         return "\n".join(context_parts)
 
@@ -170,9 +206,13 @@ Always provide detailed, accurate analysis in JSON format."""
         return "\n".join(structure_lines[:20])  # Limit output
 
     def _agent_detect_tools(
-        self, context: str, project_info: ProjectInfo
+        self,
+        context: str,
+        project_info: ProjectInfo,
+        agent: "ChatAgent | None" = None,
     ) -> list[dict[str, Any]]:
         """Use ChatAgent to analyze project and detect tools."""
+        agent = agent or self.agent
 
         user_prompt = f"""Analyze this project and identify all possible tools/APIs that can be exposed as MCP tools:
 
@@ -212,16 +252,24 @@ Return your analysis as a JSON array with this EXACT format:
 
 Focus on practical, usable tools that provide real value."""
 
+        content = ""
+        cache_key = self._response_cache_key(
+            self.model_name, self.system_message, user_prompt
+        )
         try:
-            # Send message to agent using the correct API
-            user_message = BaseMessage.make_user_message(
-                role_name="User", content=user_prompt
-            )
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                content = cached
+            else:
+                # Send message to agent using the correct API
+                user_message = BaseMessage.make_user_message(
+                    role_name="User", content=user_prompt
+                )
 
-            if self.agent is None:
-                raise ValueError("Camel-AI agent not initialized")
-            response = self.agent.step(user_message)
-            content = response.msg.content.strip()
+                if agent is None:
+                    raise ValueError("Camel-AI agent not initialized")
+                response = agent.step(user_message)
+                content = response.msg.content.strip()
 
             # Extract JSON from response
             start_idx = content.find("[")
@@ -251,6 +299,7 @@ Focus on practical, usable tools that provide real value."""
                 else:
                     print(f"Warning: Skipping invalid tool specification: {tool}")
 
+            self._cache_response(cache_key, content)
             return validated_tools
 
         except json.JSONDecodeError as e:
@@ -261,8 +310,19 @@ Focus on practical, usable tools that provide real value."""
             print(f"Error: Camel-AI tool detection failed: {e}")
             return []
 
-    def _enhance_tool_with_agent(self, tool: ToolSpec, context: str) -> ToolSpec:
+    def _detect_chunk(
+        self, chunk: str, project_info: ProjectInfo
+    ) -> list[dict[str, Any]]:
+        """Use a fresh ChatAgent to detect tools in one chunk of a digest."""
+        # Agents keep a conversation history, so concurrent chunks each
+        # get their own
+        return self._agent_detect_tools(chunk, project_info, self._create_agent())
+
+    def _enhance_tool_with_agent(
+        self, tool: ToolSpec, context: str, agent: "ChatAgent | None" = None
+    ) -> ToolSpec:
         """Use ChatAgent to enhance a single tool's specification."""
+        agent = agent or self.agent
         try:
             prompt = f"""
             Enhance this tool specification with better descriptions and details:
@@ -296,25 +356,47 @@ Focus on practical, usable tools that provide real value."""
             }}
             """
 
-            user_message = BaseMessage.make_user_message(
-                role_name="User", content=prompt
+            cache_key = self._response_cache_key(
+                self.model_name, self.system_message, prompt
             )
-            if self.agent is None:
-                raise ValueError("Camel-AI agent not initialized")
-            response = self.agent.step(user_message)
-            enhanced_data = json.loads(response.msg.content)
+            content = self._cached_response(cache_key)
+            if content is None:
+                user_message = BaseMessage.make_user_message(
+                    role_name="User", content=prompt
+                )
+                if agent is None:
+                    raise ValueError("Camel-AI agent not initialized")
+                response = agent.step(user_message)
+                content = response.msg.content
+            enhanced_data = json.loads(content)
 
-            return ToolSpec(
+            enhanced = ToolSpec(
                 name=enhanced_data["name"],
                 description=enhanced_data["description"],
                 args=enhanced_data.get("args", tool.args),
                 parameters=enhanced_data.get("parameters", tool.parameters),
             )
+            self._cache_response(cache_key, content)
+            return enhanced
 
         except Exception as e:
             print(f"Warning: Failed to enhance tool {tool.name}: {e}")
             return tool
 
+    def _enhance_tools(self, tools: list[ToolSpec], context: str) -> list[ToolSpec]:
+        """Enhance tools concurrently, each with its own ChatAgent."""
+        if not tools:
+            return tools
+        with ThreadPoolExecutor(max_workers=self.enhance_concurrency) as executor:
+            return list(
+                executor.map(
+                    lambda tool: self._enhance_tool_with_agent(
+                        tool, context, self._create_agent()
+                    ),
+                    tools,
+                )
+            )
+
     def _detect_from_content(self, code_content: str) -> "DetectionResult":
         """
         Analyze code content and return detection result.
@@ -328,24 +410,12 @@ Focus on practical, usable tools that provide real value."""
         # Extract basic project info from content
         project_info = self._extract_project_info_from_content(code_content)
 
-        # Use Camel-AI agent to detect tools
-        tools_data = self._agent_detect_tools(code_content, project_info)
-
-        # Convert to ToolSpec objects
-        tools = []
-        for tool_data in tools_data:
-            try:
-                tool = ToolSpec(
-                    name=tool_data["name"],
-                    description=tool_data["description"],
-                    args=tool_data.get("args", []),
-                    parameters=tool_data.get("parameters", []),
-                )
-                tools.append(tool)
-            except Exception as e:
-                print(
-                    f"Warning: Failed to create tool spec for {tool_data.get('name', 'unknown')}: {e}"
-                )
+        # Only send what can define tools, chunk by chunk so large digests
+        # fit in the prompt
+        compacted = compact_digest(code_content)
+        tools = self._detect_tools_chunked(compacted, project_info)
+        if self.enhance:
+            tools = self._enhance_tools(tools, compacted)
 
         # Generate appropriate backend config
         backend_config = self._generate_backend_config_from_content(project_info)
@@ -0,0 +1,115 @@
+"""
+Chunking of code digests for map-reduce detection.
+
+Large GitIngest digests don't fit in one prompt. They are split on file
+boundaries into chunks that fit a token budget, tools are detected in each
+chunk separately, and the per-chunk results are merged into one list.
+"""
+
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from .types import ToolSpec
+
+# Rough token estimate for source code, avoiding a tokenizer dependency
+CHARS_PER_TOKEN = 4
+
+# Header GitIngest writes before each file in a digest
+FILE_HEADER = re.compile(r"^={8,}\n(?:FILE|DIRECTORY|SYMLINK): .*\n={8,}\n", re.M)
+
+
+def split_files(code_content: str) -> list[str]:
+    """Split a digest into sections that each hold one file."""
+    starts = [match.start() for match in FILE_HEADER.finditer(code_content)]
+    if not starts or starts[0] != 0:
+        # Text before the first file header stays a section of its own
+        starts.insert(0, 0)
+    starts.append(len(code_content))
+    return [
+        code_content[start:end]
+        for start, end in zip(starts, starts[1:], strict=False)
+        if code_content[start:end].strip()
+    ]
+
+
+def _split_section(section: str, max_chars: int) -> list[str]:
+    """Split a file too large for one chunk on line boundaries."""
+    match = FILE_HEADER.match(section)
+    header = match.group(0) if match else ""
+    body = section[len(header) :]
+    room = max(max_chars - len(header), 1)
+
+    pieces = []
+    current = ""
+    for line in body.splitlines(keepends=True):
+        while len(line) > room:
+            # A single line longer than the budget is cut
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:room])
+            line = line[room:]
+        if len(current) + len(line) > room:
+            pieces.append(current)
+            current = ""
+        current += line
+    if current:
+        pieces.append(current)
+    # Repeat the header so every piece says which file it comes from
+    return [header + piece for piece in pieces]
+
+
+def split_digest(code_content: str, max_tokens: int) -> list[str]:
+    """Pack a digest's files into chunks of at most max_tokens each."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks: list[str] = []
+    current = ""
+    for section in split_files(code_content):
+        if len(section) <= max_chars:
+            pieces = [section]
+        else:
+            pieces = _split_section(section, max_chars)
+        for piece in pieces:
+            if current and len(current) + len(piece) > max_chars:
+                chunks.append(current)
+                current = ""
+            current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _param_name(param: Any) -> Any:
+    """Return a parameter's name, models don't always return dicts."""
+    return param.get("name") if isinstance(param, dict) else str(param)
+
+
+def merge_tool_specs(groups: Iterable[list[ToolSpec]]) -> list[ToolSpec]:
+    """Merge tools found in separate chunks, combining duplicates by name."""
+    merged: dict[str, ToolSpec] = {}
+    for tools in groups:
+        for tool in tools:
+            key = tool.name.strip().lower()
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = ToolSpec(
+                    name=tool.name,
+                    description=tool.description,
+                    args=list(tool.args),
+                    parameters=list(tool.parameters),
+                    options=dict(tool.options),
+                )
+                continue
+
+            # Keep the fuller description and the union of the parameters
+            if len(tool.description) > len(existing.description):
+                existing.description = tool.description
+            if not existing.args:
+                existing.args = list(tool.args)
+            known = {_param_name(param) for param in existing.parameters}
+            for param in tool.parameters:
+                if _param_name(param) not in known:
+                    existing.parameters.append(param)
+                    known.add(_param_name(param))
+    return list(merged.values())
@@ -0,0 +1,460 @@
+"""
+Compact code context for model detectors.
+
+A static pre-pass over a project's Python files picks out what a model
+needs to find tools: argument parsers, entry points, route and command
+decorators, request models and the signatures of public functions. Each
+piece is scored by how likely it is to define a tool, and the highest
+scoring pieces are packed into a prompt budget in place of whole files.
+"""
+
+import ast
+from dataclasses import dataclass
+from pathlib import Path
+
+from .chunking import FILE_HEADER, split_files
+
+# Directories that don't hold a project's own entry points
+SKIP_DIRS = {
+    "__pycache__",
+    "build",
+    "dist",
+    "docs",
+    "env",
+    "examples",
+    "node_modules",
+    "site-packages",
+    "test",
+    "tests",
+    "venv",
+}
+
+# Files larger than this are generated code or data, not entry points
+MAX_FILE_BYTES = 512 * 1024
+
+# Files read from a project directory at most
+MAX_FILES = 2000
+
+# Calls that build argparse parsers and typer apps
+PARSER_CALLS = {
+    "ArgumentParser",
+    "Typer",
+    "add_argument",
+    "add_argument_group",
+    "add_mutually_exclusive_group",
+    "add_parser",
+    "add_subparsers",
+    "add_typer",
+    "set_defaults",
+}
+
+# Decorators that turn a function into a route or a command
+TOOL_DECORATORS = {
+    "api_route",
+    "argument",
+    "command",
+    "delete",
+    "get",
+    "group",
+    "option",
+    "patch",
+    "post",
+    "put",
+    "route",
+}
+
+# Attributes of a Flask request that hold client data
+REQUEST_DATA = {"args", "files", "form", "get_json", "json", "values"}
+
+# Bases of classes describing request or option data
+MODEL_BASES = {"BaseModel", "Enum", "IntEnum", "NamedTuple", "StrEnum", "TypedDict"}
+
+# Relevance scores, higher is more likely to define a tool
+PARSER_SCORE = 100
+DECORATED_SCORE = 90
+MAIN_SCORE = 80
+MODEL_SCORE = 60
+TYPED_FUNCTION_SCORE = 50
+FUNCTION_SCORE = 40
+CLASS_SCORE = 30
+
+# Lines kept of an entry point block
+MAX_MAIN_LINES = 40
+
+
+@dataclass
+class Snippet:
+    """A piece of a source file worth showing to a model."""
+
+    path: str
+    line: int
+    score: int
+    text: str
+
+
+def skipped(directories: tuple[str, ...]) -> bool:
+    """Whether files in these directories are left out of the analysis."""
+    return any(
+        part in SKIP_DIRS or part.startswith(".") or part.endswith(".egg-info")
+        for part in directories
+    )
+
+
+def read_sources(project_path: Path) -> dict[str, str]:
+    """Read a project's Python files, keyed on their relative path."""
+    if project_path.is_file():
+        return {project_path.name: project_path.read_text(encoding="utf-8")}
+
+    sources: dict[str, str] = {}
+    for file_path in sorted(project_path.rglob("*.py")):
+        relative = file_path.relative_to(project_path)
+        if skipped(relative.parts[:-1]):
+            continue
+        try:
+            if file_path.stat().st_size > MAX_FILE_BYTES:
+                continue
+            sources[relative.as_posix()] = file_path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            continue
+        if len(sources) >= MAX_FILES:
+            break
+    return sources
+
+
+def section_path(section: str) -> str | None:
+    """Return the path of the file a digest section holds, None if it has none."""
+    match = FILE_HEADER.match(section)
+    if not match:
+        return None
+    header = match.group(0).splitlines()[1]
+    return header.split(": ", 1)[1].strip()
+
+
+def digest_sources(code_content: str) -> dict[str, str]:
+    """Return the Python files in a GitIngest digest, keyed on their path."""
+    sources = {}
+    for section in split_files(code_content):
+        match = FILE_HEADER.match(section)
+        path = section_path(section)
+        if match and path and path.endswith(".py"):
+            if not skipped(Path(path).parts[:-1]):
+                sources[path] = section[match.end() :]
+    return sources
+
+
+def _last(node: ast.AST) -> str:
+    """Return the last part of a called or dotted name."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return ""
+
+
+def _lines(lines: list[str], start: int, end: int) -> str:
+    """Return source lines start to end, counted from 1 and inclusive."""
+    return "\n".join(lines[start - 1 : end])
+
+
+def _signature(lines: list[str], node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+    """Return a function's decorators, def line and docstring summary."""
+    start = min([d.lineno for d in node.decorator_list] + [node.lineno])
+    header = _lines(lines, start, node.body[0].lineno - 1)
+    if node.body[0].lineno == node.lineno:
+        # One line functions keep their body
+        header = _lines(lines, start, node.lineno)
+    indent = " " * (node.col_offset + 4)
+    docstring = ast.get_docstring(node)
+    summary = docstring.strip().splitlines()[0] if docstring else ""
+    if summary:
+        return f'{header}\n{indent}"""{summary}"""\n{indent}...'
+    return f"{header}\n{indent}..."
+
+
+def _is_typed(node: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
+    """Whether every parameter of a function has a type hint."""
+    arguments = node.args.posonlyargs + node.args.args + node.args.kwonlyargs
+    named = [arg for arg in arguments if arg.arg not in ("self", "cls")]
+    return bool(named) and all(arg.annotation is not None for arg in named)
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    """Whether a statement is the if __name__ == "__main__" block."""
+    if not isinstance(node, ast.If) or not isinstance(node.test, ast.Compare):
+        return False
+    operands = [node.test.left, *node.test.comparators]
+    return any(isinstance(o, ast.Name) and o.id == "__name__" for o in operands)
+
+
+def _parser_statements(node: ast.AST) -> list[ast.stmt]:
+    """Return the simple statements under node that build a parser."""
+    found = []
+    for child in ast.walk(node):
+        if not isinstance(child, ast.Assign | ast.AnnAssign | ast.Expr):
+            continue
+        if any(
+            isinstance(call, ast.Call) and _last(call) in PARSER_CALLS
+            for call in ast.walk(child)
+        ):
+            found.append(child)
+    return sorted(found, key=lambda statement: statement.lineno)
+
+
+def _statement_lines(lines: list[str], statements: list[ast.stmt]) -> str:
+    """Return the source of statements, without repeating shared lines."""
+    seen: set[int] = set()
+    parts = []
+    for statement in statements:
+        end = statement.end_lineno or statement.lineno
+        numbers = [n for n in range(statement.lineno, end + 1) if n not in seen]
+        seen.update(numbers)
+        parts.extend(lines[n - 1] for n in numbers)
+    return "\n".join(parts)
+
+
+def _request_reads(
+    lines: list[str], node: ast.FunctionDef | ast.AsyncFunctionDef
+) -> str:
+    """Return the lines of a view that read the request's data."""
+    numbers = sorted(
+        {
+            child.lineno
+            for child in ast.walk(node)
+            if isinstance(child, ast.Attribute)
+            and isinstance(child.value, ast.Name)
+            and child.value.id == "request"
+            and child.attr in REQUEST_DATA
+        }
+    )
+    return "\n".join(lines[n - 1] for n in numbers)
+
+
+def _model(lines: list[str], node: ast.ClassDef) -> str:
+    """Return a data class's header and field lines."""
+    parts = [_lines(lines, node.lineno, node.lineno)]
+    for statement in node.body:
+        if isinstance(statement, ast.AnnAssign | ast.Assign):
+            parts.append(
+                _lines(
+                    lines, statement.lineno, statement.end_lineno or statement.lineno
+                )
+            )
+    if len(parts) == 1:
+        parts.append(" " * (node.col_offset + 4) + "...")
+    return "\n".join(parts)
+
+
+def _class(lines: list[str], node: ast.ClassDef) -> str:
+    """Return a class's header and the signatures of its public methods."""
+    parts = [_lines(lines, node.lineno, node.lineno)]
+    docstring = ast.get_docstring(node)
+    if docstring:
+        indent = " " * (node.col_offset + 4)
+        parts.append(f'{indent}"""{docstring.strip().splitlines()[0]}"""')
+    for statement in node.body:
+        if isinstance(statement, ast.FunctionDef | ast.AsyncFunctionDef) and (
+            not statement.name.startswith("_") or statement.name == "__init__"
+        ):
+            parts.append(_signature(lines, statement))
+    if len(parts) == 1:
+        parts.append(" " * (node.col_offset + 4) + "...")
+    return "\n".join(parts)
+
+
+def extract_snippets(path: str, source: str) -> list[Snippet]:
+    """
+    Pick the parts of a Python file that can define tools.
+
+    Args:
+        path: Path of the file, shown to the model
+        source: The file's source code
+
+    Returns:
+        Snippets in source order, empty if the file doesn't parse
+    """
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError):
+        return []
+    lines = source.splitlines()
+    snippets = []
+
+    def add(node: ast.AST, score: int, text: str) -> None:
+        snippets.append(Snippet(path, getattr(node, "lineno", 1), score, text))
+
+    # Parsers built at module level, outside any function or class
+    module_level = [
+        statement
+        for top in tree.body
+        if not isinstance(top, ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef)
+        and not _is_main_guard(top)
+        for statement in _parser_statements(top)
+    ]
+    if module_level:
+        add(module_level[0], PARSER_SCORE, _statement_lines(lines, module_level))
+
+    # Classes of this file that describe data, so subclasses do as well
+    models: set[str] = set()
+
+    def visit(body: list[ast.stmt], top_level: bool) -> None:
+        for node in body:
+            if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+                parser = _parser_statements(node)
+                decorated = any(
+                    _last(decorator) in TOOL_DECORATORS
+                    for decorator in node.decorator_list
+                )
+                if parser:
+                    header = _lines(lines, node.lineno, node.body[0].lineno - 1)
+                    add(
+                        node,
+                        PARSER_SCORE,
+                        f"{header}\n{_statement_lines(lines, parser)}",
+                    )
+                elif decorated:
+                    text = _signature(lines, node)
+                    reads = _request_reads(lines, node)
+                    if reads:
+                        # Flask views read their query and body in the body
+                        text = text.rsplit("\n", 1)[0] + f"\n{reads}"
+                    add(node, DECORATED_SCORE, text)
+                elif top_level and not node.name.startswith("_"):
+                    score = TYPED_FUNCTION_SCORE if _is_typed(node) else FUNCTION_SCORE
+                    add(node, score, _signature(lines, node))
+            elif isinstance(node, ast.ClassDef):
+                bases = {_last(base) for base in node.bases}
+                decorators = {_last(decorator) for decorator in node.decorator_list}
+                if bases & (MODEL_BASES | models) or "dataclass" in decorators:
+                    models.add(node.name)
+                    add(node, MODEL_SCORE, _model(lines, node))
+                elif not node.name.startswith("_"):
+                    # Class views and command classes are searched too
+                    visit(
+                        [
+                            statement
+                            for statement in node.body
+                            if isinstance(
+                                statement, ast.FunctionDef | ast.AsyncFunctionDef
+                            )
+                            and (
+                                _parser_statements(statement)
+                                or statement.decorator_list
+                            )
+                        ],
+                        top_level=False,
+                    )
+                    if top_level:
+                        add(node, CLASS_SCORE, _class(lines, node))
+            elif top_level and _is_main_guard(node):
+                parser = _parser_statements(node)
+                if parser:
+                    guard = _lines(lines, node.lineno, node.lineno)
+                    add(
+                        node,
+                        PARSER_SCORE,
+                        f"{guard}\n{_statement_lines(lines, parser)}",
+                    )
+                else:
+                    end = min(
+                        node.end_lineno or node.lineno, node.lineno + MAX_MAIN_LINES
+                    )
+                    add(node, MAIN_SCORE, _lines(lines, node.lineno, end))
+
+    visit(tree.body, top_level=True)
+    return sorted(snippets, key=lambda snippet: snippet.line)
+
+
+def _render(snippets: list[Snippet]) -> str:
+    """Render snippets grouped by file, in source order within each file."""
+    by_path: dict[str, list[Snippet]] = {}
+    for snippet in snippets:
+        by_path.setdefault(snippet.path, []).append(snippet)
+
+    # Files holding the most relevant snippets come first
+    ordered = sorted(
+        by_path.items(),
+        key=lambda item: (-max(s.score for s in item[1]), item[0]),
+    )
+    return "\n\n".join(
+        f"=== {path} ===\n"
+        + "\n\n".join(s.text for s in sorted(group, key=lambda s: s.line))
+        for path, group in ordered
+    )
+
+
+def build_context(sources: dict[str, str], max_chars: int) -> str:
+    """
+    Build a compact, relevance-ranked summary of a project's code.
+
+    Args:
+        sources: Python sources keyed on their path
+        max_chars: Budget for the summary
+
+    Returns:
+        The most relevant snippets that fit the budget, grouped by file, or
+        an empty string if no file had any
+    """
+    snippets = [
+        snippet
+        for path, source in sources.items()
+        for snippet in extract_snippets(path, source)
+    ]
+    ranked = sorted(snippets, key=lambda s: (-s.score, s.path, s.line))
+
+    chosen = []
+    used = 0
+    headers: set[str] = set()
+    for snippet in ranked:
+        cost = len(snippet.text) + 2
+        if snippet.path not in headers:
+            cost += len(snippet.path) + 10
+        if used + cost > max_chars:
+            # A smaller, less relevant snippet may still fit
+            continue
+        chosen.append(snippet)
+        headers.add(snippet.path)
+        used += cost
+    return _render(chosen)
+
+
+def compact_digest(code_content: str) -> str:
+    """
+    Replace the Python files of a GitIngest digest with their snippets.
+
+    Python files without snippets are left out, and the remaining ones are
+    ordered by relevance after any text before the first file. Other files
+    are kept as they are, after the Python ones.
+
+    Args:
+        code_content: The code content to compact (from GitIngest)
+
+    Returns:
+        The compacted digest, or the digest unchanged if it has no Python
+        file with snippets
+    """
+    preamble = []
+    python: list[tuple[int, str, str]] = []
+    others = []
+    for section in split_files(code_content):
+        path = section_path(section)
+        match = FILE_HEADER.match(section)
+        if path is None or match is None:
+            preamble.append(section)
+            continue
+        if not path.endswith(".py"):
+            others.append(section)
+            continue
+        if skipped(Path(path).parts[:-1]):
+            continue
+        snippets = extract_snippets(path, section[match.end() :])
+        if snippets:
+            body = "\n\n".join(snippet.text for snippet in snippets)
+            score = max(snippet.score for snippet in snippets)
+            python.append((score, path, f"{match.group(0)}{body}\n\n"))
+
+    if not python:
+        return code_content
+    python.sort(key=lambda item: (-item[0], item[1]))
+    return "".join(preamble + [section for _, _, section in python] + others)
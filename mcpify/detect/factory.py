@@ -5,11 +5,83 @@ This module provides factory functions to create detector instances
 with proper configuration and fallback strategies.
 """
 
+from pathlib import Path
 from typing import Any
 
+from .ast import AstDetector
 from .base import BaseDetector
 from .camel import CamelDetector
 from .openai import OpenaiDetector
+from .types import DetectionResult, ProjectInfo, ToolSpec
+
+
+class AutoDetector(BaseDetector):
+    """
+    Detector that tries static analysis before asking a model.
+
+    Projects whose structure the AST detector understands well are detected
+    offline; the others go to the best available model detector, which is
+    only created when it is needed.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize with options passed on to the model detector."""
+        self.options = kwargs
+        self.ast_detector = AstDetector()
+        self._model_detector: BaseDetector | None = None
+        # Static analyses by project path, so deciding and detecting share one
+        self._analyses: dict[Path, DetectionResult] = {}
+
+    @property
+    def model_detector(self) -> BaseDetector:
+        """The model detector used when static analysis isn't confident."""
+        if self._model_detector is None:
+            self._model_detector = _create_model_detector(**self.options)
+        return self._model_detector
+
+    def _analyze(self, project_path: str | Path) -> DetectionResult:
+        """Analyze a project statically, once per path."""
+        path = Path(project_path).resolve()
+        if path not in self._analyses:
+            self._analyses[path] = self.ast_detector.analyze_project(path)
+        return self._analyses[path]
+
+    def detect_project(self, project_path: str) -> dict[str, Any]:
+        """
+        Analyze a project directory and generate MCP configuration.
+
+        Args:
+            project_path: Path to the project directory
+
+        Returns:
+            Dictionary containing the MCP configuration
+        """
+        result = self._analyze(project_path)
+        if result.confidence_score >= AstDetector.HIGH_CONFIDENCE:
+            return self._result_to_config(result)
+        return self.model_detector.detect_project(project_path)
+
+    def _detect_from_content(self, code_content: str) -> DetectionResult:
+        """Analyze code content, statically first."""
+        result = self.ast_detector._detect_from_content(code_content)
+        if result.confidence_score >= AstDetector.HIGH_CONFIDENCE:
+            return result
+        return self.model_detector._detect_from_content(code_content)
+
+    def _detect_chunk(
+        self, chunk: str, project_info: ProjectInfo
+    ) -> list[dict[str, Any]]:
+        """Detect tools in one chunk of a code digest with the model."""
+        return self.model_detector._detect_chunk(chunk, project_info)
+
+    def _detect_tools(
+        self, project_path: Path, project_info: ProjectInfo
+    ) -> list[ToolSpec]:
+        """Detect tools, statically first."""
+        result = self._analyze(project_path)
+        if result.confidence_score >= AstDetector.HIGH_CONFIDENCE:
+            return result.tools
+        return self.model_detector._detect_tools(project_path, project_info)
 
 
 def create_detector(detector_type: str = "auto", **kwargs: Any) -> BaseDetector:
@@ -18,21 +90,24 @@ def create_detector(detector_type: str = "auto", **kwargs: Any) -> BaseDetector:
 
     Args:
         detector_type: Type of detector to create
+            - "ast": Static analysis detector, works offline
             - "openai": OpenAI-based detector
             - "camel": Camel-AI based detector
-            - "auto": Automatically select best available detector
+            - "auto": Static analysis, falling back to the best available
+              model detector when it isn't confident
         **kwargs: Additional arguments passed to detector constructor
 
     Returns:
         Configured detector instance
     """
     detectors = {
+        "ast": lambda: AstDetector(**kwargs),
         "openai": lambda: OpenaiDetector(**kwargs),
         "camel": lambda: CamelDetector(**kwargs),
     }
 
     if detector_type == "auto":
-        return _create_auto_detector(**kwargs)
+        return AutoDetector(**kwargs)
 
     if detector_type not in detectors:
         raise ValueError(f"Unknown detector type: {detector_type}")
@@ -40,9 +115,9 @@ def create_detector(detector_type: str = "auto", **kwargs: Any) -> BaseDetector:
     return detectors[detector_type]()
 
 
-def _create_auto_detector(**kwargs: Any) -> BaseDetector:
+def _create_model_detector(**kwargs: Any) -> BaseDetector:
     """
-    Automatically select the best available detector.
+    Automatically select the best available model detector.
 
     This function tries to create detectors in order of preference
     and returns the first one that can be successfully initialized.
@@ -59,6 +134,4 @@ def _create_auto_detector(**kwargs: Any) -> BaseDetector:
 
 def create_local_only_detector() -> BaseDetector:
     """Create a detector that works without external APIs."""
-    raise RuntimeError(
-        "No local-only detector available. AST detector has been removed."
-    )
+    return AstDetector()
@@ -5,22 +5,44 @@ This module contains the OpenaiDetector class that uses OpenAI's API
 for intelligent project analysis and tool detection.
 """
 
+import asyncio
 import json
 import os
 import types
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import openai
 
 from .base import BaseDetector
+from .cache import LLMResponseCache
+from .context import compact_digest
 from .types import DetectionResult, ProjectInfo, ToolSpec
 
 
 class OpenaiDetector(BaseDetector):
     """OpenAI-based project detector that uses LLM for intelligent analysis."""
 
-    def __init__(self, openai_api_key: str | None = None, **kwargs: Any):
+    # GPT-4 has an 8K context, leave room for the prompt and the answer
+    CHUNK_TOKENS = 3000
+
+    # Model and system prompt used to polish detected tools
+    ENHANCE_MODEL = "gpt-3.5-turbo"
+    ENHANCE_SYSTEM_PROMPT = "You are an expert at writing clear API documentation."
+
+    # Retries per enhancement request on rate limits and transient errors
+    ENHANCE_MAX_RETRIES = 5
+
+    def __init__(
+        self,
+        openai_api_key: str | None = None,
+        use_cache: bool = True,
+        max_parallel_chunks: int = 4,
+        enhance: bool = False,
+        enhance_concurrency: int = 8,
+        **kwargs: Any,
+    ):
         """Initialize the detector with OpenAI API key."""
         # super().__init__(**kwargs)
         self.openai_client: types.ModuleType
@@ -34,6 +56,14 @@ class OpenaiDetector(BaseDetector):
                 "OpenAI API key is required for OpenaiDetector. "
                 "Provide it via openai_api_key parameter or OPENAI_API_KEY environment variable."
             )
+        if use_cache:
+            self.response_cache = LLMResponseCache()
+        self.max_parallel_chunks = max_parallel_chunks
+        self.openai_api_key = openai_api_key
+        if enhance_concurrency < 1:
+            raise ValueError("enhance_concurrency must be at least 1")
+        self.enhance = enhance
+        self.enhance_concurrency = enhance_concurrency
 
     def _detect_tools(
         self, project_path: Path, project_info: ProjectInfo
@@ -60,6 +90,9 @@ class OpenaiDetector(BaseDetector):
                 )
             )
 
+        if self.enhance:
+            tools = self._enhance_tools(tools, context)
+
         return tools
 
     def _gather_project_context(
@@ -84,16 +117,24 @@ class OpenaiDetector(BaseDetector):
             readme_excerpt = project_info.readme_content[:2000]
             context_parts.append(f"README:\n{readme_excerpt}")
 
-        # Code samples from main files
-        context_parts.append("\nCode samples:")
-        for main_file in project_info.main_files[:3]:  # Limit to first 3 files
-            file_path = project_path / main_file
-            try:
-                with open(file_path, encoding="utf-8") as f:
-                    content = f.read()[:3000]  # First 3000 chars
-                    context_parts.append(f"\n=== {main_file} ===\n{content}")
-            except Exception as e:
-                context_parts.append(f"\n=== {main_file} ===\nError reading file: {e}")
+        # Parsers, routes and signatures found by a static pre-pass, with
+        # the start of the main files for projects it can't summarize
+        code_context = self._code_context(project_path)
+        if code_context:
+            context_parts.append("\nRelevant code:")
+            context_parts.append(code_context)
+        else:
+            context_parts.append("\nCode samples:")
+            for main_file in project_info.main_files[:3]:  # Limit to first 3 files
+                file_path = project_path / main_file
+                try:
+                    with open(file_path, encoding="utf-8") as f:
+                        content = f.read()[:3000]  # First 3000 chars
+                        context_parts.append(f"\n=== {main_file} ===\n{content}")
+                except Exception as e:
+                    context_parts.append(
+                        f"\n=== {main_file} ===\nError reading file: {e}"
+                    )
 
         return "\n".join(context_parts)
 
@@ -149,18 +190,23 @@ class OpenaiDetector(BaseDetector):
           }}
         ]"""
 
+        content = ""
+        cache_key = self._response_cache_key("gpt-4", system_prompt, user_prompt)
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.1,
-                max_tokens=4000,
-            )
-
-            content = response.choices[0].message.content.strip()
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                content = cached
+            else:
+                response = self.openai_client.chat.completions.create(
+                    model="gpt-4",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    temperature=0.1,
+                    max_tokens=4000,
+                )
+                content = response.choices[0].message.content.strip()
 
             # Extract JSON from response (in case there's extra text)
             start_idx = content.find("[")
@@ -190,20 +236,26 @@ class OpenaiDetector(BaseDetector):
                 else:
                     print(f"Warning: Skipping invalid tool specification: {tool}")
 
+            self._cache_response(cache_key, content)
             return validated_tools
 
         except json.JSONDecodeError as e:
             print(f"Error: Failed to parse LLM response as JSON: {e}")
-            print(f"Raw response: {response.choices[0].message.content}")
+            print(f"Raw response: {content}")
             return []
         except Exception as e:
             print(f"Error: LLM tool detection failed: {e}")
             return []
 
-    def _enhance_tool_description(self, tool: ToolSpec, context: str) -> ToolSpec:
-        """Use LLM to enhance a single tool's description and parameters."""
-        try:
-            prompt = f"""
+    def _detect_chunk(
+        self, chunk: str, project_info: ProjectInfo
+    ) -> list[dict[str, Any]]:
+        """Use LLM to detect tools in one chunk of a code digest."""
+        return self._llm_detect_tools(chunk, project_info)
+
+    def _enhancement_prompt(self, tool: ToolSpec, context: str) -> str:
+        """Build the prompt asking the LLM to improve one tool."""
+        return f"""
             Enhance this tool specification with better descriptions and parameter details:
 
             Tool: {tool.name}
@@ -235,26 +287,88 @@ class OpenaiDetector(BaseDetector):
             }}
             """
 
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at writing clear API documentation.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.1,
-                max_tokens=1000,
-            )
+    def _parse_enhancement(self, tool: ToolSpec, content: str) -> ToolSpec:
+        """Build the enhanced tool from the LLM's JSON answer."""
+        enhanced_data = json.loads(content)
+        return ToolSpec(
+            name=enhanced_data["name"],
+            description=enhanced_data["description"],
+            args=enhanced_data.get("args", tool.args),
+            parameters=enhanced_data.get("parameters", tool.parameters),
+        )
 
-            enhanced_data = json.loads(response.choices[0].message.content)
-            return ToolSpec(
-                name=enhanced_data["name"],
-                description=enhanced_data["description"],
-                args=enhanced_data.get("args", tool.args),
-                parameters=enhanced_data.get("parameters", tool.parameters),
+    def _enhance_tools(self, tools: list[ToolSpec], context: str) -> list[ToolSpec]:
+        """Enhance all tools concurrently with the async OpenAI client."""
+        if not tools:
+            return tools
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._enhance_tools_async(tools, context))
+
+        # asyncio.run() can't nest inside a running loop, such as the UI's
+        # or detect_project_async's caller, so give the pass its own thread.
+        # Async callers can await _enhance_tools_async() instead
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(
+                asyncio.run, self._enhance_tools_async(tools, context)
+            ).result()
+
+    def _async_client(self) -> openai.AsyncOpenAI:
+        """Create the async client used for concurrent enhancement."""
+        # The client backs off and retries on 429s, honouring Retry-After
+        return openai.AsyncOpenAI(
+            api_key=self.openai_api_key, max_retries=self.ENHANCE_MAX_RETRIES
+        )
+
+    async def _enhance_tools_async(
+        self, tools: list[ToolSpec], context: str
+    ) -> list[ToolSpec]:
+        """Enhance tools with at most enhance_concurrency requests in flight."""
+        client = self._async_client()
+        semaphore = asyncio.Semaphore(self.enhance_concurrency)
+        try:
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._enhance_tool_async(client, semaphore, tool, context)
+                        for tool in tools
+                    )
+                )
+            )
+        finally:
+            await client.close()
+
+    async def _enhance_tool_async(
+        self,
+        client: openai.AsyncOpenAI,
+        semaphore: asyncio.Semaphore,
+        tool: ToolSpec,
+        context: str,
+    ) -> ToolSpec:
+        """Use LLM to enhance one tool without blocking the others."""
+        try:
+            prompt = self._enhancement_prompt(tool, context)
+            cache_key = self._response_cache_key(
+                self.ENHANCE_MODEL, self.ENHANCE_SYSTEM_PROMPT, prompt
             )
+            content = self._cached_response(cache_key)
+            if content is None:
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        model=self.ENHANCE_MODEL,
+                        messages=[
+                            {"role": "system", "content": self.ENHANCE_SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt},
+                        ],
+                        temperature=0.1,
+                        max_tokens=1000,
+                    )
+                content = response.choices[0].message.content or ""
+
+            enhanced = self._parse_enhancement(tool, content)
+            self._cache_response(cache_key, content)
+            return enhanced
 
         except Exception as e:
             print(f"Warning: Failed to enhance tool {tool.name}: {e}")
@@ -273,24 +387,12 @@ class OpenaiDetector(BaseDetector):
         # Extract basic project info from content
         project_info = self._extract_project_info_from_content(code_content)
 
-        # Use LLM to detect tools
-        tools_data = self._llm_detect_tools(code_content, project_info)
-
-        # Convert to ToolSpec objects
-        tools = []
-        for tool_data in tools_data:
-            try:
-                tool = ToolSpec(
-                    name=tool_data["name"],
-                    description=tool_data["description"],
-                    args=tool_data.get("args", []),
-                    parameters=tool_data.get("parameters", []),
-                )
-                tools.append(tool)
-            except Exception as e:
-                print(
-                    f"Warning: Failed to create tool spec for {tool_data.get('name', 'unknown')}: {e}"
-                )
+        # Only send what can define tools, chunk by chunk so large digests
+        # fit in the prompt
+        compacted = compact_digest(code_content)
+        tools = self._detect_tools_chunked(compacted, project_info)
+        if self.enhance:
+            tools = self._enhance_tools(tools, compacted)
 
         # Generate appropriate backend config
         backend_config = self._generate_backend_config_from_content(project_info)
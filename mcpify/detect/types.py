@@ -4,7 +4,7 @@ Data structures for project detection.
 This module contains the common data types used across all detector implementations.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 
@@ -26,8 +26,10 @@ class ToolSpec:
 
     name: str
     description: str
-    args: list[str]
+    args: list[str | list[str]]
     parameters: list[dict[str, Any]]
+    # Extra tool fields, such as an HTTP tool's endpoint and method
+    options: dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Fork server for Python command line tools
+
+Started by CommandLineAdapter with the target interpreter:
+
+    python3 forkserver.py /path/to/script.py
+
+It imports the modules the script depends on once, then forks a child per
+request that runs the script as __main__ with the requested argv. Requests
+and replies are JSON lines tagged with an id:
+
+    {"id": 1, "command": ["--flag", "value"]}
+    {"id": 1, "result": "<stdout>"}  or  {"id": 1, "error": "<stderr>"}
+
+A cancelled request is sent as {"id": 1, "cancel": true} and kills its
+child. Children still running on "quit" or end of input are killed too.
+
+This file only uses the standard library so it runs under any interpreter.
+"""
+
+import ast
+import json
+import os
+import runpy
+import selectors
+import signal
+import sys
+import tempfile
+import traceback
+from typing import IO, Any
+
+READY_SIGNAL = "mcpify-forkserver ready"
+
+
+def warm_imports(script: str) -> None:
+    """Import the script's top-level dependencies without running it"""
+    try:
+        with open(script, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=script)
+    except (OSError, SyntaxError):
+        return
+
+    # Imports inside functions may be expensive or only needed by rare paths
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            try:
+                __import__(name)
+            except Exception:
+                # Optional or platform-specific imports may fail, the child
+                # will deal with them when it runs the script
+                pass
+
+
+def run_child(script: str, argv: list[str], stdout: IO, stderr: IO) -> None:
+    """Run the script as __main__ in a forked child and exit"""
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(stdout.fileno(), 1)
+    os.dup2(stderr.fileno(), 2)
+
+    sys.argv = [script] + argv
+    code = 0
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    os._exit(code)
+
+
+def read_output(output: IO) -> str:
+    """Read a child's captured output and release the file"""
+    output.seek(0)
+    text = output.read().decode(errors="replace")
+    output.close()
+    return text
+
+
+def send(message: dict[str, Any]) -> None:
+    """Write one JSON reply line"""
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def parse_request(line: bytes) -> dict[str, Any] | None:
+    """Decode one request line, None if it isn't a request"""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(request, dict) or "id" not in request:
+        return None
+    return request
+
+
+def start_child(script: str, request: dict[str, Any]) -> tuple[int, tuple] | None:
+    """Fork a child for one request"""
+    try:
+        request_id = request["id"]
+        argv = [str(arg) for arg in request["command"]]
+    except (KeyError, TypeError):
+        return None
+
+    stdout = tempfile.TemporaryFile()
+    stderr = tempfile.TemporaryFile()
+    # The child holds the write end, EOF on the read end means it has exited
+    done_r, done_w = os.pipe()
+    sys.stdout.flush()
+    pid = os.fork()
+    if pid == 0:
+        os.close(done_r)
+        run_child(script, argv, stdout, stderr)
+    os.close(done_w)
+    return done_r, (request_id, pid, stdout, stderr)
+
+
+def kill_child(pid: int) -> None:
+    """Kill a running child, it is reaped like one that exited by itself"""
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def finish_child(child: tuple) -> None:
+    """Reap an exited child and send its reply"""
+    request_id, pid, stdout, stderr = child
+    _, status = os.waitpid(pid, 0)
+    returncode = os.waitstatus_to_exitcode(status)
+    out = read_output(stdout)
+    err = read_output(stderr)
+    if returncode == 0:
+        send({"id": request_id, "result": out.strip()})
+    else:
+        send({"id": request_id, "error": err.strip()})
+
+
+def serve(script: str) -> None:
+    """Read requests from stdin and fork a child for each of them"""
+    selector = selectors.DefaultSelector()
+    stdin_fd = sys.stdin.fileno()
+    selector.register(stdin_fd, selectors.EVENT_READ, None)
+    buffer = b""
+    running = True
+    # Pids of the running children by request id
+    children: dict[Any, int] = {}
+
+    while running or len(selector.get_map()) > 0:
+        for key, _ in selector.select():
+            if key.data is not None:
+                selector.unregister(key.fd)
+                os.close(key.fd)
+                children.pop(key.data[0], None)
+                finish_child(key.data)
+                continue
+
+            # Read stdin unbuffered so no request sits in a Python buffer
+            # while select() waits
+            chunk = os.read(stdin_fd, 65536)
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip() == b"quit":
+                    running = False
+                    break
+                request = parse_request(line)
+                if request is None:
+                    continue
+                if request.get("cancel"):
+                    if request["id"] in children:
+                        kill_child(children[request["id"]])
+                    continue
+                started = start_child(script, request)
+                if started is not None:
+                    selector.register(started[0], selectors.EVENT_READ, started[1])
+                    children[request["id"]] = started[1][1]
+            if not chunk or not running:
+                selector.unregister(stdin_fd)
+                running = False
+                # Nobody will wait for the outstanding calls any more
+                for pid in children.values():
+                    kill_child(pid)
+
+
+def main() -> None:
+    """Warm up and serve the script given on the command line"""
+    script = os.path.abspath(sys.argv[1])
+    # Resolve imports like the script itself would, not from this directory
+    sys.path[0] = os.path.dirname(script)
+    warm_imports(script)
+    print(READY_SIGNAL, flush=True)
+    serve(script)
+
+
+if __name__ == "__main__":
+    main()
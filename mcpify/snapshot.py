@@ -0,0 +1,92 @@
+"""
+Pre-compiled configuration snapshots.
+
+`mcpify compile` validates a configuration and stores what MCPWrapper would
+otherwise derive from it on every start: the normalized tools, their
+rendered JSON schemas and compiled argument templates. The snapshot is
+written with marshal, which loads plain data quickly and never runs code,
+and is only used while the configuration's content hash still matches.
+"""
+
+import hashlib
+import marshal
+import os
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+
+# Bump when the snapshot layout changes
+SNAPSHOT_FORMAT = 1
+
+SNAPSHOT_MAGIC = "mcpify-snapshot"
+
+SNAPSHOT_SUFFIX = ".snapshot"
+
+
+def config_hash(data: bytes) -> str:
+    """Hash a configuration file's content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def default_snapshot_path(config_path: str | Path) -> Path:
+    """Return where the snapshot for a configuration lives by default."""
+    return Path(config_path).with_suffix(SNAPSHOT_SUFFIX)
+
+
+def normalize_tool(tool: dict[str, Any]) -> dict[str, Any]:
+    """Return a tool definition with optional fields filled in."""
+    normalized = dict(tool)
+    normalized.setdefault("args", [])
+    normalized["parameters"] = [
+        {**param, "required": param.get("required", True)}
+        for param in tool.get("parameters", [])
+    ]
+    if "method" in normalized:
+        normalized["method"] = str(normalized["method"]).upper()
+    return normalized
+
+
+def write_snapshot(path: str | Path, content_hash: str, payload: Any) -> None:
+    """Write a snapshot atomically, tagged with the configuration's hash."""
+    data = marshal.dumps(
+        (SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, __version__, content_hash, payload)
+    )
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path: str | Path, content_hash: str) -> Any | None:
+    """Load a snapshot's payload, or None if it is missing or out of date."""
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        return None
+
+    try:
+        magic, snapshot_format, version, snapshot_hash, payload = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+
+    if (
+        magic != SNAPSHOT_MAGIC
+        or snapshot_format != SNAPSHOT_FORMAT
+        or version != __version__
+        or snapshot_hash != content_hash
+    ):
+        return None
+    return payload
+
+
+def compile_config(
+    config_path: str | Path, output_path: str | Path | None = None
+) -> Path:
+    """Compile a configuration into a snapshot and return its path."""
+    from .wrapper import MCPWrapper
+
+    wrapper = MCPWrapper(str(config_path), use_snapshot=False)
+    path = Path(output_path) if output_path else default_snapshot_path(config_path)
+    write_snapshot(path, wrapper.config_hash, wrapper.build_snapshot())
+    return path
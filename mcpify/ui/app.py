@@ -277,7 +277,10 @@ class MCPifyApp:
                     name=detection_result.project_info.name,
                     description=detection_result.project_info.description,
                     backend=detection_result.backend_config,
-                    tools=[tool.__dict__ for tool in detection_result.tools],
+                    tools=[
+                        detector._tool_spec_to_dict(tool)
+                        for tool in detection_result.tools
+                    ],
                 )
 
             # Validate configuration
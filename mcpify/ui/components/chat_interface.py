@@ -281,7 +281,14 @@ class DetectionResultsInterface:
                     with col1:
                         st.write(f"**Description:** {tool.description}")
                         if tool.args:
-                            st.code(" ".join(tool.args), language="bash")
+                            # Optional argument groups are nested lists
+                            st.code(
+                                " ".join(
+                                    arg if isinstance(arg, str) else " ".join(arg)
+                                    for arg in tool.args
+                                ),
+                                language="bash",
+                            )
 
                     with col2:
                         if tool.parameters:
@@ -370,6 +377,7 @@ class DetectionResultsInterface:
                         "description": tool.description,
                         "args": tool.args,
                         "parameters": list(tool.parameters),
+                        **tool.options,
                     }
                 )
 
@@ -61,7 +61,10 @@ class MCPConfigValidator:
     REQUIRED_FIELDS = ["name", "description", "backend", "tools"]
 
     # Valid backend types
-    VALID_BACKEND_TYPES = ["commandline", "http", "websocket"]
+    VALID_BACKEND_TYPES = ["commandline", "server", "http", "python", "websocket"]
+
+    # Valid response framings for server backends
+    VALID_FRAMINGS = ["line", "sentinel", "length", "idle"]
 
     # Valid parameter types for tools
     VALID_PARAM_TYPES = ["string", "integer", "number", "boolean", "array", "object"]
@@ -128,7 +131,9 @@ class MCPConfigValidator:
             self._validate_backend(config["backend"], result)
 
         if "tools" in config:
-            self._validate_tools(config["tools"], result)
+            backend = config.get("backend")
+            backend_type = backend.get("type") if isinstance(backend, dict) else None
+            self._validate_tools(config["tools"], result, backend_type)
 
         # Additional validations
         self._validate_consistency(config, result)
@@ -231,8 +236,12 @@ class MCPConfigValidator:
         # Validate specific backend types
         if backend_type == "commandline":
             self._validate_commandline_backend(config, result)
+        elif backend_type == "server":
+            self._validate_server_backend(config, result)
         elif backend_type == "http":
             self._validate_http_backend(config, result)
+        elif backend_type == "python":
+            self._validate_python_backend(config, result)
         elif backend_type == "websocket":
             self._validate_websocket_backend(config, result)
 
@@ -270,6 +279,129 @@ class MCPConfigValidator:
                     "backend.config.cwd", "Working directory must be a string"
                 )
 
+        if "fork_server" in config and not isinstance(config["fork_server"], bool):
+            result.add_error(
+                "backend.config.fork_server", "Fork server must be a boolean"
+            )
+
+        if "max_concurrency" in config:
+            max_concurrency = config["max_concurrency"]
+            if not isinstance(max_concurrency, int) or isinstance(
+                max_concurrency, bool
+            ):
+                result.add_error(
+                    "backend.config.max_concurrency",
+                    "Max concurrency must be an integer",
+                )
+            elif max_concurrency <= 0:
+                result.add_error(
+                    "backend.config.max_concurrency",
+                    "Max concurrency must be positive",
+                )
+
+    def _validate_server_backend(
+        self, config: dict[str, Any], result: ValidationResult
+    ) -> None:
+        """Validate server backend configuration."""
+        # Server backends share the command, args and cwd fields
+        self._validate_commandline_backend(config, result)
+
+        if "pool_size" in config:
+            pool_size = config["pool_size"]
+            if not isinstance(pool_size, int) or isinstance(pool_size, bool):
+                result.add_error(
+                    "backend.config.pool_size", "Pool size must be an integer"
+                )
+            elif pool_size <= 0:
+                result.add_error(
+                    "backend.config.pool_size", "Pool size must be positive"
+                )
+
+        if "queue_timeout" in config:
+            if not isinstance(config["queue_timeout"], int | float):
+                result.add_error(
+                    "backend.config.queue_timeout", "Queue timeout must be a number"
+                )
+            elif config["queue_timeout"] <= 0:
+                result.add_error(
+                    "backend.config.queue_timeout", "Queue timeout must be positive"
+                )
+
+        if "framing" in config:
+            if config["framing"] not in self.VALID_FRAMINGS:
+                result.add_error(
+                    "backend.config.framing",
+                    f"Invalid response framing '{config['framing']}'. "
+                    f"Valid framings: {', '.join(self.VALID_FRAMINGS)}",
+                )
+            elif config["framing"] == "sentinel" and not isinstance(
+                config.get("terminator", "END"), str
+            ):
+                result.add_error(
+                    "backend.config.terminator", "Terminator must be a string"
+                )
+
+        if "protocol" in config and config["protocol"] not in ["text", "jsonl"]:
+            result.add_error(
+                "backend.config.protocol",
+                f"Invalid server protocol '{config['protocol']}'. "
+                "Valid protocols: text, jsonl",
+            )
+
+        if "max_in_flight" in config:
+            max_in_flight = config["max_in_flight"]
+            if not isinstance(max_in_flight, int) or isinstance(max_in_flight, bool):
+                result.add_error(
+                    "backend.config.max_in_flight", "Max in flight must be an integer"
+                )
+            elif max_in_flight <= 0:
+                result.add_error(
+                    "backend.config.max_in_flight", "Max in flight must be positive"
+                )
+
+        if "idle_timeout" in config:
+            if not isinstance(config["idle_timeout"], int | float):
+                result.add_error(
+                    "backend.config.idle_timeout", "Idle timeout must be a number"
+                )
+            elif config["idle_timeout"] <= 0:
+                result.add_error(
+                    "backend.config.idle_timeout", "Idle timeout must be positive"
+                )
+
+        # Supervision settings
+        if "supervise" in config and not isinstance(config["supervise"], bool):
+            result.add_error("backend.config.supervise", "Supervise must be a boolean")
+
+        for field in ["health_command", "health_expect"]:
+            if field in config and not isinstance(config[field], str):
+                label = field.replace("_", " ").capitalize()
+                result.add_error(f"backend.config.{field}", f"{label} must be a string")
+
+        if "health_expect" in config and "health_command" not in config:
+            result.add_warning(
+                "backend.config.health_expect",
+                "health_expect has no effect without health_command",
+            )
+
+        for field in [
+            "health_interval",
+            "health_timeout",
+            "restart_delay",
+            "max_restart_delay",
+            "drain_timeout",
+        ]:
+            if field in config:
+                label = field.replace("_", " ").capitalize()
+                if not isinstance(config[field], int | float):
+                    result.add_error(
+                        f"backend.config.{field}", f"{label} must be a number"
+                    )
+                elif config[field] <= 0:
+                    result.add_error(
+                        f"backend.config.{field}", f"{label} must be positive"
+                    )
+
     def _validate_http_backend(
         self, config: dict[str, Any], result: ValidationResult
     ) -> None:
@@ -288,11 +420,83 @@ class MCPConfigValidator:
             elif not self._is_valid_url(config["base_url"]):
                 result.add_error("backend.config.base_url", "Base URL is not valid")
 
-        if "timeout" in config:
-            if not isinstance(config["timeout"], int | float):
-                result.add_error("backend.config.timeout", "Timeout must be a number")
-            elif config["timeout"] <= 0:
-                result.add_error("backend.config.timeout", "Timeout must be positive")
+        for field in [
+            "timeout",
+            "connect_timeout",
+            "read_timeout",
+            "retry_backoff",
+            "max_retry_backoff",
+            "circuit_reset_timeout",
+        ]:
+            if field in config:
+                label = field.replace("_", " ").capitalize()
+                if not isinstance(config[field], int | float):
+                    result.add_error(
+                        f"backend.config.{field}", f"{label} must be a number"
+                    )
+                elif config[field] <= 0:
+                    result.add_error(
+                        f"backend.config.{field}", f"{label} must be positive"
+                    )
+
+        for field in [
+            "max_connections",
+            "max_connections_per_host",
+            "keepalive_timeout",
+            "dns_cache_ttl",
+        ]:
+            if field in config:
+                label = field.replace("_", " ").capitalize()
+                if not isinstance(config[field], int | float) or isinstance(
+                    config[field], bool
+                ):
+                    result.add_error(
+                        f"backend.config.{field}", f"{label} must be a number"
+                    )
+                elif config[field] < 0:
+                    result.add_error(
+                        f"backend.config.{field}", f"{label} cannot be negative"
+                    )
+
+        # A circuit failure threshold of 0 disables the breaker
+        for field in ["retries", "circuit_failure_threshold"]:
+            if field in config:
+                label = field.replace("_", " ").capitalize()
+                if not isinstance(config[field], int) or isinstance(
+                    config[field], bool
+                ):
+                    result.add_error(
+                        f"backend.config.{field}", f"{label} must be an integer"
+                    )
+                elif config[field] < 0:
+                    result.add_error(
+                        f"backend.config.{field}", f"{label} cannot be negative"
+                    )
+
+        if "unix_socket" in config:
+            if not isinstance(config["unix_socket"], str):
+                result.add_error(
+                    "backend.config.unix_socket", "Unix socket path must be a string"
+                )
+
+    def _validate_python_backend(
+        self, config: dict[str, Any], result: ValidationResult
+    ) -> None:
+        """Validate Python module backend configuration."""
+        if "module" not in config:
+            result.add_error(
+                "backend.config.module", "Python backend requires 'module'"
+            )
+        elif not isinstance(config["module"], str):
+            result.add_error("backend.config.module", "Module must be a string")
+        elif not config["module"].strip():
+            result.add_error("backend.config.module", "Module cannot be empty")
+
+        if "cwd" in config:
+            if not isinstance(config["cwd"], str):
+                result.add_error(
+                    "backend.config.cwd", "Working directory must be a string"
+                )
 
     def _validate_websocket_backend(
         self, config: dict[str, Any], result: ValidationResult
@@ -315,7 +519,27 @@ class MCPConfigValidator:
                     "WebSocket URL must start with ws:// or wss://",
                 )
 
-    def _validate_tools(self, tools: Any, result: ValidationResult) -> None:
+        for field in [
+            "timeout",
+            "heartbeat",
+            "reconnect_delay",
+            "max_reconnect_delay",
+            "reconnect_reset",
+        ]:
+            if field in config:
+                label = field.replace("_", " ").capitalize()
+                if not isinstance(config[field], int | float):
+                    result.add_error(
+                        f"backend.config.{field}", f"{label} must be a number"
+                    )
+                elif config[field] <= 0:
+                    result.add_error(
+                        f"backend.config.{field}", f"{label} must be positive"
+                    )
+
+    def _validate_tools(
+        self, tools: Any, result: ValidationResult, backend_type: Any = None
+    ) -> None:
         """Validate the tools array."""
         if not isinstance(tools, list):
             result.add_error("tools", "Tools must be an array")
@@ -327,7 +551,7 @@ class MCPConfigValidator:
 
         tool_names = set()
         for i, tool in enumerate(tools):
-            self._validate_tool(tool, i, result)
+            self._validate_tool(tool, i, result, backend_type)
 
             # Check for duplicate tool names
             if isinstance(tool, dict) and "name" in tool:
@@ -339,7 +563,13 @@ class MCPConfigValidator:
                 else:
                     tool_names.add(name)
 
-    def _validate_tool(self, tool: Any, index: int, result: ValidationResult) -> None:
+    def _validate_tool(
+        self,
+        tool: Any,
+        index: int,
+        result: ValidationResult,
+        backend_type: Any = None,
+    ) -> None:
         """Validate a single tool definition."""
         path_prefix = f"tools[{index}]"
 
@@ -347,8 +577,10 @@ class MCPConfigValidator:
             result.add_error(f"{path_prefix}", "Tool must be an object")
             return
 
-        # Required tool fields
-        required_fields = ["name", "description", "args"]
+        # Required tool fields, server tools write a command line to the
+        # server instead of passing args
+        template_field = "command" if backend_type == "server" else "args"
+        required_fields = ["name", "description", template_field]
         for field in required_fields:
             if field not in tool:
                 result.add_error(
@@ -386,17 +618,118 @@ class MCPConfigValidator:
                 result.add_error(f"{path_prefix}.args", "Tool args must be an array")
             else:
                 for j, arg in enumerate(args):
-                    if not isinstance(arg, str):
+                    # A list is a group of args rendered or left out together
+                    group = arg if isinstance(arg, list) else [arg]
+                    if not group or not all(isinstance(a, str) for a in group):
                         result.add_error(
-                            f"{path_prefix}.args[{j}]", "All args must be strings"
+                            f"{path_prefix}.args[{j}]",
+                            "All args must be strings or non-empty groups of strings",
                         )
 
+        # Validate server tool command
+        if "command" in tool:
+            command = tool["command"]
+            if not isinstance(command, str):
+                result.add_error(
+                    f"{path_prefix}.command", "Tool command must be a string"
+                )
+            elif not command.strip():
+                result.add_error(
+                    f"{path_prefix}.command", "Tool command cannot be empty"
+                )
+
+        # Validate execution limits (optional)
+        self._validate_tool_limits(tool, path_prefix, result)
+
+        if "function" in tool and not isinstance(tool["function"], str):
+            result.add_error(
+                f"{path_prefix}.function", "Function name must be a string"
+            )
+
+        for field in ("coalesce", "stream", "paginate"):
+            if field in tool and not isinstance(tool[field], bool):
+                result.add_error(
+                    f"{path_prefix}.{field}", f"{field.capitalize()} must be a boolean"
+                )
+
+        # Validate response cache settings (optional)
+        if "cache" in tool:
+            self._validate_tool_cache(tool["cache"], f"{path_prefix}.cache", result)
+
         # Validate tool parameters (optional)
         if "parameters" in tool:
             self._validate_tool_parameters(
                 tool["parameters"], f"{path_prefix}.parameters", result
             )
 
+    def _validate_tool_limits(
+        self, tool: dict[str, Any], path_prefix: str, result: ValidationResult
+    ) -> None:
+        """Validate a tool's timeout, concurrency, queue and output limits."""
+        if "timeout" in tool:
+            if not isinstance(tool["timeout"], int | float):
+                result.add_error(f"{path_prefix}.timeout", "Timeout must be a number")
+            elif tool["timeout"] <= 0:
+                result.add_error(f"{path_prefix}.timeout", "Timeout must be positive")
+
+        for field, minimum in [
+            ("max_concurrency", 1),
+            ("max_queue", 0),
+            ("max_output_bytes", 1),
+        ]:
+            if field not in tool:
+                continue
+            value = tool[field]
+            label = field.replace("_", " ").capitalize()
+            if not isinstance(value, int) or isinstance(value, bool):
+                result.add_error(
+                    f"{path_prefix}.{field}", f"{label} must be an integer"
+                )
+            elif value < minimum:
+                result.add_error(
+                    f"{path_prefix}.{field}", f"{label} must be at least {minimum}"
+                )
+
+        if "max_queue" in tool and "max_concurrency" not in tool:
+            result.add_warning(
+                f"{path_prefix}.max_queue",
+                "max_queue has no effect without max_concurrency",
+            )
+
+    def _validate_tool_cache(
+        self, cache: Any, path: str, result: ValidationResult
+    ) -> None:
+        """Validate a tool's response cache settings."""
+        if not isinstance(cache, dict):
+            result.add_error(path, "Cache must be an object")
+            return
+
+        if "ttl" in cache:
+            if not isinstance(cache["ttl"], int | float):
+                result.add_error(f"{path}.ttl", "Cache TTL must be a number")
+            elif cache["ttl"] <= 0:
+                result.add_error(f"{path}.ttl", "Cache TTL must be positive")
+
+        if "max_entries" in cache:
+            max_entries = cache["max_entries"]
+            if not isinstance(max_entries, int) or isinstance(max_entries, bool):
+                result.add_error(
+                    f"{path}.max_entries", "Cache max entries must be an integer"
+                )
+            elif max_entries <= 0:
+                result.add_error(
+                    f"{path}.max_entries", "Cache max entries must be positive"
+                )
+
+        if "vary_on" in cache:
+            vary_on = cache["vary_on"]
+            if not isinstance(vary_on, list) or not all(
+                isinstance(name, str) for name in vary_on
+            ):
+                result.add_error(
+                    f"{path}.vary_on", "Cache vary_on must be an array of strings"
+                )
+
     def _validate_tool_parameters(
         self, parameters: Any, path: str, result: ValidationResult
     ) -> None:
@@ -453,6 +786,11 @@ class MCPConfigValidator:
                         f"Valid types: {', '.join(self.VALID_PARAM_TYPES)}",
                     )
 
+            if "required" in param and not isinstance(param["required"], bool):
+                result.add_error(
+                    f"{param_path}.required", "Parameter required must be a boolean"
+                )
+
             # Validate parameter description
             if "description" in param:
                 desc = param["description"]
@@ -474,13 +812,28 @@ class MCPConfigValidator:
             return
 
         tools = config["tools"]
+        backend = config["backend"]
+        # Only command backends pass parameters through args, the others
+        # send them as the request or call arguments
+        passes_args = not isinstance(backend, dict) or backend.get("type") in (
+            "commandline",
+            "server",
+        )
+        # Server tools put their parameters in a command string
+        template_field = (
+            "command"
+            if isinstance(backend, dict) and backend.get("type") == "server"
+            else "args"
+        )
 
         # Check if tools reference parameters that exist
         for i, tool in enumerate(tools):
             if not isinstance(tool, dict):
                 continue
 
-            args = tool.get("args", [])
+            args = tool.get(template_field, [])
+            if isinstance(args, str):
+                args = [args]
             parameters = tool.get("parameters", [])
 
             if not isinstance(args, list) or not isinstance(parameters, list):
@@ -489,9 +842,10 @@ class MCPConfigValidator:
             # Extract parameter names from args (look for {param} patterns)
             arg_params = set()
             for arg in args:
-                if isinstance(arg, str):
-                    matches = re.findall(r"\{(\w+)\}", arg)
-                    arg_params.update(matches)
+                for text in arg if isinstance(arg, list) else [arg]:
+                    if isinstance(text, str):
+                        matches = re.findall(r"\{(\w+)\}", text.replace("{{", ""))
+                        arg_params.update(matches)
 
             # Get defined parameter names
             defined_params = set()
@@ -504,15 +858,15 @@ class MCPConfigValidator:
             for param in missing_params:
                 result.add_error(
                     f"tools[{i}].parameters",
-                    f"Parameter '{param}' used in args but not defined",
+                    f"Parameter '{param}' used in {template_field} but not defined",
                 )
 
             # Check for unused parameter definitions
-            unused_params = defined_params - arg_params
+            unused_params = defined_params - arg_params if passes_args else set()
             for param in unused_params:
                 result.add_warning(
                     f"tools[{i}].parameters",
-                    f"Parameter '{param}' defined but not used in args",
+                    f"Parameter '{param}' defined but not used in {template_field}",
                 )
 
     def _is_valid_url(self, url: str) -> bool:
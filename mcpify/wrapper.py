@@ -4,28 +4,254 @@ Universal MCP tool wrapper - supports multiple backend program types
 """
 
 import asyncio
-import concurrent.futures
+import atexit
+import codecs
+import contextlib
 import inspect
 import json
+import os
 import subprocess
-from collections.abc import Callable
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, nullcontext
+from dataclasses import dataclass
 from typing import Any
 
-from mcp.server.fastmcp import FastMCP
-
-from .backend import BackendAdapter, create_adapter
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.server.fastmcp.tools import Tool, ToolManager
+from mcp.server.fastmcp.utilities.func_metadata import FuncMetadata, func_metadata
+from mcp.shared.exceptions import McpError
+from mcp.types import (
+    INVALID_PARAMS,
+    CallToolRequest,
+    ErrorData,
+    ListToolsRequest,
+    ListToolsResult,
+    ServerResult,
+)
+from mcp.types import Tool as MCPTool
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from .backend import BackendAdapter, ToolExecutionError, ToolTemplate, create_adapter
+from .snapshot import config_hash, default_snapshot_path, normalize_tool, read_snapshot
+
+
+@dataclass
+class _Flight:
+    """A backend call shared by identical concurrent tool calls"""
+
+    task: asyncio.Future
+    waiters: int = 0
+
+
+class _ToolLimiter:
+    """Concurrency bound and admission control for one tool"""
+
+    def __init__(self, max_concurrency: int, max_queue: int | None) -> None:
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        # Calls allowed to wait for a slot, None means unbounded
+        self.max_queue = max_queue
+        self.queued = 0
+
+    @asynccontextmanager
+    async def slot(self, tool_name: str) -> AsyncIterator[None]:
+        """Hold a slot, rejecting the call if the queue is full"""
+        if self.semaphore.locked():
+            if self.max_queue is not None and self.queued >= self.max_queue:
+                raise RuntimeError(f"Tool '{tool_name}' is busy, try again later")
+            self.queued += 1
+            try:
+                await self.semaphore.acquire()
+            finally:
+                self.queued -= 1
+        else:
+            await self.semaphore.acquire()
+        try:
+            yield
+        finally:
+            self.semaphore.release()
+
+
+class _OutputBuffer:
+    """Bounded capture of a tool's output
+
+    Only the first and last max_bytes / 2 bytes are kept in memory. When
+    spooling, the full output is written to a temporary file instead.
+    """
+
+    def __init__(self, max_bytes: int | None, spool: bool = False) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.file = (
+            tempfile.NamedTemporaryFile(prefix="mcpify-output-", delete=False)
+            if spool
+            else None
+        )
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the output exceeded max_bytes"""
+        return self.max_bytes is not None and self.size > self.max_bytes
+
+    def write(self, data: bytes) -> None:
+        """Add a chunk of output"""
+        self.size += len(data)
+        if self.file is not None:
+            self.file.write(data)
+            return
+        if self.max_bytes is None:
+            self.head += data
+            return
+
+        head_limit = self.max_bytes - self.max_bytes // 2
+        tail_limit = self.max_bytes // 2
+        if len(self.head) < head_limit:
+            take = head_limit - len(self.head)
+            self.head += data[:take]
+            data = data[take:]
+        if data and tail_limit:
+            self.tail += data
+            del self.tail[:-tail_limit]
+
+    def text(self) -> str:
+        """Return the output, eliding the middle if it was truncated"""
+        if not self.truncated:
+            return (self.head + self.tail).decode(errors="replace")
+        omitted = self.size - len(self.head) - len(self.tail)
+        return (
+            self.head.decode(errors="ignore")
+            + f"\n[... {omitted} bytes truncated ...]\n"
+            + self.tail.decode(errors="ignore")
+        )
+
+    def discard(self) -> None:
+        """Delete the spool file, if any"""
+        if self.file is not None:
+            self.file.close()
+            with contextlib.suppress(OSError):
+                os.unlink(self.file.name)
+
+
+class _LazyToolManager(ToolManager):
+    """Tool manager that builds declared tools on first use"""
+
+    def __init__(self, build: Callable[[str], Tool]) -> None:
+        super().__init__()
+        self._build = build
+        # Every tool name in listing order, built or not
+        self.names: dict[str, None] = {}
+
+    def declare(self, name: str) -> None:
+        """Add a tool that is built when first needed"""
+        self.names.setdefault(name, None)
+
+    def built(self, name: str) -> Tool | None:
+        """Return a tool only if it has already been built"""
+        return self._tools.get(name)
+
+    def get_tool(self, name: str) -> Tool | None:
+        tool = self._tools.get(name)
+        if tool is None and name in self.names:
+            tool = self._tools[name] = self._build(name)
+        return tool
+
+    def list_tools(self) -> list[Tool]:
+        return [tool for name in self.names if (tool := self.get_tool(name))]
+
+    def add_tool(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tool:
+        tool = super().add_tool(fn, *args, **kwargs)
+        self.names.setdefault(tool.name, None)
+        return tool
+
+    def remove_tool(self, name: str) -> None:
+        if name not in self.names:
+            raise ToolError(f"Unknown tool: {name}")
+        del self.names[name]
+        self._tools.pop(name, None)
+
+
+@dataclass
+class _Spool:
+    """Full output of a paginated tool call, kept on disk for paging"""
+
+    path: str
+    size: int
+    page_bytes: int
+    expires_at: float
 
 
 class MCPWrapper:
     """MCP server wrapper"""
 
-    def __init__(self, config_path: str):
+    # Seconds a tool call may take unless the tool sets "timeout"
+    DEFAULT_TIMEOUT = 30
+
+    # Keyword that receives the MCP request context in streaming tools
+    CONTEXT_PARAM = "mcp_context"
+
+    # Follow-up tool that serves later pages of paginated tool output
+    PAGE_TOOL = "read_output_page"
+
+    # Page size for tools that set "paginate" without "max_output_bytes"
+    DEFAULT_PAGE_BYTES = 65536
+
+    # Spooled outputs kept for paging, and how long each one lives
+    MAX_SPOOLS = 16
+    SPOOL_TTL = 600
+
+    # Tools per tools/list response, clients follow nextCursor for more
+    TOOLS_PAGE_SIZE = 500
+
+    def __init__(
+        self,
+        config_path: str,
+        snapshot_path: str | None = None,
+        use_snapshot: bool = True,
+    ):
         self.config_path = config_path
-        with open(config_path) as f:
-            self.config = json.load(f)
+        with open(config_path, "rb") as f:
+            data = f.read()
+        self.config_hash = config_hash(data)
+
+        # A snapshot from "mcpify compile" skips rebuilding tool schemas
+        # and templates, it is ignored once the config changes
+        snapshot = None
+        if use_snapshot:
+            snapshot = read_snapshot(
+                snapshot_path or default_snapshot_path(config_path), self.config_hash
+            )
+        # Compiled plans and schemas by tool name, when loaded from a snapshot
+        self._compiled_tools: dict[str, dict[str, Any]] | None = None
+        # Argument models for snapshot tools, keyed on parameter shape
+        self._argument_models: dict[str, FuncMetadata] = {}
+        if snapshot is not None:
+            self.config = snapshot["config"]
+            self._compiled_tools = {}
+            for tool, compiled in zip(
+                self.config.get("tools", []), snapshot["tools"], strict=True
+            ):
+                self._compiled_tools.setdefault(tool["name"], compiled)
+        else:
+            self.config = json.loads(data)
 
         server_name = self.config.get("name", "tool-wrapper")
-        self.mcp = FastMCP(server_name)
+        self.mcp = FastMCP(server_name, lifespan=self._backend_lifespan)
+
+        # Tools are built on first call or listing, not all at startup
+        self._tool_configs: dict[str, dict[str, Any]] = {}
+        self._tool_manager = _LazyToolManager(self._build_tool)
+        self.mcp._tool_manager = self._tool_manager
+        self.mcp._mcp_server.list_tools()(self._list_tools_page)
+        self._call_tool_handler = self.mcp._mcp_server.request_handlers[CallToolRequest]
+        self.mcp._mcp_server.request_handlers[CallToolRequest] = self._call_tool
 
         # Check if backend configuration exists
         self.adapter: BackendAdapter | None = None
@@ -34,8 +260,31 @@ class MCPWrapper:
         else:
             self.adapter = None
 
+        # Number of MCP sessions and HTTP apps holding the backend open
+        self._backend_holders = 0
+        self._backend_lock = asyncio.Lock()
+
+        # Backend calls in flight, keyed on tool name and parameters
+        self._in_flight: dict[tuple[str, str], _Flight] = {}
+
+        # Concurrency limiters for tools that set "max_concurrency"
+        self._limiters: dict[str, _ToolLimiter] = {}
+
+        # Paginated outputs on disk, keyed on the id in their cursors
+        self._spools: OrderedDict[str, _Spool] = OrderedDict()
+        atexit.register(self._discard_spools)
+
         self._register_tools()
 
+        # Health endpoint for load balancers in the HTTP transports
+        self.mcp.custom_route("/health", methods=["GET"])(self._health)
+
+        # HTTP apps keep the backend running for as long as they serve
+        self._streamable_http_app = self.mcp.streamable_http_app
+        self._sse_app = self.mcp.sse_app
+        self.mcp.streamable_http_app = self.streamable_http_app  # type: ignore[method-assign]
+        self.mcp.sse_app = self.sse_app  # type: ignore[method-assign]
+
     def get_python_type(self, type_str: str) -> type:
         """Convert string type to Python type"""
         type_mapping = {
@@ -47,40 +296,55 @@ class MCPWrapper:
             "number": float,
             "bool": bool,
             "boolean": bool,
+            "array": list,
+            "list": list,
+            "object": dict,
         }
         return type_mapping.get(type_str.lower(), str)
 
-    def create_tool_function(self, tool_config: dict[str, Any]) -> Callable:
-        """Dynamically create tool function"""
+    def create_tool_function(
+        self, tool_config: dict[str, Any], plan: Any = None
+    ) -> Callable:
+        """Dynamically create tool function, plan is a precompiled template"""
         tool_name = tool_config["name"]
         parameters = tool_config.get("parameters", [])
+        timeout = tool_config.get("timeout", self.DEFAULT_TIMEOUT)
 
-        def tool_executor(**kwargs: Any) -> Any:
+        if "max_concurrency" in tool_config:
+            self._limiters[tool_name] = _ToolLimiter(
+                tool_config["max_concurrency"], tool_config.get("max_queue")
+            )
+
+        # Compile argument templates once rather than on every call
+        if self.adapter:
+            self.adapter.prepare_tool(tool_config, plan)
+        elif plan is not None:
+            template = ToolTemplate.from_plan(plan)
+        else:
+            template = ToolTemplate.for_tool(tool_config)
+
+        async def tool_executor(**kwargs: Any) -> Any:
             """Generic function to execute tools"""
+            ctx = kwargs.pop(self.CONTEXT_PARAM, None)
             if self.adapter:
-                # Use adapter to execute tool
-                def run_async_in_thread() -> Any:
-                    """Run async code in new thread"""
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        if self.adapter is not None:
-                            return loop.run_until_complete(
-                                self.adapter.execute_tool(tool_config, kwargs)
-                            )
-                    finally:
-                        loop.close()
-
-                # Use thread pool to execute async operation
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(run_async_in_thread)
-                    try:
-                        result = future.result(timeout=30)  # 30 second timeout
-                        return result
-                    except concurrent.futures.TimeoutError:
-                        return "Error: Tool execution timed out"
-                    except Exception as e:
-                        return f"Error executing tool: {str(e)}"
+                # Optional parameters left out arrive as None, the backend
+                # should see them as missing rather than as null values
+                kwargs = {
+                    key: value for key, value in kwargs.items() if value is not None
+                }
+                # Await the adapter directly on the server's event loop
+                if tool_config.get("stream", False):
+                    execution = self._execute_streaming(tool_config, kwargs, ctx)
+                else:
+                    execution = self._execute_tool(tool_config, kwargs)
+                try:
+                    return await asyncio.wait_for(execution, timeout=timeout)
+                except asyncio.TimeoutError:
+                    return "Error: Tool execution timed out"
+                except ToolExecutionError as e:
+                    return str(e)
+                except Exception as e:
+                    return f"Error executing tool: {str(e)}"
             else:
                 # Use simple command line execution (backward compatibility)
                 args_template = tool_config.get("args", [])
@@ -91,17 +355,14 @@ class MCPWrapper:
                         "Error: No backend adapter configured and no command specified"
                     )
 
-                cmd_args = []
-                for arg in args_template:
-                    if arg.startswith("{") and arg.endswith("}"):
-                        param_name = arg.strip("{}")
-                        value = kwargs.get(param_name, "")
-                        cmd_args.append(str(value))
-                    else:
-                        cmd_args.append(arg)
-
-                result = subprocess.run(
-                    cmd_args, capture_output=True, text=True, cwd="."
+                try:
+                    cmd_args = template.render_args(kwargs)
+                except ValueError as e:
+                    return f"Error: {str(e)}"
+
+                # Run the blocking call off the event loop
+                result = await asyncio.to_thread(
+                    subprocess.run, cmd_args, capture_output=True, text=True, cwd="."
                 )
 
                 if result.returncode != 0:
@@ -122,14 +383,27 @@ class MCPWrapper:
                 param_name = param["name"]
                 param_type = self.get_python_type(param["type"])
 
-                # Create parameter object
-                sig_param = inspect.Parameter(
-                    param_name,
-                    inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                    annotation=param_type,
-                )
+                # Create parameter object, optional ones default to None
+                annotation: Any = param_type
+                if param.get("required", True):
+                    sig_param = inspect.Parameter(
+                        param_name,
+                        inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                        annotation=annotation,
+                    )
+                else:
+                    annotation = param_type | None
+                    sig_param = inspect.Parameter(
+                        param_name,
+                        inspect.Parameter.KEYWORD_ONLY,
+                        default=None,
+                        annotation=annotation,
+                    )
                 sig_params.append(sig_param)
-                annotations[param_name] = param_type
+                annotations[param_name] = annotation
+
+            # Keyword-only optional parameters go after the required ones
+            sig_params.sort(key=lambda sig_param: sig_param.kind)
 
             # Set return type annotation
             annotations["return"] = str
@@ -152,19 +426,375 @@ class MCPWrapper:
             tool_executor.__annotations__ = {"return": str}
             tool_executor.__dict__["__signature__"] = inspect.Signature([])
 
+        if tool_config.get("stream", False):
+            # Have FastMCP inject the request context for progress reports
+            signature = tool_executor.__dict__["__signature__"]
+            context_param = inspect.Parameter(
+                self.CONTEXT_PARAM,
+                inspect.Parameter.KEYWORD_ONLY,
+                default=None,
+                annotation=Context,
+            )
+            tool_executor.__dict__["__signature__"] = signature.replace(
+                parameters=[*signature.parameters.values(), context_param]
+            )
+            tool_executor.__annotations__[self.CONTEXT_PARAM] = Context
+
         return tool_executor
 
-    def _register_tools(self) -> None:
-        """Register all tools to MCP server"""
-        for tool in self.config.get("tools", []):
-            tool_name = tool["name"]
-            tool_description = tool["description"]
+    async def _execute_tool(
+        self, tool_config: dict[str, Any], parameters: dict[str, Any]
+    ) -> Any:
+        """Execute a tool, sharing one backend call between identical calls"""
+        if self.adapter is None:
+            raise RuntimeError("No backend adapter configured")
+
+        # Tools with side effects opt out with "coalesce": false
+        if not tool_config.get("coalesce", True):
+            return await self._execute_limited(tool_config, parameters)
+
+        key = (
+            tool_config["name"],
+            json.dumps(parameters, sort_keys=True, default=str),
+        )
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = _Flight(
+                asyncio.ensure_future(self._execute_limited(tool_config, parameters))
+            )
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        flight.waiters += 1
+        try:
+            # Shield the shared call so one caller giving up doesn't cancel
+            # it for the others
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    async def _execute_limited(
+        self, tool_config: dict[str, Any], parameters: dict[str, Any]
+    ) -> Any:
+        """Run a backend call within the tool's concurrency limit"""
+        if self.adapter is None:
+            raise RuntimeError("No backend adapter configured")
+
+        if "max_output_bytes" in tool_config or tool_config.get("paginate", False):
+            # Read bounded output from the stream rather than all at once
+            return await self._execute_streaming(tool_config, parameters, None)
+
+        async with self._tool_slot(tool_config):
+            return await self.adapter.execute_tool(tool_config, parameters)
+
+    def _tool_slot(
+        self, tool_config: dict[str, Any]
+    ) -> AbstractAsyncContextManager[None]:
+        """Return the tool's concurrency slot, or a no-op if it is unbounded"""
+        limiter = self._limiters.get(tool_config["name"])
+        if limiter is None:
+            return nullcontext()
+        return limiter.slot(tool_config["name"])
+
+    async def _execute_streaming(
+        self, tool_config: dict[str, Any], parameters: dict[str, Any], ctx: Any
+    ) -> str:
+        """Run a tool incrementally, reporting partial output as progress"""
+        if self.adapter is None:
+            raise RuntimeError("No backend adapter configured")
+
+        paginate = tool_config.get("paginate", False)
+        max_bytes: int | None = tool_config.get("max_output_bytes")
+        if paginate and max_bytes is None:
+            max_bytes = self.DEFAULT_PAGE_BYTES
+        output = _OutputBuffer(max_bytes, spool=paginate)
 
-            # Create tool function
-            tool_func = self.create_tool_function(tool)
+        try:
+            async with self._tool_slot(tool_config):
+                stream = self.adapter.execute_tool_stream(tool_config, parameters)
+                try:
+                    async for chunk in stream:
+                        output.write(chunk.encode())
+                        if ctx is not None:
+                            await ctx.report_progress(output.size, message=chunk)
+                finally:
+                    await stream.aclose()
+        except BaseException:
+            output.discard()
+            raise
+
+        if output.file is None:
+            return output.text().strip()
+        return self._spool_output(output)
+
+    def _spool_output(self, output: _OutputBuffer) -> str:
+        """Keep a spooled output for paging and return its first page"""
+        if output.file is None or output.max_bytes is None:
+            raise RuntimeError("Output was not spooled")
+        output.file.close()
+        spool = _Spool(
+            output.file.name,
+            output.size,
+            output.max_bytes,
+            time.monotonic() + self.SPOOL_TTL,
+        )
+
+        if not output.truncated:
+            text, _ = self._read_page(spool, 0)
+            output.discard()
+            return text.strip()
+
+        self._expire_spools()
+        spool_id = uuid.uuid4().hex
+        self._spools[spool_id] = spool
+        while len(self._spools) > self.MAX_SPOOLS:
+            _, oldest = self._spools.popitem(last=False)
+            self._remove_spool(oldest)
+        return self._page_response(spool_id, spool, 0)
+
+    def read_output_page(self, cursor: str) -> str:
+        """Return the page of spooled output at cursor"""
+        spool_id, _, offset = cursor.partition(":")
+        self._expire_spools()
+        spool = self._spools.get(spool_id)
+        if spool is None or not offset.isdigit() or int(offset) > spool.size:
+            return "Error: Unknown or expired cursor"
+        return self._page_response(spool_id, spool, int(offset))
+
+    def _page_response(self, spool_id: str, spool: _Spool, offset: int) -> str:
+        """Format one page, with a cursor for the next one if there is more"""
+        text, end = self._read_page(spool, offset)
+        if end >= spool.size:
+            return text
+        return (
+            f"{text}\n[bytes {offset}-{end} of {spool.size}, call "
+            f'{self.PAGE_TOOL} with cursor "{spool_id}:{end}" for more]'
+        )
+
+    def _read_page(self, spool: _Spool, offset: int) -> tuple[str, int]:
+        """Read one page of a spool without splitting a UTF-8 character"""
+        with open(spool.path, "rb") as f:
+            f.seek(offset)
+            data = f.read(spool.page_bytes)
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        text = decoder.decode(data)
+        pending = len(decoder.getstate()[0])
+        if pending == len(data) or offset + len(data) >= spool.size:
+            # Nothing complete to return, or the end of the output
+            text = data.decode(errors="replace")
+            pending = 0
+        return text, offset + len(data) - pending
+
+    def _expire_spools(self) -> None:
+        """Drop spools whose TTL has passed"""
+        now = time.monotonic()
+        for spool_id, spool in list(self._spools.items()):
+            if spool.expires_at <= now:
+                del self._spools[spool_id]
+                self._remove_spool(spool)
+
+    def _remove_spool(self, spool: _Spool) -> None:
+        """Delete a spool's file"""
+        with contextlib.suppress(OSError):
+            os.unlink(spool.path)
+
+    def _discard_spools(self) -> None:
+        """Delete all spool files"""
+        while self._spools:
+            _, spool = self._spools.popitem()
+            self._remove_spool(spool)
 
-            # Register to MCP
-            self.mcp.tool(name=tool_name, description=tool_description)(tool_func)
+    def _register_tools(self) -> None:
+        """Declare all tools to the MCP server"""
+        for tool in self.config.get("tools", []):
+            self._tool_configs.setdefault(tool["name"], tool)
+            self._tool_manager.declare(tool["name"])
+
+        if any(tool.get("paginate", False) for tool in self.config.get("tools", [])):
+            self.mcp.tool(
+                name=self.PAGE_TOOL,
+                description="Read the next page of a paginated tool's output",
+            )(self.read_output_page)
+
+    def _build_tool(self, name: str) -> Tool:
+        """Build a declared tool's executor and argument validation"""
+        tool_config = self._tool_configs[name]
+        compiled = self._compiled_tools.get(name) if self._compiled_tools else None
+        if compiled is None:
+            return Tool.from_function(
+                self.create_tool_function(tool_config),
+                name=name,
+                description=tool_config["description"],
+            )
+
+        # Use the JSON schema stored in the snapshot rather than rendering it
+        tool_func = self.create_tool_function(tool_config, compiled["plan"])
+        context_kwarg = self.CONTEXT_PARAM if tool_config.get("stream", False) else None
+        return Tool(
+            fn=tool_func,
+            name=name,
+            description=tool_config["description"],
+            parameters=compiled["schema"],
+            fn_metadata=self._argument_metadata(
+                tool_func, compiled["shape"], context_kwarg
+            ),
+            is_async=True,
+            context_kwarg=context_kwarg,
+        )
+
+    async def _list_tools_page(self, request: ListToolsRequest) -> ListToolsResult:
+        """Handle tools/list one page at a time"""
+        # The server also lists tools itself, without a request
+        cursor = request.params.cursor if request and request.params else None
+        if cursor is not None and not cursor.isdigit():
+            raise McpError(ErrorData(code=INVALID_PARAMS, message="Invalid cursor"))
+        start = int(cursor) if cursor else 0
+        end = start + self.TOOLS_PAGE_SIZE
+
+        names = list(self._tool_manager.names)
+        return ListToolsResult(
+            tools=[self._describe_tool(name) for name in names[start:end]],
+            nextCursor=str(end) if end < len(names) else None,
+        )
+
+    async def _call_tool(self, request: CallToolRequest) -> ServerResult:
+        """Handle tools/call for tools the client found on any page"""
+        # The server looks the tool up among those it has listed, and would
+        # otherwise list the first page again on every miss. The cache is
+        # private to mcp, so only seed it where it exists as expected
+        cache = getattr(self.mcp._mcp_server, "_tool_cache", None)
+        name = request.params.name
+        if (
+            isinstance(cache, dict)
+            and name not in cache
+            and name in self._tool_manager.names
+        ):
+            cache[name] = self._describe_tool(name)
+        return await self._call_tool_handler(request)
+
+    def _describe_tool(self, name: str) -> MCPTool:
+        """Describe a tool for tools/list, building it only if need be"""
+        compiled = self._compiled_tools.get(name) if self._compiled_tools else None
+        if compiled is not None and self._tool_manager.built(name) is None:
+            return MCPTool(
+                name=name,
+                description=self._tool_configs[name]["description"],
+                inputSchema=compiled["schema"],
+            )
+
+        tool = self._tool_manager.get_tool(name)
+        if tool is None:
+            raise RuntimeError(f"Tool '{name}' is not registered")
+        return MCPTool(
+            name=tool.name,
+            title=tool.title,
+            description=tool.description,
+            inputSchema=tool.parameters,
+            outputSchema=tool.output_schema,
+            annotations=tool.annotations,
+            icons=tool.icons,
+            _meta=tool.meta,
+        )
+
+    def _argument_metadata(
+        self, tool_func: Callable, shape: str, context_kwarg: str | None
+    ) -> FuncMetadata:
+        """Return argument validation shared by tools with the same parameters
+
+        Building a pydantic model per tool dominates startup with thousands
+        of generated tools, most of which take the same parameters.
+        """
+        metadata = self._argument_models.get(shape)
+        if metadata is None:
+
+            async def tool(**kwargs: Any) -> Any:
+                """Stand-in so the shared model isn't named after one tool"""
+
+            tool.__annotations__ = dict(tool_func.__annotations__)
+            tool.__dict__["__signature__"] = inspect.signature(tool_func)
+            metadata = func_metadata(
+                tool, skip_names=[context_kwarg] if context_kwarg else []
+            )
+            self._argument_models[shape] = metadata
+        return metadata
+
+    def build_snapshot(self) -> dict[str, Any]:
+        """Collect the normalized config, tool schemas and compiled templates"""
+        tools = [normalize_tool(tool) for tool in self.config.get("tools", [])]
+        compiled = []
+        for tool in tools:
+            registered = self.mcp._tool_manager.get_tool(tool["name"])
+            if registered is None:
+                raise RuntimeError(f"Tool '{tool['name']}' is not registered")
+            if self.adapter:
+                plan = self.adapter.compile_tool(tool)
+            else:
+                plan = ToolTemplate.for_tool(tool).plan()
+            # Tools whose parameters render the same share a validation model
+            shape = json.dumps(
+                {
+                    "schema": {
+                        k: v for k, v in registered.parameters.items() if k != "title"
+                    },
+                    "stream": tool.get("stream", False),
+                },
+                sort_keys=True,
+            )
+            compiled.append(
+                {"plan": plan, "schema": registered.parameters, "shape": shape}
+            )
+        return {"config": {**self.config, "tools": tools}, "tools": compiled}
+
+    @asynccontextmanager
+    async def _hold_backend(self) -> AsyncIterator[None]:
+        """Keep the backend started while any holder is inside the context"""
+        async with self._backend_lock:
+            if self._backend_holders == 0:
+                await self.start_backend()
+            self._backend_holders += 1
+        try:
+            yield
+        finally:
+            async with self._backend_lock:
+                self._backend_holders -= 1
+                if self._backend_holders == 0:
+                    await self.stop_backend()
+
+    @asynccontextmanager
+    async def _backend_lifespan(self, server: FastMCP) -> AsyncIterator[None]:
+        """Keep the backend running on the server's event loop.
+
+        FastMCP enters the lifespan once per session. Over stdio that is the
+        whole process, over HTTP the app holds the backend as well so it
+        isn't restarted each time the last client disconnects.
+        """
+        async with self._hold_backend():
+            yield
+
+    def _hold_backend_for_app(self, app: Starlette) -> Starlette:
+        """Wrap an HTTP app's lifespan so the backend runs as long as the app"""
+        app_lifespan = app.router.lifespan_context
+
+        @asynccontextmanager
+        async def lifespan(app: Starlette) -> AsyncIterator[Any]:
+            async with self._hold_backend(), app_lifespan(app) as state:
+                yield state
+
+        app.router.lifespan_context = lifespan
+        return app
+
+    def streamable_http_app(self) -> Starlette:
+        """Build the streamable HTTP app, holding the backend for its lifetime"""
+        return self._hold_backend_for_app(self._streamable_http_app())
+
+    def sse_app(self, mount_path: str | None = None) -> Starlette:
+        """Build the SSE app, holding the backend for its lifetime"""
+        return self._hold_backend_for_app(self._sse_app(mount_path))
 
     async def start_backend(self) -> None:
         """Start backend service"""
@@ -176,19 +806,24 @@ class MCPWrapper:
         if self.adapter:
             await self.adapter.stop()
 
+    def backend_up(self) -> bool:
+        """Whether the backend can currently serve tool calls"""
+        return self.adapter is None or self.adapter.is_up()
+
+    async def _health(self, request: Request) -> JSONResponse:
+        """Report whether the backend is up"""
+        up = self.backend_up()
+        return JSONResponse(
+            {"status": "ok" if up else "unavailable", "backend_up": up},
+            status_code=200 if up else 503,
+        )
+
     def server(self) -> FastMCP:
         """Run MCP server"""
         return self.mcp
 
     def run(self) -> None:
         """Start MCP server"""
-        # If adapter exists, start backend service first
-        if self.adapter:
-            asyncio.run(self.start_backend())
-
-        try:
-            self.mcp.run()
-        finally:
-            # Clean up resources
-            if self.adapter:
-                asyncio.run(self.stop_backend())
+        # The backend is started and stopped by the server lifespan, so
+        # it shares the server's event loop
+        self.mcp.run()
@@ -0,0 +1,126 @@
+"""Shared fakes for tests of the model-backed detectors."""
+
+import asyncio
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from mcpify.detect.openai import OpenaiDetector
+
+# Seconds calls wait for each other before the overlap counts as missing
+OVERLAP_TIMEOUT = 10
+
+
+def completion(content: str) -> Any:
+    """Build a chat completion response carrying content."""
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeCompletions:
+    """Sync chat completions endpoint, as called from worker threads.
+
+    Each call is answered with respond(prompt). With overlap set, calls are
+    held until that many are in flight at once, which proves they run
+    concurrently without relying on timing; if they never overlap, the
+    calls fail after OVERLAP_TIMEOUT.
+    """
+
+    def __init__(self, respond: Callable[[str], str], overlap: int = 0) -> None:
+        self.respond = respond
+        self.overlap = overlap
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.overlapped = threading.Event()
+
+    def create(self, **kwargs: Any) -> Any:
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            if self.active >= self.overlap:
+                self.overlapped.set()
+        try:
+            if not self.overlapped.wait(OVERLAP_TIMEOUT):
+                raise TimeoutError(f"Fewer than {self.overlap} calls overlapped")
+        finally:
+            with self.lock:
+                self.active -= 1
+        return completion(self.respond(kwargs["messages"][-1]["content"]))
+
+
+class AsyncFakeCompletions:
+    """Async chat completions endpoint, see FakeCompletions."""
+
+    def __init__(self, respond: Callable[[str], str], overlap: int = 0) -> None:
+        self.respond = respond
+        self.overlap = overlap
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.overlapped = asyncio.Event()
+
+    async def create(self, **kwargs: Any) -> Any:
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        if self.active >= self.overlap:
+            self.overlapped.set()
+        try:
+            await asyncio.wait_for(self.overlapped.wait(), OVERLAP_TIMEOUT)
+        finally:
+            self.active -= 1
+        return completion(self.respond(kwargs["messages"][-1]["content"]))
+
+
+class FakeAsyncClient:
+    """Stand-in for openai.AsyncOpenAI."""
+
+    def __init__(self, completions: AsyncFakeCompletions) -> None:
+        self.chat = SimpleNamespace(completions=completions)
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    """Directory the detectors cache responses in."""
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def openai_detector(
+    monkeypatch: pytest.MonkeyPatch, cache_dir: Path
+) -> Callable[..., OpenaiDetector]:
+    """Return a factory for OpenAI detectors whose clients are faked.
+
+    The factory takes the sync and async completions endpoints to install,
+    and passes other keyword arguments on to OpenaiDetector.
+    """
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("MCPIFY_CACHE_DIR", str(cache_dir))
+
+    def create(
+        completions: FakeCompletions | None = None,
+        async_completions: AsyncFakeCompletions | None = None,
+        **kwargs: Any,
+    ) -> OpenaiDetector:
+        detector = OpenaiDetector(**kwargs)
+        if completions is not None:
+            detector.openai_client = SimpleNamespace(  # type: ignore[assignment]
+                chat=SimpleNamespace(completions=completions)
+            )
+        if async_completions is not None:
+            client = FakeAsyncClient(async_completions)
+            monkeypatch.setattr(detector, "_async_client", lambda: client)
+        return detector
+
+    return create
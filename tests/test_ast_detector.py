@@ -0,0 +1,518 @@
+"""Tests for the offline AST detector."""
+
+import argparse
+import json
+import textwrap
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from mcpify.cli import detect_command
+from mcpify.detect.ast import AstDetector
+from mcpify.detect.factory import (
+    AutoDetector,
+    create_detector,
+    create_local_only_detector,
+)
+from mcpify.validate import validate_config_dict
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+def _project(tmp_path: Path, files: dict[str, str]) -> Path:
+    """Write a project's files and return its directory."""
+    for name, source in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source))
+    return tmp_path
+
+
+def _tools(config: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Index a configuration's tools by name."""
+    return {tool["name"]: tool for tool in config["tools"]}
+
+
+def _params(tool: dict[str, Any]) -> dict[str, tuple[str, bool]]:
+    """Map a tool's parameter names to their type and whether required."""
+    return {p["name"]: (p["type"], p["required"]) for p in tool["parameters"]}
+
+
+class TestCommandLines:
+    """Test detecting argparse, click and typer command lines."""
+
+    def test_argparse_exclusive_group_example(self) -> None:
+        """Test that each mutually exclusive option becomes a tool."""
+        config = AstDetector().detect_project(str(EXAMPLES / "python-cmd-tool"))
+        tools = _tools(config)
+
+        assert config["backend"]["type"] == "commandline"
+        assert config["backend"]["config"]["args"][0].endswith("cmd-tool.py")
+        assert list(tools) == ["hello", "echo", "time", "add"]
+        assert tools["hello"]["args"] == ["--hello"]
+        assert tools["echo"]["args"] == ["--echo", "{message}"]
+        assert tools["add"]["args"] == ["--add", "{num1}", "{num2}"]
+        assert _params(tools["add"]) == {
+            "num1": ("number", True),
+            "num2": ("number", True),
+        }
+        assert validate_config_dict(config).is_valid
+
+    def test_argparse_subcommands(self, tmp_path: Path) -> None:
+        """Test that each subcommand becomes a tool with optional groups."""
+        project = _project(
+            tmp_path,
+            {
+                "cli.py": """
+                import argparse
+
+                def main():
+                    parser = argparse.ArgumentParser(description="Files")
+                    parser.add_argument("--verbose", action="store_true")
+                    sub = parser.add_subparsers(dest="command")
+                    copy = sub.add_parser("copy", help="Copy files")
+                    copy.add_argument("sources", nargs="+", help="Files to copy")
+                    copy.add_argument("--dest", "-d", required=True)
+                    copy.add_argument("--mode", choices=["fast", "safe"])
+                    copy.add_argument("--tag", action="append")
+                    sub.add_parser("list-all", help="List files")
+                """
+            },
+        )
+
+        tools = _tools(AstDetector().detect_project(str(project)))
+
+        assert list(tools) == ["copy", "list_all"]
+        assert tools["copy"]["args"] == [
+            "copy",
+            "{sources}",
+            "--dest",
+            "{dest}",
+            ["--mode", "{mode}"],
+            ["--tag", "{tag}"],
+        ]
+        assert _params(tools["copy"]) == {
+            "sources": ("array", True),
+            "dest": ("string", True),
+            "mode": ("string", False),
+            "tag": ("array", False),
+        }
+        assert "fast, safe" in tools["copy"]["parameters"][2]["description"]
+        assert tools["list_all"]["args"] == ["list-all"]
+
+    def test_click_group(self, tmp_path: Path) -> None:
+        """Test click groups, commands, options and arguments."""
+        project = _project(
+            tmp_path,
+            {
+                "tool.py": """
+                import click
+
+                @click.group()
+                def cli():
+                    pass
+
+                @cli.command()
+                @click.argument("name")
+                @click.option("--count", "-c", type=int, default=1, help="Times")
+                @click.option("--shout", is_flag=True)
+                def greet_user(name, count, shout):
+                    \"\"\"Greet someone.\"\"\"
+
+                @click.command()
+                @click.option("--path", required=True)
+                def scan(path):
+                    \"\"\"Scan a path.\"\"\"
+
+                cli.add_command(scan)
+
+                if __name__ == "__main__":
+                    cli()
+                """
+            },
+        )
+
+        tools = _tools(AstDetector().detect_project(str(project)))
+
+        assert tools["greet_user"]["description"] == "Greet someone."
+        assert tools["greet_user"]["args"] == [
+            "greet-user",
+            "{name}",
+            ["--count", "{count}"],
+        ]
+        assert _params(tools["greet_user"]) == {
+            "name": ("string", True),
+            "count": ("integer", False),
+        }
+        assert tools["scan"]["args"] == ["scan", "--path", "{path}"]
+
+    def test_typer_app(self, tmp_path: Path) -> None:
+        """Test typer commands with Annotated and default-style parameters."""
+        project = _project(
+            tmp_path,
+            {
+                "app.py": """
+                from typing import Annotated, Optional
+
+                import typer
+
+                app = typer.Typer()
+                users = typer.Typer()
+                app.add_typer(users, name="users")
+
+                @users.command()
+                def create(
+                    name: str,
+                    age: Annotated[int, typer.Option(help="Age in years")] = 30,
+                    admin: bool = False,
+                ):
+                    \"\"\"Create a user.\"\"\"
+
+                @users.command("remove")
+                def delete(name: str, email: Optional[str] = typer.Option(None)):
+                    \"\"\"Delete a user.\"\"\"
+
+                @app.command()
+                def version():
+                    \"\"\"Show the version.\"\"\"
+                """
+            },
+        )
+
+        tools = _tools(AstDetector().detect_project(str(project)))
+
+        assert tools["users_create"]["args"] == [
+            "users",
+            "create",
+            "{name}",
+            ["--age", "{age}"],
+        ]
+        assert _params(tools["users_create"]) == {
+            "name": ("string", True),
+            "age": ("integer", False),
+        }
+        assert tools["users_create"]["parameters"][1]["description"] == "Age in years"
+        assert tools["users_remove"]["args"] == [
+            "users",
+            "remove",
+            "{name}",
+            ["--email", "{email}"],
+        ]
+        assert tools["version"]["args"] == ["version"]
+
+    def test_typer_run_single_command(self, tmp_path: Path) -> None:
+        """Test that typer.run() makes a command without a name."""
+        project = _project(
+            tmp_path,
+            {
+                "main.py": """
+                import typer
+
+                def main(path: str, limit: int = typer.Option(10, "--max")):
+                    \"\"\"Count lines.\"\"\"
+
+                if __name__ == "__main__":
+                    typer.run(main)
+                """
+            },
+        )
+
+        tools = _tools(AstDetector().detect_project(str(project)))
+
+        assert tools["main"]["args"] == ["{path}", ["--max", "{limit}"]]
+
+
+class TestWebRoutes:
+    """Test detecting FastAPI and Flask routes."""
+
+    def test_fastapi_example(self) -> None:
+        """Test path, query and body parameters of the todo server."""
+        config = AstDetector().detect_project(str(EXAMPLES / "fastapi-todo-server"))
+        tools = _tools(config)
+
+        assert config["backend"] == {
+            "type": "http",
+            "config": {"base_url": "http://localhost:8000", "timeout": 30},
+        }
+        assert tools["get_todos"]["endpoint"] == "/todos"
+        assert _params(tools["get_todos"]) == {
+            "completed": ("boolean", False),
+            "priority": ("string", False),
+            "limit": ("integer", False),
+        }
+        assert tools["update_todo"]["method"] == "PUT"
+        assert tools["update_todo"]["endpoint"] == "/todos/{todo_id}"
+        # Body model fields, with the subclass overriding inherited ones
+        assert _params(tools["update_todo"]) == {
+            "todo_id": ("integer", True),
+            "title": ("string", False),
+            "description": ("string", False),
+            "priority": ("string", False),
+        }
+        assert _params(tools["create_todo"])["title"] == ("string", True)
+        assert tools["toggle_todo_completion"]["method"] == "PATCH"
+        assert "not_found_handler" not in tools
+        result = validate_config_dict(config)
+        assert result.is_valid and not result.warnings
+
+    def test_fastapi_router_prefix(self, tmp_path: Path) -> None:
+        """Test router prefixes and parameters the client can't send."""
+        project = _project(
+            tmp_path,
+            {
+                "api.py": """
+                from fastapi import APIRouter, Depends, FastAPI, Query, Request
+
+                app = FastAPI()
+                router = APIRouter(prefix="/items")
+
+                @router.get("/{item_id}", summary="Fetch an item")
+                def read_item(
+                    item_id: int,
+                    request: Request,
+                    q: str = Query(..., description="Search"),
+                    db=Depends(lambda: None),
+                ):
+                    pass
+
+                app.include_router(router, prefix="/v1")
+
+                if __name__ == "__main__":
+                    import uvicorn
+                    uvicorn.run(app, port=9000)
+                """
+            },
+        )
+
+        config = AstDetector().detect_project(str(project))
+        tool = _tools(config)["read_item"]
+
+        assert config["backend"]["config"]["base_url"] == "http://localhost:9000"
+        assert tool["endpoint"] == "/v1/items/{item_id}"
+        assert tool["description"] == "Fetch an item"
+        assert _params(tool) == {"item_id": ("integer", True), "q": ("string", True)}
+
+    def test_flask_routes(self, tmp_path: Path) -> None:
+        """Test Flask converters, methods and query parameters."""
+        project = _project(
+            tmp_path,
+            {
+                "app.py": """
+                from flask import Blueprint, Flask, request
+
+                app = Flask(__name__)
+                books = Blueprint("books", __name__, url_prefix="/books")
+
+                @books.route("/<int:book_id>", methods=["GET", "DELETE"])
+                def book(book_id):
+                    \"\"\"Get or delete a book.\"\"\"
+
+                @app.route("/search")
+                def search():
+                    term = request.args["q"]
+                    page = request.args.get("page", 1, type=int)
+                """
+            },
+        )
+
+        config = AstDetector().detect_project(str(project))
+        tools = _tools(config)
+
+        assert config["backend"]["config"]["base_url"] == "http://localhost:5000"
+        assert tools["book_get"]["endpoint"] == "/books/{book_id}"
+        assert tools["book_delete"]["method"] == "DELETE"
+        assert _params(tools["book_get"]) == {"book_id": ("integer", True)}
+        assert _params(tools["search"]) == {
+            "q": ("string", True),
+            "page": ("integer", False),
+        }
+
+    def test_routes_win_over_server_arguments(self, tmp_path: Path) -> None:
+        """Test that a server parsing its --port is detected as a web app."""
+        project = _project(
+            tmp_path,
+            {
+                "main.py": """
+                import argparse
+                from fastapi import FastAPI
+
+                app = FastAPI()
+
+                @app.get("/ping")
+                def ping():
+                    pass
+
+                parser = argparse.ArgumentParser()
+                parser.add_argument("--port", type=int, default=8000)
+                """
+            },
+        )
+
+        config = AstDetector().detect_project(str(project))
+
+        assert config["backend"]["type"] == "http"
+        assert list(_tools(config)) == ["ping"]
+
+
+class TestFunctions:
+    """Test detecting typed public functions."""
+
+    def test_typed_functions(self, tmp_path: Path) -> None:
+        """Test that only fully annotated public functions become tools."""
+        project = _project(
+            tmp_path,
+            {
+                "mathlib.py": """
+                def add(a: int, b: float = 1.0) -> float:
+                    \"\"\"Add two numbers.
+
+                    Args:
+                        a: First number
+                    \"\"\"
+                    return a + b
+
+                async def tags(names: list[str], prefix: str | None = None) -> list:
+                    return names
+
+                def untyped(x):
+                    return x
+
+                def _private(x: int) -> int:
+                    return x
+                """
+            },
+        )
+
+        result = AstDetector().analyze_project(project)
+        tools = {tool.name: tool for tool in result.tools}
+
+        assert result.backend_config == {
+            "type": "python",
+            "config": {"module": "mathlib.py", "cwd": str(project)},
+        }
+        assert list(tools) == ["add", "tags"]
+        assert tools["add"].description == "Add two numbers."
+        assert tools["add"].parameters[0]["description"] == "First number"
+        assert tools["add"].parameters[1]["required"] is False
+        assert tools["tags"].parameters[0]["type"] == "array"
+        assert tools["tags"].parameters[1]["required"] is False
+        assert result.confidence_score < AstDetector.HIGH_CONFIDENCE
+
+
+class TestDetection:
+    """Test confidence, content analysis and detector selection."""
+
+    def test_nothing_found_has_low_confidence(self) -> None:
+        """Test that a project without known patterns isn't trusted."""
+        result = AstDetector().analyze_project(EXAMPLES / "python-server-project")
+
+        assert result.tools == []
+        assert result.confidence_score < AstDetector.HIGH_CONFIDENCE
+
+    def test_skips_tests_and_broken_files(self, tmp_path: Path) -> None:
+        """Test that test directories and unparsable files are ignored."""
+        project = _project(
+            tmp_path,
+            {
+                "broken.py": "def (:\n",
+                "tests/test_cli.py": """
+                import argparse
+                parser = argparse.ArgumentParser()
+                parser.add_argument("--x")
+                """,
+            },
+        )
+
+        assert AstDetector().analyze_project(project).tools == []
+
+    def test_detect_from_content(self) -> None:
+        """Test analysing a GitIngest digest."""
+        source = (EXAMPLES / "python-cmd-tool" / "cmd-tool.py").read_text()
+        separator = "=" * 48
+        digest = f"{separator}\nFILE: cmd-tool.py\n{separator}\n{source}\n"
+
+        result = AstDetector()._detect_from_content(digest)
+
+        assert [tool.name for tool in result.tools] == ["hello", "echo", "time", "add"]
+        assert result.confidence_score >= AstDetector.HIGH_CONFIDENCE
+
+    def test_auto_prefers_confident_static_analysis(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that auto detection doesn't create a model detector."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        detector = create_detector("auto")
+
+        config = detector.detect_project(str(EXAMPLES / "python-cmd-tool"))
+
+        assert isinstance(detector, AutoDetector)
+        assert detector._model_detector is None
+        assert len(config["tools"]) == 4
+
+    def test_auto_analyzes_each_project_once(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that auto detection reuses its static analysis."""
+        detector = AutoDetector()
+        analyze = detector.ast_detector.analyze_project
+        calls = []
+
+        def counting(project_path: Any) -> Any:
+            calls.append(project_path)
+            return analyze(project_path)
+
+        monkeypatch.setattr(detector.ast_detector, "analyze_project", counting)
+        project_path = EXAMPLES / "python-cmd-tool"
+
+        config = detector.detect_project(str(project_path))
+        tools = detector._detect_tools(project_path, None)  # type: ignore[arg-type]
+
+        assert len(calls) == 1
+        assert [tool["name"] for tool in config["tools"]] == [t.name for t in tools]
+
+    def test_auto_falls_back_to_model_detector(self) -> None:
+        """Test that auto detection asks a model when analysis isn't confident."""
+
+        class ModelDetector(AstDetector):
+            def detect_project(self, project_path: str) -> dict[str, Any]:
+                return {"name": "from-model", "tools": []}
+
+        detector = AutoDetector()
+        detector._model_detector = ModelDetector()
+
+        config = detector.detect_project(str(EXAMPLES / "python-server-project"))
+
+        assert config["name"] == "from-model"
+
+    def test_detect_command_uses_auto_detector(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test that the detect command goes through the auto detector."""
+        created = []
+
+        def create(detector_type: str, **kwargs: Any) -> Any:
+            created.append(detector_type)
+            return create_detector(detector_type, **kwargs)
+
+        monkeypatch.setattr("mcpify.detect.factory.create_detector", create)
+        output = tmp_path / "config.json"
+        args = argparse.Namespace(
+            project_path=str(EXAMPLES / "python-cmd-tool"),
+            output=str(output),
+            openai_key=None,
+            no_cache=True,
+            enhance=False,
+            enhance_concurrency=1,
+        )
+
+        detect_command(args)
+
+        expected = AutoDetector().detect_project(str(EXAMPLES / "python-cmd-tool"))
+        assert created == ["auto"]
+        assert json.loads(output.read_text()) == expected
+
+    def test_local_only_detector(self) -> None:
+        """Test that the local-only detector is the AST detector."""
+        assert isinstance(create_local_only_detector(), AstDetector)
+        assert isinstance(create_detector("ast"), AstDetector)
@@ -0,0 +1,1127 @@
+"""
+Unit tests for the MCPify backend adapters.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+from mcpify import forkserver
+from mcpify.backend import (
+    CommandLineAdapter,
+    HttpAdapter,
+    PythonAdapter,
+    ServerAdapter,
+    ToolExecutionError,
+    ToolTemplate,
+    WebSocketAdapter,
+)
+
+# Snippet that waits until as many processes as its arguments name have
+# checked in to a shared directory, exiting with an error if they don't
+RENDEZVOUS = """
+import os, pathlib, sys, time
+directory, count = pathlib.Path(sys.argv[1]), int(sys.argv[2])
+(directory / str(os.getpid())).touch()
+deadline = time.monotonic() + 5
+while len(list(directory.iterdir())) < count:
+    if time.monotonic() > deadline:
+        sys.exit("calls did not overlap")
+    time.sleep(0.01)
+print("met")
+"""
+
+# Interactive server that answers each line after a short delay
+SLOW_SERVER = """
+import sys, time
+print("ready", flush=True)
+for line in sys.stdin:
+    line = line.strip()
+    if line == "quit":
+        break
+    time.sleep(0.3)
+    print(f"got {line}", flush=True)
+"""
+
+# Interactive server that answers each line once as many requests as its
+# arguments name have checked in to a shared directory
+RENDEZVOUS_SERVER = """
+import pathlib, sys, time
+directory, count = pathlib.Path(sys.argv[1]), int(sys.argv[2])
+print("ready", flush=True)
+for line in sys.stdin:
+    line = line.strip()
+    if line == "quit":
+        break
+    (directory / line).touch()
+    deadline = time.monotonic() + 5
+    while len(list(directory.iterdir())) < count:
+        if time.monotonic() > deadline:
+            break
+        time.sleep(0.01)
+    else:
+        print(f"got {line}", flush=True)
+        continue
+    print(f"alone {line}", flush=True)
+"""
+
+# Interactive server that answers with a multi-line response in the
+# framing named on its command line
+FRAMED_SERVER = """
+import sys
+framing = sys.argv[1]
+print("ready", flush=True)
+for line in sys.stdin:
+    if line.strip() == "quit":
+        break
+    body = f"first {line.strip()}\\nsecond"
+    if framing == "sentinel":
+        print(body + "\\nEND", flush=True)
+    elif framing == "length":
+        print(len(body.encode()), flush=True)
+        print(body, end="", flush=True)
+    else:
+        print(body, flush=True)
+"""
+
+# Interactive server that answers pings and exits on "crash"
+CRASHY_SERVER = """
+import sys
+print("ready", flush=True)
+for line in sys.stdin:
+    line = line.strip()
+    if line == "quit":
+        break
+    if line == "crash":
+        sys.exit(1)
+    print("pong" if line == "ping" else f"got {line}", flush=True)
+"""
+
+# JSON-lines server that answers once all four requests are in flight,
+# last request first
+JSONL_SERVER = """
+import json, sys, threading
+print("ready", flush=True)
+barrier = threading.Barrier(4, timeout=5)
+turn = threading.Condition()
+next_up = [3]
+def answer(message):
+    n = int(message["command"])
+    try:
+        barrier.wait()
+        result = message["command"]
+    except threading.BrokenBarrierError:
+        result = "alone"
+    with turn:
+        turn.wait_for(lambda: next_up[0] == n, timeout=5)
+        print(json.dumps({"id": message["id"], "result": result}), flush=True)
+        next_up[0] -= 1
+        turn.notify_all()
+for line in sys.stdin:
+    if line.strip() == "quit":
+        break
+    threading.Thread(target=answer, args=(json.loads(line),)).start()
+"""
+
+# Module served in-process by the Python backend
+PYTHON_MODULE = """
+import asyncio
+
+calls = []
+
+def add(a, b):
+    calls.append("add")
+    return a + b
+
+async def greet(name):
+    await asyncio.sleep(0)
+    return f"hello {name}"
+
+def fail():
+    raise ValueError("nope")
+"""
+
+# Command line script run through the fork server
+CLI_SCRIPT = """
+import argparse
+import sys
+
+parser = argparse.ArgumentParser()
+parser.add_argument("command")
+parser.add_argument("value")
+args = parser.parse_args()
+if args.command == "fail":
+    sys.exit(f"failed on {args.value}")
+print(f"{args.command} {args.value}")
+"""
+
+# Command line script that records its pid and hangs
+HANGING_SCRIPT = """
+import os
+import sys
+import time
+
+with open(sys.argv[1], "w") as f:
+    f.write(str(os.getpid()))
+time.sleep(30)
+"""
+
+
+def _wait_for_exit(pid: int) -> bool:
+    """Wait up to five seconds for a process to be gone."""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+class TestToolTemplate:
+    """Test compiling and rendering tool templates."""
+
+    def test_render_args(self) -> None:
+        """Test embedded placeholders, escaped braces and list expansion."""
+        template = ToolTemplate(
+            ["run", "--name={name}", "{{literal}}", "{files}", ["-t", "{tags}"]]
+        )
+        argv = template.render_args(
+            {"name": "x", "files": ["a", "b"], "tags": ["t1", "t2"]}
+        )
+        assert argv == [
+            "run",
+            "--name=x",
+            "{literal}",
+            "a",
+            "b",
+            "-t",
+            "t1",
+            "-t",
+            "t2",
+        ]
+
+    def test_optional_parameters(self) -> None:
+        """Test that optional elements are left out and required ones enforced."""
+        template = ToolTemplate(["{query}", ["--limit", "{limit}"]], optional=["limit"])
+        assert template.render_args({"query": "q"}) == ["q"]
+        assert template.render_args({"query": "q", "limit": 5}) == ["q", "--limit", "5"]
+
+        try:
+            template.render_args({"limit": 5})
+        except ValueError as e:
+            assert str(e) == "Missing required parameter 'query'"
+        else:
+            raise AssertionError("Expected ValueError")
+
+    def test_render_string(self) -> None:
+        """Test rendering a server command string."""
+        template = ToolTemplate("search {query} {page}", optional=["page"])
+        assert template.render_string({"query": ["a", "b"]}) == "search a b"
+        assert template.render_string({"query": "a", "page": 2}) == "search a 2"
+
+        # Tokens around a missing optional parameter are left out whole
+        template = ToolTemplate(
+            'find --name={name} "{note}" {{x}} --all', optional=["name", "note"]
+        )
+        assert template.render_string({}) == "find {x} --all"
+        assert (
+            template.render_string({"name": "n", "note": "a b"})
+            == 'find --name=n "a b" {x} --all'
+        )
+
+
+class TestCommandLineAdapter:
+    """Test CommandLineAdapter execution."""
+
+    def _sleep_adapter(self, **extra: object) -> CommandLineAdapter:
+        """Create an adapter whose tools run a short Python snippet."""
+        return CommandLineAdapter({"command": sys.executable, "args": ["-c"], **extra})
+
+    def test_execute_tool(self) -> None:
+        """Test substituting parameters and capturing stdout."""
+        adapter = CommandLineAdapter({"command": "echo"})
+        tool = {"name": "say", "args": ["hello", "{name}"]}
+
+        result = asyncio.run(adapter.execute_tool(tool, {"name": "world"}))
+        assert result == "hello world"
+
+    def test_execute_tool_error(self) -> None:
+        """Test that a non-zero exit code returns stderr."""
+        adapter = self._sleep_adapter()
+        tool = {"name": "fail", "args": ["import sys; sys.exit('boom')"]}
+
+        result = asyncio.run(adapter.execute_tool(tool, {}))
+        assert result == "Error: boom"
+
+    def test_calls_run_in_parallel(self, tmp_path: Path) -> None:
+        """Test that slow calls don't serialize on the event loop."""
+        adapter = self._sleep_adapter()
+        # Each call only finishes once all four are running together
+        tool = {"name": "meet", "args": [RENDEZVOUS, str(tmp_path), "4"]}
+
+        async def run() -> list[str]:
+            return list(
+                await asyncio.gather(
+                    *(adapter.execute_tool(tool, {}) for _ in range(4))
+                )
+            )
+
+        assert asyncio.run(run()) == ["met"] * 4
+
+    def test_max_concurrency(self) -> None:
+        """Test that max_concurrency bounds the number of running children."""
+        adapter = self._sleep_adapter(max_concurrency=1)
+        tool = {"name": "nap", "args": ["import time; time.sleep(0.3)"]}
+
+        async def run() -> None:
+            await asyncio.gather(*(adapter.execute_tool(tool, {}) for _ in range(3)))
+
+        start = time.monotonic()
+        asyncio.run(run())
+        assert time.monotonic() - start >= 0.9
+
+    def test_cancel_kills_child(self) -> None:
+        """Test that cancelling a call kills the child process."""
+        adapter = self._sleep_adapter()
+        tool = {"name": "hang", "args": ["import time; time.sleep(30)"]}
+
+        async def run() -> float:
+            start = time.monotonic()
+            try:
+                await asyncio.wait_for(adapter.execute_tool(tool, {}), timeout=0.5)
+            except asyncio.TimeoutError:
+                pass
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) < 5
+
+    def test_execute_tool_stream(self) -> None:
+        """Test that stdout is yielded while the command is still running."""
+        adapter = self._sleep_adapter()
+        script = (
+            "import sys, time\n"
+            "for i in range(3):\n"
+            "    sys.stdout.write(str(i) + '\\n')\n"
+            "    sys.stdout.flush()\n"
+            "    time.sleep(0.1)\n"
+        )
+        tool = {"name": "count", "args": [script]}
+
+        async def run() -> list[str]:
+            return [chunk async for chunk in adapter.execute_tool_stream(tool, {})]
+
+        chunks = asyncio.run(run())
+        assert len(chunks) == 3
+        assert "".join(chunks) == "0\n1\n2\n"
+
+    def test_execute_tool_stream_error(self) -> None:
+        """Test that a failing streamed command raises with its stderr."""
+        adapter = self._sleep_adapter()
+        tool = {"name": "fail", "args": ["import sys; sys.exit('boom')"]}
+
+        async def run() -> None:
+            async for _ in adapter.execute_tool_stream(tool, {}):
+                pass
+
+        try:
+            asyncio.run(run())
+        except ToolExecutionError as e:
+            assert str(e) == "Error: boom"
+        else:
+            raise AssertionError("Expected ToolExecutionError")
+
+    def test_fork_server(self, tmp_path: Path) -> None:
+        """Test running a Python script through the warm fork server."""
+        (tmp_path / "cli.py").write_text(CLI_SCRIPT, encoding="utf-8")
+        adapter = CommandLineAdapter(
+            {
+                "command": sys.executable,
+                "args": ["cli.py"],
+                "cwd": str(tmp_path),
+                "fork_server": True,
+            }
+        )
+        assert adapter.fork_server is not None
+        tool = {"name": "run", "args": ["{command}", "{value}"]}
+
+        async def run() -> list[str]:
+            await adapter.start()
+            try:
+                return list(
+                    await asyncio.gather(
+                        adapter.execute_tool(tool, {"command": "say", "value": 1}),
+                        adapter.execute_tool(tool, {"command": "say", "value": 2}),
+                        adapter.execute_tool(tool, {"command": "fail", "value": 3}),
+                    )
+                )
+            finally:
+                await adapter.stop()
+
+        assert asyncio.run(run()) == ["say 1", "say 2", "Error: failed on 3"]
+
+    def test_fork_server_kills_abandoned_children(self, tmp_path: Path) -> None:
+        """Test that cancelled and outstanding fork server calls are killed."""
+        (tmp_path / "hang.py").write_text(HANGING_SCRIPT, encoding="utf-8")
+        adapter = CommandLineAdapter(
+            {
+                "command": sys.executable,
+                "args": ["hang.py"],
+                "cwd": str(tmp_path),
+                "fork_server": True,
+            }
+        )
+        tool = {"name": "hang", "args": ["{pid_file}"]}
+
+        async def call(name: str) -> tuple[asyncio.Future, int]:
+            """Start a call and wait for its child to be running."""
+            pid_file = tmp_path / name
+            task = asyncio.ensure_future(
+                adapter.execute_tool(tool, {"pid_file": str(pid_file)})
+            )
+            while not pid_file.exists() or not pid_file.read_text():
+                await asyncio.sleep(0.05)
+            return task, int(pid_file.read_text())
+
+        async def run() -> int:
+            await adapter.start()
+            try:
+                # A call that is cancelled, as on a timeout
+                cancelled, first = await asyncio.wait_for(call("first"), 10)
+                cancelled.cancel()
+                await asyncio.gather(cancelled, return_exceptions=True)
+                assert await asyncio.to_thread(_wait_for_exit, first)
+
+                # A call still running when the backend stops
+                running, second = await asyncio.wait_for(call("second"), 10)
+            finally:
+                await adapter.stop()
+            await asyncio.gather(running, return_exceptions=True)
+            return second
+
+        assert _wait_for_exit(asyncio.run(run()))
+
+    def test_fork_server_long_replies(self, tmp_path: Path) -> None:
+        """Test fork server replies longer than asyncio's 64 KiB default."""
+        (tmp_path / "cli.py").write_text(CLI_SCRIPT, encoding="utf-8")
+        tool = {"name": "run", "args": ["{command}", "{value}"]}
+        long = "x" * 100_000
+
+        async def run(**extra: object) -> list[str]:
+            adapter = CommandLineAdapter(
+                {
+                    "command": sys.executable,
+                    "args": ["cli.py"],
+                    "cwd": str(tmp_path),
+                    "fork_server": True,
+                    **extra,
+                }
+            )
+            await adapter.start()
+            results = []
+            try:
+                for value in (long, "short"):
+                    try:
+                        results.append(
+                            await adapter.execute_tool(
+                                tool, {"command": "say", "value": value}
+                            )
+                        )
+                    except RuntimeError as e:
+                        results.append(str(e))
+                return results
+            finally:
+                await adapter.stop()
+
+        assert asyncio.run(run()) == [f"say {long}", "say short"]
+
+        # A reply over the limit fails, and the next call gets a fresh server
+        results = asyncio.run(run(stream_limit=1024))
+        assert results[0].startswith("Server reply too long")
+        assert results[1] == "say short"
+
+    def test_fork_server_warms_top_level_imports(self, tmp_path: Path) -> None:
+        """Test that the fork server only imports the script's top level."""
+        (tmp_path / "eager_dependency.py").write_text("", encoding="utf-8")
+        (tmp_path / "lazy_dependency.py").write_text("", encoding="utf-8")
+        script = tmp_path / "tool.py"
+        script.write_text(
+            "import eager_dependency\n\ndef main():\n    import lazy_dependency\n",
+            encoding="utf-8",
+        )
+
+        sys.path.insert(0, str(tmp_path))
+        try:
+            forkserver.warm_imports(str(script))
+            assert "eager_dependency" in sys.modules
+            assert "lazy_dependency" not in sys.modules
+        finally:
+            sys.path.remove(str(tmp_path))
+            sys.modules.pop("eager_dependency", None)
+            sys.modules.pop("lazy_dependency", None)
+
+
+class TestServerAdapter:
+    """Test ServerAdapter worker pool."""
+
+    def _adapter(self, **extra: object) -> ServerAdapter:
+        """Create an adapter around the slow test server."""
+        return ServerAdapter(
+            {
+                "command": sys.executable,
+                "args": ["-c", SLOW_SERVER],
+                "ready_signal": "ready",
+                **extra,
+            }
+        )
+
+    def test_execute_tool(self) -> None:
+        """Test sending a templated command and reading the reply."""
+        adapter = self._adapter()
+        tool = {"name": "echo", "command": "echo {message}"}
+
+        async def run() -> str:
+            try:
+                return await adapter.execute_tool(tool, {"message": "hi"})
+            finally:
+                await adapter.stop()
+
+        assert asyncio.run(run()) == "got echo hi"
+
+    def test_response_framing(self) -> None:
+        """Test reading multi-line responses with each framing."""
+        tool = {"name": "echo", "command": "{n}"}
+
+        async def run(framing: str) -> list[str]:
+            adapter = ServerAdapter(
+                {
+                    "command": sys.executable,
+                    "args": ["-c", FRAMED_SERVER, framing],
+                    "ready_signal": "ready",
+                    "framing": framing,
+                    "idle_timeout": 0.1,
+                }
+            )
+            try:
+                return [await adapter.execute_tool(tool, {"n": i}) for i in range(2)]
+            finally:
+                await adapter.stop()
+
+        for framing in ("sentinel", "length", "idle"):
+            assert asyncio.run(run(framing)) == [
+                "first 0\nsecond",
+                "first 1\nsecond",
+            ]
+
+    def test_long_response_lines(self) -> None:
+        """Test reading response lines longer than asyncio's 64 KiB default."""
+        tool = {"name": "echo", "command": "{n}"}
+        long = "x" * 100_000
+
+        async def run(framing: str, **extra: object) -> str:
+            adapter = ServerAdapter(
+                {
+                    "command": sys.executable,
+                    "args": ["-c", FRAMED_SERVER, framing],
+                    "ready_signal": "ready",
+                    "framing": framing,
+                    **extra,
+                }
+            )
+            try:
+                return await adapter.execute_tool(tool, {"n": long})
+            finally:
+                await adapter.stop()
+
+        for framing in ("line", "sentinel"):
+            assert asyncio.run(run(framing)).startswith(f"first {long}")
+
+        # A lower limit turns the long line into an error
+        result = asyncio.run(run("line", stream_limit=1024))
+        assert result.startswith("Error communicating with server")
+
+    def test_pool_runs_calls_in_parallel(self, tmp_path: Path) -> None:
+        """Test that calls are spread across pool workers."""
+        # Each request is only answered once all three have reached a worker
+        adapter = ServerAdapter(
+            {
+                "command": sys.executable,
+                "args": ["-c", RENDEZVOUS_SERVER, str(tmp_path), "3"],
+                "ready_signal": "ready",
+                "pool_size": 3,
+            }
+        )
+        tool = {"name": "echo", "command": "{n}"}
+
+        async def run() -> list[str]:
+            await adapter.start()
+            try:
+                return list(
+                    await asyncio.gather(
+                        *(adapter.execute_tool(tool, {"n": i}) for i in range(3))
+                    )
+                )
+            finally:
+                await adapter.stop()
+
+        assert asyncio.run(run()) == ["got 0", "got 1", "got 2"]
+
+    def test_queue_timeout(self) -> None:
+        """Test that excess calls give up after queue_timeout."""
+        adapter = self._adapter(pool_size=1, queue_timeout=0.1)
+        tool = {"name": "echo", "command": "{n}"}
+
+        async def run() -> list[str]:
+            await adapter.start()
+            try:
+                return list(
+                    await asyncio.gather(
+                        *(adapter.execute_tool(tool, {"n": i}) for i in range(2))
+                    )
+                )
+            finally:
+                await adapter.stop()
+
+        results = asyncio.run(run())
+        assert results[0] == "got 0"
+        assert results[1] == "Error: All server workers are busy"
+
+    def test_jsonl_pipelining(self) -> None:
+        """Test that JSON-lines requests share one worker out of order."""
+        adapter = ServerAdapter(
+            {
+                "command": sys.executable,
+                "args": ["-c", JSONL_SERVER],
+                "ready_signal": "ready",
+                "protocol": "jsonl",
+            }
+        )
+        tool = {"name": "echo", "command": "{n}"}
+
+        async def run() -> list[str]:
+            await adapter.start()
+            try:
+                return list(
+                    await asyncio.gather(
+                        *(adapter.execute_tool(tool, {"n": i}) for i in range(4))
+                    )
+                )
+            finally:
+                await adapter.stop()
+
+        assert asyncio.run(run()) == ["0", "1", "2", "3"]
+
+
+class TestServerSupervisor:
+    """Test ServerAdapter health checks and restarts."""
+
+    def _adapter(self, **extra: object) -> ServerAdapter:
+        """Create a supervised adapter around the crashy test server."""
+        return ServerAdapter(
+            {
+                "command": sys.executable,
+                "args": ["-c", CRASHY_SERVER],
+                "ready_signal": "ready",
+                "restart_delay": 0.1,
+                **extra,
+            }
+        )
+
+    def test_restart_after_crash(self, capsys: Any) -> None:
+        """Test that calls wait for a crashed worker to be restarted."""
+        adapter = self._adapter(queue_timeout=5)
+        crash = {"name": "crash", "command": "crash"}
+        echo = {"name": "echo", "command": "echo {message}"}
+
+        async def run() -> tuple[str, str, bool]:
+            await adapter.start()
+            try:
+                crashed = await adapter.execute_tool(crash, {})
+                result = await adapter.execute_tool(echo, {"message": "hi"})
+                return crashed, result, adapter.is_up()
+            finally:
+                await adapter.stop()
+
+        crashed, result, up = asyncio.run(run())
+        assert crashed.startswith("Error communicating with server")
+        assert result == "got echo hi"
+        assert up
+        # Status lines stay out of the stdio transport's stdout
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "Server worker restarted" in captured.err
+
+    def test_failed_health_probe_restarts_worker(self) -> None:
+        """Test that a worker giving the wrong probe reply is replaced."""
+        adapter = self._adapter(
+            health_command="ping",
+            health_expect="PONG",
+            health_interval=0.1,
+            health_timeout=1,
+        )
+
+        async def run() -> tuple[int, int]:
+            await adapter.start()
+            try:
+                worker = adapter.workers[0]
+                assert worker.process is not None
+                first_pid = worker.process.pid
+                for _ in range(50):
+                    await asyncio.sleep(0.1)
+                    if worker.process is not None and worker.process.pid != first_pid:
+                        return first_pid, worker.process.pid
+                return first_pid, first_pid
+            finally:
+                await adapter.stop()
+
+        first_pid, new_pid = asyncio.run(run())
+        assert new_pid != first_pid
+
+
+class TestHttpAdapter:
+    """Test HttpAdapter against a local aiohttp server."""
+
+    def test_unix_socket_connection_pool(self, tmp_path: Path) -> None:
+        """Test calling an upstream over a Unix socket with a sized pool."""
+        socket_path = str(tmp_path / "api.sock")
+
+        async def greet(request: web.Request) -> web.Response:
+            return web.Response(text=f"hello {request.query['name']}")
+
+        async def run() -> list[str]:
+            app = web.Application()
+            app.router.add_get("/greet", greet)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.UnixSite(runner, socket_path).start()
+
+            adapter = HttpAdapter(
+                {
+                    "base_url": "http://localhost",
+                    "unix_socket": socket_path,
+                    "max_connections": 2,
+                    "connect_timeout": 1,
+                    "read_timeout": 5,
+                }
+            )
+            tool = {"name": "greet", "endpoint": "/greet", "method": "GET"}
+            try:
+                await adapter.start()
+                assert adapter.session is not None
+                assert adapter.session.connector is not None
+                assert adapter.session.connector.limit == 2
+                return list(
+                    await asyncio.gather(
+                        *(adapter.execute_tool(tool, {"name": i}) for i in range(5))
+                    )
+                )
+            finally:
+                await adapter.stop()
+                await runner.cleanup()
+
+        assert asyncio.run(run()) == [f"hello {i}" for i in range(5)]
+
+    def test_cached_get_revalidates_with_etag(self, tmp_path: Path) -> None:
+        """Test serving repeated GETs from cache and revalidating via ETag."""
+        socket_path = str(tmp_path / "api.sock")
+        requests: list[str | None] = []
+
+        async def item(request: web.Request) -> web.Response:
+            requests.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.Response(
+                text=f"item {request.query['id']}", headers={"ETag": '"v1"'}
+            )
+
+        async def run() -> list[str]:
+            app = web.Application()
+            app.router.add_get("/item", item)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.UnixSite(runner, socket_path).start()
+
+            adapter = HttpAdapter(
+                {"base_url": "http://localhost", "unix_socket": socket_path}
+            )
+            tool = {
+                "name": "item",
+                "endpoint": "/item",
+                "method": "GET",
+                "cache": {"ttl": 0.2, "vary_on": ["id"]},
+            }
+            try:
+                results = [
+                    await adapter.execute_tool(tool, {"id": 1, "trace": "a"}),
+                    await adapter.execute_tool(tool, {"id": 1, "trace": "b"}),
+                    await adapter.execute_tool(tool, {"id": 2}),
+                ]
+                await asyncio.sleep(0.3)
+                results.append(await adapter.execute_tool(tool, {"id": 1}))
+                return results
+            finally:
+                await adapter.stop()
+                await runner.cleanup()
+
+        results = asyncio.run(run())
+        assert results == ["item 1", "item 1", "item 2", "item 1"]
+        assert requests == [None, None, '"v1"']
+
+    def _serve(
+        self, socket_path: str, handler: Any
+    ) -> Callable[[], Awaitable[web.AppRunner]]:
+        """Return a coroutine function serving one route over a Unix socket."""
+
+        async def start() -> web.AppRunner:
+            app = web.Application()
+            app.router.add_route("*", "/flaky", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.UnixSite(runner, socket_path).start()
+            return runner
+
+        return start
+
+    def test_fills_path_parameters(self, tmp_path: Path) -> None:
+        """Test filling {name} endpoint placeholders from the parameters."""
+        socket_path = str(tmp_path / "api.sock")
+        seen: list[tuple[str, str, Any]] = []
+
+        async def todo(request: web.Request) -> web.Response:
+            body = await request.json() if request.can_read_body else None
+            seen.append((request.method, request.match_info["todo_id"], body))
+            return web.Response(text=f"todo {request.match_info['todo_id']}")
+
+        async def run() -> list[str]:
+            app = web.Application()
+            app.router.add_route("*", "/todos/{todo_id}", todo)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.UnixSite(runner, socket_path).start()
+
+            adapter = HttpAdapter(
+                {"base_url": "http://localhost", "unix_socket": socket_path}
+            )
+            tool = {"name": "todo", "endpoint": "/todos/{todo_id}", "method": "PATCH"}
+            try:
+                return [
+                    await adapter.execute_tool(tool, {"todo_id": 7, "title": "x"}),
+                    await adapter.execute_tool(tool, {"todo_id": "a/b"}),
+                    await adapter.execute_tool(tool, {"title": "x"}),
+                ]
+            finally:
+                await adapter.stop()
+                await runner.cleanup()
+
+        results = asyncio.run(run())
+        assert results == [
+            "todo 7",
+            "todo a/b",
+            "Error: Missing required parameter 'todo_id'",
+        ]
+        # Path parameters are left out of the body and quoted in the path
+        assert seen == [("PATCH", "7", {"title": "x"}), ("PATCH", "a/b", {})]
+
+    def test_retries_idempotent_requests(self, tmp_path: Path) -> None:
+        """Test retrying GETs on 503 and honouring Retry-After."""
+        socket_path = str(tmp_path / "api.sock")
+        calls: list[str] = []
+
+        async def flaky(request: web.Request) -> web.Response:
+            calls.append(request.method)
+            if len(calls) < 3:
+                return web.Response(status=503, headers={"Retry-After": "0"})
+            return web.Response(text="ok")
+
+        async def run() -> tuple[str, str]:
+            runner = await self._serve(socket_path, flaky)()
+            adapter = HttpAdapter(
+                {
+                    "base_url": "http://localhost",
+                    "unix_socket": socket_path,
+                    "retries": 2,
+                }
+            )
+            try:
+                got = await adapter.execute_tool(
+                    {"name": "get", "endpoint": "/flaky", "method": "GET"}, {}
+                )
+                calls.clear()
+                posted = await adapter.execute_tool(
+                    {"name": "post", "endpoint": "/flaky", "method": "POST"}, {}
+                )
+                return got, posted
+            finally:
+                await adapter.stop()
+                await runner.cleanup()
+
+        got, posted = asyncio.run(run())
+        assert got == "ok"
+        # POST is not idempotent and is never retried
+        assert posted.startswith("HTTP Error 503")
+        assert calls == ["POST"]
+
+    def test_circuit_breaker_fails_fast(self, tmp_path: Path) -> None:
+        """Test that repeated failures open the circuit until it resets."""
+        socket_path = str(tmp_path / "api.sock")
+        calls: list[str] = []
+        healthy = False
+
+        async def flaky(request: web.Request) -> web.Response:
+            calls.append(request.method)
+            if healthy:
+                return web.Response(text="ok")
+            return web.Response(status=502, text="bad gateway")
+
+        async def run() -> list[str]:
+            nonlocal healthy
+            runner = await self._serve(socket_path, flaky)()
+            adapter = HttpAdapter(
+                {
+                    "base_url": "http://localhost",
+                    "unix_socket": socket_path,
+                    "retries": 0,
+                    "circuit_failure_threshold": 2,
+                    "circuit_reset_timeout": 0.2,
+                }
+            )
+            tool = {"name": "get", "endpoint": "/flaky", "method": "GET"}
+            try:
+                results = [await adapter.execute_tool(tool, {}) for _ in range(3)]
+                assert not adapter.is_up()
+                healthy = True
+                await asyncio.sleep(0.25)
+                # Due for a trial call, so reported up before anything probes it
+                assert adapter.is_up()
+                results.append(await adapter.execute_tool(tool, {}))
+                assert adapter.is_up()
+                return results
+            finally:
+                await adapter.stop()
+                await runner.cleanup()
+
+        results = asyncio.run(run())
+        assert results[:2] == ["HTTP Error 502: bad gateway"] * 2
+        assert "circuit open" in results[2]
+        assert results[3] == "ok"
+        assert len(calls) == 3
+
+    def test_cache_served_while_circuit_open(self, tmp_path: Path) -> None:
+        """Test that fresh cache hits bypass an open circuit without closing it."""
+        socket_path = str(tmp_path / "api.sock")
+        calls: list[str] = []
+        healthy = True
+
+        async def flaky(request: web.Request) -> web.Response:
+            calls.append(request.query["id"])
+            if healthy:
+                return web.Response(text=f"item {request.query['id']}")
+            return web.Response(status=502, text="bad gateway")
+
+        async def run() -> list[str]:
+            nonlocal healthy
+            runner = await self._serve(socket_path, flaky)()
+            adapter = HttpAdapter(
+                {
+                    "base_url": "http://localhost",
+                    "unix_socket": socket_path,
+                    "retries": 0,
+                    "circuit_failure_threshold": 2,
+                    "circuit_reset_timeout": 0.2,
+                }
+            )
+            tool = {
+                "name": "item",
+                "endpoint": "/flaky",
+                "method": "GET",
+                "cache": {"ttl": 60},
+            }
+            try:
+                results = [await adapter.execute_tool(tool, {"id": 1})]
+                healthy = False
+                results += [
+                    await adapter.execute_tool(tool, {"id": 2}) for _ in range(2)
+                ]
+                assert adapter.breaker.open
+                results.append(await adapter.execute_tool(tool, {"id": 1}))
+                await asyncio.sleep(0.25)
+                # A cache hit doesn't use up the trial call or close the circuit
+                results.append(await adapter.execute_tool(tool, {"id": 1}))
+                assert adapter.breaker.open
+                healthy = True
+                results.append(await adapter.execute_tool(tool, {"id": 2}))
+                assert not adapter.breaker.open
+                return results
+            finally:
+                await adapter.stop()
+                await runner.cleanup()
+
+        results = asyncio.run(run())
+        assert results[0] == "item 1"
+        assert results[1:3] == ["HTTP Error 502: bad gateway"] * 2
+        assert results[3:] == ["item 1", "item 1", "item 2"]
+        assert calls == ["1", "2", "2", "2"]
+
+
+class TestPythonAdapter:
+    """Test PythonAdapter in-process calls."""
+
+    def test_calls_sync_and_async_functions(self, tmp_path: Path) -> None:
+        """Test calling functions of a module imported once."""
+        (tmp_path / "tools.py").write_text(PYTHON_MODULE, encoding="utf-8")
+        adapter = PythonAdapter({"module": "tools.py", "cwd": str(tmp_path)})
+
+        async def run() -> list[str]:
+            return [
+                await adapter.execute_tool({"name": "add"}, {"a": 1, "b": 2}),
+                await adapter.execute_tool({"name": "add"}, {"a": 3, "b": 4}),
+                await adapter.execute_tool(
+                    {"name": "say_hello", "function": "greet"}, {"name": "bob"}
+                ),
+                await adapter.execute_tool({"name": "fail"}, {}),
+                await adapter.execute_tool({"name": "missing"}, {}),
+            ]
+
+        results = asyncio.run(run())
+        assert results[:3] == ["3", "7", "hello bob"]
+        assert results[3] == "Error calling fail: nope"
+        assert results[4].startswith("Error: Function 'missing' not found")
+        assert adapter.module is not None
+        assert adapter.module.calls == ["add", "add"]
+
+    def test_sibling_imports_and_printed_output(
+        self, tmp_path: Path, capsys: Any
+    ) -> None:
+        """Test importing sibling modules and keeping prints off stdout."""
+        (tmp_path / "helpers.py").write_text("SUFFIX = '!'\n", encoding="utf-8")
+        (tmp_path / "loud.py").write_text(
+            "from helpers import SUFFIX\n\n"
+            "def shout(text):\n"
+            "    print('shouting')\n"
+            "    return text.upper() + SUFFIX\n",
+            encoding="utf-8",
+        )
+        adapter = PythonAdapter({"module": "loud.py", "cwd": str(tmp_path)})
+
+        try:
+            result = asyncio.run(
+                adapter.execute_tool({"name": "shout"}, {"text": "hi"})
+            )
+        finally:
+            sys.modules.pop("loud", None)
+            sys.modules.pop("helpers", None)
+
+        assert result == "HI!"
+        captured = capsys.readouterr()
+        assert "shouting" not in captured.out
+        assert "shouting" in captured.err
+
+
+class TestWebSocketAdapter:
+    """Test WebSocketAdapter against a local aiohttp server."""
+
+    def test_multiplexed_calls_and_reconnect(self) -> None:
+        """Test out-of-order replies and reconnecting after a drop."""
+        connections = 0
+
+        async def handler(request: web.Request) -> web.WebSocketResponse:
+            nonlocal connections
+            connections += 1
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+
+            async def answer(data: dict) -> None:
+                # Answer later requests first
+                await asyncio.sleep(0.3 - 0.1 * data["parameters"]["n"])
+                await ws.send_json({"id": data["id"], "result": data["parameters"]})
+
+            async for message in ws:
+                data = message.json()
+                if data["tool"] == "drop":
+                    await ws.close()
+                    break
+                asyncio.create_task(answer(data))
+            return ws
+
+        async def run() -> tuple[list[str], str, str]:
+            app = web.Application()
+            app.router.add_get("/ws", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+
+            adapter = WebSocketAdapter(
+                {"url": f"ws://127.0.0.1:{port}/ws", "reconnect_delay": 0.05}
+            )
+            tool = {"name": "echo"}
+            assert not adapter.is_up()
+            try:
+                results = await asyncio.gather(
+                    *(adapter.execute_tool(tool, {"n": i}) for i in range(3))
+                )
+                assert adapter.is_up()
+                dropped = await adapter.execute_tool({"name": "drop"}, {})
+                # Down while reconnecting
+                assert not adapter.is_up()
+                after = await adapter.execute_tool(tool, {"n": 0})
+                assert adapter.is_up()
+                return list(results), dropped, after
+            finally:
+                await adapter.stop()
+                assert not adapter.is_up()
+                await runner.cleanup()
+
+        results, dropped, after = asyncio.run(run())
+        assert results == ['{"n": 0}', '{"n": 1}', '{"n": 2}']
+        assert dropped.startswith("WebSocket request failed")
+        assert after == '{"n": 0}'
+        assert connections == 2
+
+    def test_reconnect_backs_off_after_drops(self) -> None:
+        """Test that connections dropped right away are retried with backoff."""
+        connections = 0
+        four_made = asyncio.Event()
+
+        async def handler(request: web.Request) -> web.WebSocketResponse:
+            nonlocal connections
+            connections += 1
+            if connections == 4:
+                four_made.set()
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            await ws.close()
+            return ws
+
+        async def run() -> int:
+            app = web.Application()
+            app.router.add_get("/ws", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+
+            adapter = WebSocketAdapter(
+                {"url": f"ws://127.0.0.1:{port}/ws", "reconnect_delay": 0.05}
+            )
+            try:
+                await adapter.start()
+                # Delays of 0.05, 0.1 and 0.2s come before the fourth
+                # connection, the fifth waits another 0.4s
+                await asyncio.wait_for(four_made.wait(), 10)
+                await asyncio.sleep(0.2)
+                return connections
+            finally:
+                await adapter.stop()
+                await runner.cleanup()
+
+        assert asyncio.run(run()) == 4
@@ -0,0 +1,112 @@
+"""Tests for the detectors' LLM response cache."""
+
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+from conftest import FakeCompletions
+
+from mcpify.detect.cache import LLMResponseCache
+from mcpify.detect.openai import OpenaiDetector
+from mcpify.detect.types import ProjectInfo
+
+TOOLS_RESPONSE = json.dumps(
+    [{"name": "greet", "description": "Say hello", "args": [], "parameters": []}]
+)
+
+
+def _project_info() -> ProjectInfo:
+    """Build minimal project information."""
+    return ProjectInfo(
+        name="demo",
+        description="Demo project",
+        main_files=["main.py"],
+        readme_content="",
+        project_type="cli",
+        dependencies=[],
+    )
+
+
+class TestResponseCache:
+    """Test the on-disk response cache."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Stored responses are returned for the same key."""
+        cache = LLMResponseCache(tmp_path)
+        key = LLMResponseCache.key("gpt-4", 1, "prompt")
+
+        assert cache.get(key) is None
+        cache.put(key, "response")
+        assert cache.get(key) == "response"
+        assert (tmp_path / key[:2] / key).exists()
+
+    def test_key_covers_all_inputs(self) -> None:
+        """Changing the model, version or prompt changes the key."""
+        key = LLMResponseCache.key("gpt-4", 1, "prompt")
+        assert key == LLMResponseCache.key("gpt-4", 1, "prompt")
+        assert key != LLMResponseCache.key("gpt-4o", 1, "prompt")
+        assert key != LLMResponseCache.key("gpt-4", 2, "prompt")
+        assert key != LLMResponseCache.key("gpt-4", 1, "other prompt")
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """Oldest entries are removed once the size limit is exceeded."""
+        cache = LLMResponseCache(tmp_path, max_bytes=25)
+        keys = [LLMResponseCache.key(i) for i in range(3)]
+        for age, key in enumerate(keys[:2]):
+            cache.put(key, "x" * 10)
+            mtime = 1000 + age
+            os.utime(cache._path(key), (mtime, mtime))
+
+        # Reading the oldest entry makes it the most recently used
+        assert cache.get(keys[0]) is not None
+        cache.put(keys[2], "x" * 10)
+
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+
+
+class TestDetectorCache:
+    """Test LLM response caching in the OpenAI detector."""
+
+    def test_repeat_detection_uses_cache(
+        self, openai_detector: Callable[..., OpenaiDetector]
+    ) -> None:
+        """A second detection with the same context doesn't call the model."""
+        completions = FakeCompletions(lambda prompt: TOOLS_RESPONSE)
+        detector = openai_detector(completions)
+
+        first = detector._llm_detect_tools("context", _project_info())
+        second = detector._llm_detect_tools("context", _project_info())
+
+        assert first == second
+        assert [tool["name"] for tool in second] == ["greet"]
+        assert completions.calls == 1
+
+        detector._llm_detect_tools("changed context", _project_info())
+        assert completions.calls == 2
+
+    def test_no_cache(
+        self, openai_detector: Callable[..., OpenaiDetector], cache_dir: Path
+    ) -> None:
+        """Disabling the cache queries the model every time."""
+        completions = FakeCompletions(lambda prompt: TOOLS_RESPONSE)
+        detector = openai_detector(completions, use_cache=False)
+
+        detector._llm_detect_tools("context", _project_info())
+        detector._llm_detect_tools("context", _project_info())
+
+        assert completions.calls == 2
+        assert not cache_dir.exists()
+
+    def test_unparseable_response_not_cached(
+        self, openai_detector: Callable[..., OpenaiDetector]
+    ) -> None:
+        """Responses that fail to parse are retried on the next run."""
+        completions = FakeCompletions(lambda prompt: "not json")
+        detector = openai_detector(completions)
+
+        assert detector._llm_detect_tools("context", _project_info()) == []
+        assert detector._llm_detect_tools("context", _project_info()) == []
+        assert completions.calls == 2
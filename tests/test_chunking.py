@@ -0,0 +1,159 @@
+"""Tests for chunked detection over large code digests."""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from conftest import FakeCompletions
+
+from mcpify.detect.base import BaseDetector
+from mcpify.detect.chunking import merge_tool_specs, split_digest, split_files
+from mcpify.detect.openai import OpenaiDetector
+from mcpify.detect.types import ToolSpec
+
+SEPARATOR = "=" * 48
+
+
+def _file(path: str, body: str) -> str:
+    """Format one file the way GitIngest does in a digest."""
+    return f"{SEPARATOR}\nFILE: {path}\n{SEPARATOR}\n{body}\n\n"
+
+
+def _tools_per_file(prompt: str) -> str:
+    """Answer a detection prompt with one tool per function seen."""
+    tools = [
+        {"name": line.split()[-1], "description": "Found", "parameters": []}
+        for line in prompt.splitlines()
+        if line.startswith("def ")
+    ]
+    return json.dumps(tools)
+
+
+class TestSplitDigest:
+    """Test splitting digests on file boundaries."""
+
+    def test_split_files(self) -> None:
+        """Each file header starts a new section."""
+        digest = "Summary\n" + _file("a.py", "x = 1") + _file("b.py", "y = 2")
+        sections = split_files(digest)
+
+        assert len(sections) == 3
+        assert sections[0] == "Summary\n"
+        assert "FILE: a.py" in sections[1] and "y = 2" not in sections[1]
+        assert sections[2].startswith(SEPARATOR)
+
+    def test_chunks_respect_budget(self) -> None:
+        """Files are packed into chunks without splitting small files."""
+        digest = "".join(_file(f"f{i}.py", "x" * 300) for i in range(10))
+        chunks = split_digest(digest, max_tokens=200)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 200 * 4 for chunk in chunks)
+        assert "".join(chunks) == digest
+
+    def test_large_file_split_on_lines(self) -> None:
+        """A file over budget is split into pieces that repeat its header."""
+        body = "\n".join(f"line {i}" for i in range(200))
+        chunks = split_digest(_file("big.py", body), max_tokens=100)
+
+        assert len(chunks) > 1
+        assert all(chunk.count("FILE: big.py") == 1 for chunk in chunks)
+        assert all(len(chunk) <= 100 * 4 for chunk in chunks)
+
+    def test_small_digest_is_one_chunk(self) -> None:
+        """Digests within budget are not split."""
+        digest = _file("a.py", "x = 1")
+        assert split_digest(digest, max_tokens=1000) == [digest]
+
+
+class TestMergeToolSpecs:
+    """Test the reduce step over per-chunk tools."""
+
+    def test_duplicates_merged(self) -> None:
+        """Tools found in several chunks are combined by name."""
+        first = ToolSpec(
+            name="search",
+            description="Search",
+            args=["search", "{query}"],
+            parameters=[{"name": "query", "type": "string"}],
+        )
+        second = ToolSpec(
+            name="Search",
+            description="Search the index for documents",
+            args=[],
+            parameters=[
+                {"name": "query", "type": "string"},
+                {"name": "limit", "type": "integer"},
+            ],
+        )
+        other = ToolSpec(name="index", description="Index", args=[], parameters=[])
+
+        merged = merge_tool_specs([[first], [second, other]])
+
+        assert [tool.name for tool in merged] == ["search", "index"]
+        assert merged[0].description == "Search the index for documents"
+        assert merged[0].args == ["search", "{query}"]
+        assert [param["name"] for param in merged[0].parameters] == [
+            "query",
+            "limit",
+        ]
+        # The inputs are left untouched
+        assert len(first.parameters) == 1
+
+
+class TestChunkedDetection:
+    """Test map-reduce detection in the OpenAI detector."""
+
+    def test_detect_from_large_content(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        openai_detector: Callable[..., OpenaiDetector],
+    ) -> None:
+        """Chunks are analysed concurrently and their tools merged."""
+        # Calls are held until three are in flight together
+        completions = FakeCompletions(_tools_per_file, overlap=3)
+        detector = openai_detector(completions, use_cache=False, max_parallel_chunks=3)
+        monkeypatch.setattr(detector, "CHUNK_TOKENS", 300)
+
+        # Every file defines its own tool and a shared one
+        digest = "".join(
+            _file(f"mod{i}.py", f"def tool_{i}\ndef shared\n" + "#" * 800)
+            for i in range(6)
+        )
+        result = detector._detect_from_content(digest)
+
+        names = sorted(tool.name for tool in result.tools)
+        assert names == sorted([f"tool_{i}" for i in range(6)] + ["shared"])
+        assert completions.calls == 6
+        assert completions.peak == 3
+
+    def test_default_chunk_detection(self) -> None:
+        """Detectors without chunk detection analyse each chunk in one shot."""
+
+        class SingleShotDetector(BaseDetector):
+            def __init__(self) -> None:
+                self.max_parallel_chunks = 2
+
+            def _detect_tools(self, project_path: Any, project_info: Any) -> Any:
+                return []
+
+            def _detect_from_content(self, code_content: str) -> Any:
+                result = super()._detect_from_content(code_content)
+                result.tools = [
+                    ToolSpec(
+                        name=line.split()[-1], description="", args=[], parameters=[]
+                    )
+                    for line in code_content.splitlines()
+                    if line.startswith("def ")
+                ]
+                return result
+
+        detector = SingleShotDetector()
+        detector.CHUNK_TOKENS = 300
+        digest = "".join(
+            _file(f"mod{i}.py", f"def tool_{i}\n" + "#" * 800) for i in range(3)
+        )
+        tools = detector._detect_tools_chunked(digest, None)  # type: ignore[arg-type]
+
+        assert sorted(tool.name for tool in tools) == [f"tool_{i}" for i in range(3)]
@@ -0,0 +1,169 @@
+"""Tests for the static pre-pass that narrows the LLM detectors' context."""
+
+import textwrap
+from pathlib import Path
+
+from mcpify.detect.context import build_context, compact_digest, extract_snippets
+from mcpify.detect.openai import OpenaiDetector
+
+SEPARATOR = "=" * 48
+
+CLI = textwrap.dedent(
+    '''
+    import argparse
+
+
+    def helper(value):
+        return value * 2
+
+
+    def main():
+        """Run the tool."""
+        parser = argparse.ArgumentParser(description="Greeter")
+        parser.add_argument("--name", required=True, help="Who to greet")
+        args = parser.parse_args()
+        print(f"Hello {args.name}")
+
+
+    if __name__ == "__main__":
+        main()
+    '''
+)
+
+MODELS = textwrap.dedent(
+    """
+    from pydantic import BaseModel
+
+
+    class TodoBase(BaseModel):
+        title: str
+        done: bool = False
+
+
+    class Todo(TodoBase):
+        id: int
+    """
+)
+
+
+def _file(path: str, body: str) -> str:
+    """Format one file the way GitIngest does in a digest."""
+    return f"{SEPARATOR}\nFILE: {path}\n{SEPARATOR}\n{body}\n\n"
+
+
+class TestExtractSnippets:
+    """Test summarizing one file into snippets."""
+
+    def test_parser_statements_are_extracted(self) -> None:
+        """A function building a parser is summarized by its parser calls."""
+        snippets = extract_snippets("cli.py", CLI)
+        text = "\n".join(snippet.text for snippet in snippets)
+
+        assert 'parser.add_argument("--name", required=True' in text
+        assert "print(" not in text
+        assert max(snippets, key=lambda s: s.score).text.startswith("def main():")
+
+    def test_subclassed_models_keep_their_fields(self) -> None:
+        """Models deriving from a model of the same file keep their fields."""
+        snippets = extract_snippets("models.py", MODELS)
+        texts = {snippet.text.splitlines()[0]: snippet.text for snippet in snippets}
+
+        assert "title: str" in texts["class TodoBase(BaseModel):"]
+        assert "id: int" in texts["class Todo(TodoBase):"]
+
+    def test_flask_views_keep_request_reads(self) -> None:
+        """Flask views show the request data they read."""
+        source = textwrap.dedent(
+            """
+            from flask import Flask, request
+
+            app = Flask(__name__)
+
+
+            @app.route("/search")
+            def search():
+                term = request.args["q"]
+                results = find(term)
+                return results
+            """
+        )
+        (snippet,) = extract_snippets("app.py", source)
+
+        assert 'term = request.args["q"]' in snippet.text
+        assert "find(term)" not in snippet.text
+
+
+class TestBuildContext:
+    """Test ranking snippets into a context budget."""
+
+    def test_context_includes_code_past_old_truncation(self) -> None:
+        """A route far into a large file still reaches the context."""
+        filler = "".join(f"\nCONSTANT_{i} = {i}\n" for i in range(500))
+        source = (
+            "from fastapi import FastAPI\n\napp = FastAPI()\n"
+            + filler
+            + '\n@app.get("/items/{item_id}")\ndef read_item(item_id: int) -> dict:\n'
+            + "    return {}\n"
+        )
+        assert len(source) > 3000
+
+        context = build_context({"main.py": source}, 2000)
+
+        assert '@app.get("/items/{item_id}")' in context
+        assert "CONSTANT_" not in context
+
+    def test_context_ranks_snippets_into_budget(self) -> None:
+        """The most relevant snippets are kept when the budget is tight."""
+        sources = {"cli.py": CLI, "models.py": MODELS}
+
+        context = build_context(sources, 200)
+
+        assert len(context) <= 200
+        assert "--name" in context
+        assert "def helper" not in context
+        assert "TodoBase" not in context
+        assert build_context({"empty.py": "X = 1\n"}, 400) == ""
+
+
+class TestCompactDigest:
+    """Test compacting GitIngest digests."""
+
+    def test_compact_digest_drops_irrelevant_files(self) -> None:
+        """Python files are summarized and ones without snippets are dropped."""
+        digest = (
+            "Directory structure:\n└── project/\n\n"
+            + _file("project/constants.py", "X = 1\n")
+            + _file("project/models.py", MODELS)
+            + _file("project/cli.py", CLI)
+            + _file("project/README.md", "# Greeter\n")
+        )
+
+        compacted = compact_digest(digest)
+
+        assert compacted.startswith("Directory structure:")
+        assert "FILE: project/constants.py" not in compacted
+        assert compacted.index("project/cli.py") < compacted.index("project/models.py")
+        assert compacted.index("project/models.py") < compacted.index("README.md")
+        assert 'print(f"Hello' not in compacted
+        assert len(compacted) < len(digest)
+
+    def test_compact_digest_keeps_digests_without_python(self) -> None:
+        """Digests without Python snippets are returned unchanged."""
+        digest = _file("project/index.js", "console.log('hi')\n")
+
+        assert compact_digest(digest) == digest
+
+
+class TestDetectorContext:
+    """Test the context the LLM detectors send."""
+
+    def test_openai_context_uses_relevant_code(self, tmp_path: Path) -> None:
+        """The OpenAI detector sends ranked snippets instead of file prefixes."""
+        (tmp_path / "cli.py").write_text(CLI)
+        detector = OpenaiDetector(openai_api_key="test", use_cache=False)
+        project_info = detector._extract_project_info(tmp_path)
+
+        context = detector._gather_project_context(tmp_path, project_info)
+
+        assert "Relevant code:" in context
+        assert "--name" in context
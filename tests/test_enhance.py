@@ -0,0 +1,104 @@
+"""Tests for the concurrent tool enhancement pass."""
+
+import asyncio
+import json
+from collections.abc import Callable
+
+import pytest
+from conftest import AsyncFakeCompletions
+
+from mcpify.detect.openai import OpenaiDetector
+from mcpify.detect.types import ToolSpec
+
+
+def _improve(prompt: str) -> str:
+    """Answer an enhancement prompt with a better description."""
+    name = prompt.split("Tool: ", 1)[1].split("\n", 1)[0]
+    if name == "broken":
+        return "not json"
+    return json.dumps({"name": name, "description": f"Better {name}"})
+
+
+def _tools(count: int) -> list[ToolSpec]:
+    """Build tools to enhance."""
+    return [
+        ToolSpec(name=f"tool_{i}", description="", args=[], parameters=[])
+        for i in range(count)
+    ]
+
+
+class TestEnhanceTools:
+    """Test enhancing tools with the async OpenAI client."""
+
+    def test_concurrent_and_bounded(
+        self, openai_detector: Callable[..., OpenaiDetector]
+    ) -> None:
+        """Tools are enhanced concurrently, at most enhance_concurrency at once."""
+        # Calls are held until five are in flight together
+        completions = AsyncFakeCompletions(_improve, overlap=5)
+        detector = openai_detector(
+            async_completions=completions, use_cache=False, enhance_concurrency=5
+        )
+        client = detector._async_client()
+
+        enhanced = detector._enhance_tools(_tools(20), "context")
+
+        assert [tool.description for tool in enhanced] == [
+            f"Better tool_{i}" for i in range(20)
+        ]
+        assert completions.calls == 20
+        assert completions.peak == 5
+        assert client.closed
+
+    def test_failures_keep_original_tool(
+        self, openai_detector: Callable[..., OpenaiDetector]
+    ) -> None:
+        """A tool whose enhancement fails is returned unchanged."""
+        detector = openai_detector(
+            async_completions=AsyncFakeCompletions(_improve), use_cache=False
+        )
+        broken = ToolSpec(name="broken", description="Keep", args=[], parameters=[])
+
+        enhanced = detector._enhance_tools([broken, *_tools(1)], "context")
+
+        assert enhanced[0] is broken
+        assert enhanced[1].description == "Better tool_0"
+
+    def test_enhancements_are_cached(
+        self, openai_detector: Callable[..., OpenaiDetector]
+    ) -> None:
+        """Repeat enhancement of the same tools doesn't call the model."""
+        completions = AsyncFakeCompletions(_improve)
+        detector = openai_detector(async_completions=completions)
+
+        detector._enhance_tools(_tools(3), "context")
+        again = detector._enhance_tools(_tools(3), "context")
+
+        assert completions.calls == 3
+        assert again[2].description == "Better tool_2"
+
+    def test_called_from_running_loop(
+        self, openai_detector: Callable[..., OpenaiDetector]
+    ) -> None:
+        """Enhancement works when called from inside an event loop."""
+        completions = AsyncFakeCompletions(_improve)
+        detector = openai_detector(async_completions=completions, use_cache=False)
+
+        async def run() -> list[ToolSpec]:
+            return detector._enhance_tools(_tools(2), "context")
+
+        enhanced = asyncio.run(run())
+
+        assert [tool.description for tool in enhanced] == [
+            "Better tool_0",
+            "Better tool_1",
+        ]
+        assert completions.calls == 2
+
+    def test_concurrency_must_be_positive(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A concurrency below one is rejected."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        with pytest.raises(ValueError):
+            OpenaiDetector(enhance_concurrency=0)
@@ -0,0 +1,73 @@
+"""
+Startup regression tests for MCPify.
+
+MCP clients spawn a stdio server per session, so serving a config must not
+import the detectors or the LLM SDKs behind them.
+"""
+
+import subprocess
+import sys
+
+# Modules the serve path must not load
+DETECTION_MODULES = ("mcpify.detect", "openai", "camel")
+
+# Slow imports the bare package must leave to the code that needs them
+HEAVY_MODULES = (*DETECTION_MODULES, "mcp", "starlette", "pydantic", "aiohttp")
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Run a statement under -X importtime, returning cumulative microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def _loaded_modules(statement: str) -> set[str]:
+    """Run a statement in a fresh interpreter, returning sys.modules after it."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+class TestStartup:
+    """Test that imports stay lazy."""
+
+    def test_package_import_is_lazy(self) -> None:
+        """Importing the package loads none of its submodules."""
+        modules = _loaded_modules("import mcpify")
+        assert "mcpify" in modules
+        assert not [name for name in modules if name.startswith("mcpify.")]
+        for module in HEAVY_MODULES:
+            assert module not in modules, f"{module} imported with the package"
+
+    def test_serve_path_skips_detection(self) -> None:
+        """The serve command's imports leave out detectors and HTTP clients."""
+        times = _import_times("import mcpify.cli, mcpify.wrapper, mcpify.backend")
+        assert "mcpify.wrapper" in times
+        for module in (*DETECTION_MODULES, "aiohttp"):
+            assert module not in times, f"{module} imported while serving"
+
+    def test_detector_import_is_selective(self) -> None:
+        """Importing one detector doesn't load the other's SDK."""
+        times = _import_times("from mcpify.detect import OpenaiDetector")
+        assert "openai" in times
+        assert "mcpify.detect.camel" not in times
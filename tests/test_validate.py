@@ -263,6 +263,153 @@ class TestMCPConfigValidator:
         assert any("backend.config.args" in field for field in error_fields)
         assert "backend.config.cwd" in error_fields
 
+    def test_invalid_commandline_max_concurrency(self) -> None:
+        """Test validation of the commandline max_concurrency option."""
+        config = {
+            "name": "test-api",
+            "description": "Test description",
+            "backend": {
+                "type": "commandline",
+                "config": {"command": "python3", "max_concurrency": 0},
+            },
+            "tools": [],
+        }
+
+        result = self.validator.validate_config(config)
+        assert result.is_valid is False
+        error_fields = [error.field for error in result.errors]
+        assert "backend.config.max_concurrency" in error_fields
+
+        config["backend"]["config"]["max_concurrency"] = 4
+        assert self.validator.validate_config(config).is_valid is True
+
+    def test_server_backend_pool(self) -> None:
+        """Test validation of server backend pool options."""
+        config = {
+            "name": "test-api",
+            "description": "Test description",
+            "backend": {
+                "type": "server",
+                "config": {
+                    "command": "python3",
+                    "pool_size": 0,
+                    "queue_timeout": -1,
+                    "protocol": "xml",
+                    "max_in_flight": 0,
+                },
+            },
+            "tools": [
+                {
+                    "name": "add",
+                    "description": "Add two numbers",
+                    "command": "add {a} {b}",
+                    "parameters": [
+                        {"name": "a", "type": "number", "description": "First"},
+                        {"name": "b", "type": "number", "description": "Second"},
+                    ],
+                }
+            ],
+        }
+
+        result = self.validator.validate_config(config)
+        assert result.is_valid is False
+        error_fields = [error.field for error in result.errors]
+        assert "backend.config.pool_size" in error_fields
+        assert "backend.config.queue_timeout" in error_fields
+        assert "backend.config.protocol" in error_fields
+        assert "backend.config.max_in_flight" in error_fields
+
+        config["backend"]["config"].update(
+            pool_size=4, queue_timeout=2.5, protocol="jsonl", max_in_flight=16
+        )
+        assert self.validator.validate_config(config).is_valid is True
+
+    def test_server_backend_supervision(self) -> None:
+        """Test validation of server backend health checks and restarts."""
+        config = {
+            "name": "test-api",
+            "description": "Test description",
+            "backend": {
+                "type": "server",
+                "config": {
+                    "command": "python3",
+                    "supervise": "yes",
+                    "health_command": 1,
+                    "health_interval": 0,
+                    "restart_delay": "fast",
+                },
+            },
+            "tools": [
+                {
+                    "name": "add",
+                    "description": "Add two numbers",
+                    "command": "add {a} {b}",
+                    "parameters": [
+                        {"name": "a", "type": "number", "description": "First"},
+                        {"name": "b", "type": "number", "description": "Second"},
+                    ],
+                }
+            ],
+        }
+
+        result = self.validator.validate_config(config)
+        assert result.is_valid is False
+        error_fields = [error.field for error in result.errors]
+        assert "backend.config.supervise" in error_fields
+        assert "backend.config.health_command" in error_fields
+        assert "backend.config.health_interval" in error_fields
+        assert "backend.config.restart_delay" in error_fields
+
+        config["backend"]["config"] = {
+            "command": "python3",
+            "health_command": "ping",
+            "health_expect": "pong",
+            "health_interval": 5,
+            "restart_delay": 0.5,
+            "max_restart_delay": 30,
+        }
+        assert self.validator.validate_config(config).is_valid is True
+
+    def test_server_tools_use_command(self) -> None:
+        """Test that server tools need a command rather than args."""
+        config = {
+            "name": "test-api",
+            "description": "Test description",
+            "backend": {"type": "server", "config": {"command": "python3"}},
+            "tools": [
+                {
+                    "name": "add",
+                    "description": "Add two numbers",
+                    "command": "add {a} {b}",
+                    "parameters": [
+                        {"name": "a", "type": "number", "description": "First"},
+                        {"name": "b", "type": "number", "description": "Second"},
+                    ],
+                }
+            ],
+        }
+        result = self.validator.validate_config(config)
+        assert result.is_valid is True
+        assert result.warnings == []
+
+        # Parameters are checked against the placeholders in the command
+        config["tools"][0]["command"] = "add {a} {c}"
+        result = self.validator.validate_config(config)
+        assert [error.message for error in result.errors] == [
+            "Parameter 'c' used in command but not defined"
+        ]
+        assert [warning.message for warning in result.warnings] == [
+            "Parameter 'b' defined but not used in command"
+        ]
+
+        config["tools"][0]["command"] = ["add", "{a}", "{b}"]
+        result = self.validator.validate_config(config)
+        assert [error.field for error in result.errors] == ["tools[0].command"]
+
+        del config["tools"][0]["command"]
+        result = self.validator.validate_config(config)
+        assert [error.field for error in result.errors] == ["tools[0].command"]
+
     def test_invalid_http_backend(self) -> None:
         """Test validation with invalid HTTP backend."""
         config = {
@@ -285,6 +432,80 @@ class TestMCPConfigValidator:
         assert "backend.config.base_url" in error_fields
         assert "backend.config.timeout" in error_fields
 
+    def test_http_backend_pool_options(self) -> None:
+        """Test validation of HTTP connection pool options."""
+        config = {
+            "name": "http-api",
+            "description": "Test description",
+            "backend": {
+                "type": "http",
+                "config": {
+                    "base_url": "http://localhost:8000",
+                    "max_connections": -1,
+                    "read_timeout": 0,
+                    "unix_socket": 42,
+                },
+            },
+            "tools": [],
+        }
+
+        result = self.validator.validate_config(config)
+        assert result.is_valid is False
+        error_fields = [error.field for error in result.errors]
+        assert "backend.config.max_connections" in error_fields
+        assert "backend.config.read_timeout" in error_fields
+        assert "backend.config.unix_socket" in error_fields
+
+        config["backend"]["config"].update(
+            max_connections=50, read_timeout=5, unix_socket="/tmp/api.sock"
+        )
+        assert self.validator.validate_config(config).is_valid is True
+
+    def test_http_backend_retry_options(self) -> None:
+        """Test validation of HTTP retry and circuit breaker options."""
+        config = {
+            "name": "http-api",
+            "description": "Test description",
+            "backend": {
+                "type": "http",
+                "config": {
+                    "base_url": "http://localhost:8000",
+                    "retries": -1,
+                    "retry_backoff": 0,
+                    "circuit_failure_threshold": 2.5,
+                },
+            },
+            "tools": [],
+        }
+
+        result = self.validator.validate_config(config)
+        assert result.is_valid is False
+        error_fields = [error.field for error in result.errors]
+        assert "backend.config.retries" in error_fields
+        assert "backend.config.retry_backoff" in error_fields
+        assert "backend.config.circuit_failure_threshold" in error_fields
+
+        config["backend"]["config"].update(
+            retries=3, retry_backoff=0.1, circuit_failure_threshold=0
+        )
+        assert self.validator.validate_config(config).is_valid is True
+
+    def test_python_backend(self) -> None:
+        """Test validation of the Python module backend."""
+        config = {
+            "name": "python-api",
+            "description": "Test description",
+            "backend": {"type": "python", "config": {}},
+            "tools": [],
+        }
+
+        result = self.validator.validate_config(config)
+        assert result.is_valid is False
+        assert any(e.field == "backend.config.module" for e in result.errors)
+
+        config["backend"]["config"] = {"module": "main"}
+        assert self.validator.validate_config(config).is_valid is True
+
     def test_invalid_websocket_backend(self) -> None:
         """Test validation with invalid WebSocket backend."""
         config = {
@@ -350,6 +571,118 @@ class TestMCPConfigValidator:
         assert len(result.errors) > 0
         assert len(result.warnings) > 0
 
+    def test_arg_groups_and_optional_parameters(self) -> None:
+        """Test validation of arg groups and optional parameters."""
+        config = {
+            "name": "test-api",
+            "description": "Test description",
+            "backend": {"type": "commandline", "config": {"command": "grep"}},
+            "tools": [
+                {
+                    "name": "search",
+                    "description": "Search files",
+                    "args": ["--pattern={pattern}", ["-m", "{limit}"], []],
+                    "parameters": [
+                        {
+                            "name": "pattern",
+                            "type": "string",
+                            "description": "Pattern to search for",
+                        },
+                        {
+                            "name": "limit",
+                            "type": "integer",
+                            "description": "Maximum matches",
+                            "required": "no",
+                        },
+                    ],
+                }
+            ],
+        }
+
+        result = self.validator.validate_config(config)
+        assert result.is_valid is False
+        error_fields = [error.field for error in result.errors]
+        assert error_fields == ["tools[0].args[2]", "tools[0].parameters[1].required"]
+        assert not result.warnings
+
+        config["tools"][0]["args"].pop()
+        config["tools"][0]["parameters"][1]["required"] = False
+        assert self.validator.validate_config(config).is_valid is True
+
+    def test_tool_limits(self) -> None:
+        """Test validation of per-tool timeout and concurrency limits."""
+        config = {
+            "name": "test-api",
+            "description": "Test description",
+            "backend": {"type": "commandline", "config": {"command": "python3"}},
+            "tools": [
+                {
+                    "name": "slow",
+                    "description": "A slow tool",
+                    "args": ["slow"],
+                    "timeout": 0,
+                    "max_concurrency": 0,
+                    "max_queue": -1,
+                    "max_output_bytes": 0,
+                    "stream": "yes",
+                    "paginate": 1,
+                }
+            ],
+        }
+
+        result = self.validator.validate_config(config)
+        assert result.is_valid is False
+        error_fields = [error.field for error in result.errors]
+        assert "tools[0].timeout" in error_fields
+        assert "tools[0].max_concurrency" in error_fields
+        assert "tools[0].max_queue" in error_fields
+        assert "tools[0].max_output_bytes" in error_fields
+        assert "tools[0].stream" in error_fields
+        assert "tools[0].paginate" in error_fields
+
+        config["tools"][0].update(
+            timeout=120,
+            max_concurrency=2,
+            max_queue=0,
+            max_output_bytes=65536,
+            stream=True,
+            paginate=False,
+        )
+        assert self.validator.validate_config(config).is_valid is True
+
+        del config["tools"][0]["max_concurrency"]
+        result = self.validator.validate_config(config)
+        assert any(w.field == "tools[0].max_queue" for w in result.warnings)
+
+    def test_tool_cache(self) -> None:
+        """Test validation of a tool's response cache block."""
+        config = {
+            "name": "http-api",
+            "description": "Test description",
+            "backend": {
+                "type": "http",
+                "config": {"base_url": "http://localhost:8000"},
+            },
+            "tools": [
+                {
+                    "name": "get_data",
+                    "description": "Get data from API",
+                    "args": ["/api/data"],
+                    "cache": {"ttl": 0, "max_entries": "many", "vary_on": "id"},
+                }
+            ],
+        }
+
+        result = self.validator.validate_config(config)
+        assert result.is_valid is False
+        error_fields = [error.field for error in result.errors]
+        assert "tools[0].cache.ttl" in error_fields
+        assert "tools[0].cache.max_entries" in error_fields
+        assert "tools[0].cache.vary_on" in error_fields
+
+        config["tools"][0]["cache"] = {"ttl": 30, "max_entries": 100, "vary_on": []}
+        assert self.validator.validate_config(config).is_valid is True
+
     def test_parameter_consistency(self) -> None:
         """Test validation of parameter consistency."""
         config = {
@@ -381,6 +714,34 @@ class TestMCPConfigValidator:
         # Should have warning for unused parameter
         assert any("unused_param" in warning.message for warning in result.warnings)
 
+    def test_http_parameters_not_expected_in_args(self) -> None:
+        """Test that HTTP tools' parameters don't need to appear in args."""
+        config = {
+            "name": "test-api",
+            "description": "Test description",
+            "backend": {"type": "http", "config": {"base_url": "http://localhost"}},
+            "tools": [
+                {
+                    "name": "get_todo",
+                    "description": "Get a todo",
+                    "args": [],
+                    "endpoint": "/todos/{todo_id}",
+                    "method": "GET",
+                    "parameters": [
+                        {
+                            "name": "todo_id",
+                            "type": "integer",
+                            "description": "Todo ID",
+                        }
+                    ],
+                }
+            ],
+        }
+
+        result = self.validator.validate_config(config)
+        assert result.is_valid is True
+        assert result.warnings == []
+
     def test_warnings_only(self) -> None:
         """Test configuration that's valid but has warnings."""
         config = {
@@ -0,0 +1,484 @@
+"""
+Unit tests for the MCPify wrapper module.
+"""
+
+import asyncio
+import inspect
+import json
+import sys
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+from mcp.types import ListToolsRequest, PaginatedRequestParams
+
+from mcpify.backend import BackendAdapter
+from mcpify.snapshot import compile_config
+from mcpify.wrapper import MCPWrapper
+
+
+class CountingAdapter(BackendAdapter):
+    """Adapter that counts calls and answers after a short delay."""
+
+    def __init__(self, delay: float = 0.1) -> None:
+        """Start with no recorded calls."""
+        self.calls = 0
+        self.delay = delay
+        self.starts = 0
+        self.stops = 0
+
+    async def start(self) -> None:
+        """Count the start."""
+        self.starts += 1
+
+    async def stop(self) -> None:
+        """Count the stop."""
+        self.stops += 1
+
+    async def execute_tool(self, tool_config: dict[str, Any], parameters: Any) -> str:
+        """Record the call and echo the tool name and message."""
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"{tool_config['name']} {parameters['message']}"
+
+
+class StreamingAdapter(CountingAdapter):
+    """Adapter that streams a fixed sequence of chunks."""
+
+    def __init__(self, chunks: list[str]) -> None:
+        """Remember the chunks to stream."""
+        super().__init__()
+        self.chunks = chunks
+        self.closed = False
+
+    async def execute_tool_stream(
+        self, tool_config: dict[str, Any], parameters: Any
+    ) -> AsyncGenerator[str, None]:
+        """Yield each chunk and record whether the stream was closed early."""
+        try:
+            for chunk in self.chunks:
+                yield chunk
+        finally:
+            self.closed = True
+
+
+class RecordingContext:
+    """Stand-in for the MCP context that records progress reports."""
+
+    def __init__(self) -> None:
+        """Start with no reports."""
+        self.reports: list[tuple[float, str | None]] = []
+
+    async def report_progress(
+        self, progress: float, total: float | None = None, message: str | None = None
+    ) -> None:
+        """Record one progress notification."""
+        self.reports.append((progress, message))
+
+
+def _write_config(tmp_path: Path, config: dict[str, Any]) -> str:
+    """Write a configuration dictionary to a temporary JSON file."""
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(config), encoding="utf-8")
+    return str(config_file)
+
+
+def _echo_config() -> dict[str, Any]:
+    """Build a commandline configuration around the echo command."""
+    return {
+        "name": "echo-api",
+        "description": "Echo command line backend",
+        "backend": {"type": "commandline", "config": {"command": "echo"}},
+        "tools": [
+            {
+                "name": "say",
+                "description": "Echo a message",
+                "args": ["{message}"],
+                "parameters": [
+                    {
+                        "name": "message",
+                        "type": "string",
+                        "description": "Message to echo",
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def _python_config(code: str, **tool_options: Any) -> dict[str, Any]:
+    """Build a commandline configuration with one tool running Python code."""
+    return {
+        "name": "python-api",
+        "description": "Python command line backend",
+        "backend": {
+            "type": "commandline",
+            "config": {"command": sys.executable, "args": ["-c"]},
+        },
+        "tools": [
+            {
+                "name": "run",
+                "description": "Run the code",
+                "args": [code],
+                **tool_options,
+            }
+        ],
+    }
+
+
+class TestMCPWrapper:
+    """Test MCPWrapper tool execution."""
+
+    def test_tool_function_is_coroutine(self, tmp_path: Path) -> None:
+        """Tool functions are registered as coroutine functions."""
+        wrapper = MCPWrapper(_write_config(tmp_path, _echo_config()))
+        tool_func = wrapper.create_tool_function(_echo_config()["tools"][0])
+
+        assert inspect.iscoroutinefunction(tool_func)
+        assert list(inspect.signature(tool_func).parameters) == ["message"]
+
+    def test_concurrent_calls_share_loop(self, tmp_path: Path) -> None:
+        """Concurrent tool calls are awaited on the caller's event loop."""
+        wrapper = MCPWrapper(_write_config(tmp_path, _echo_config()))
+        tool_func = wrapper.create_tool_function(_echo_config()["tools"][0])
+
+        async def run() -> list[Any]:
+            async with wrapper._backend_lifespan(wrapper.mcp):
+                return await asyncio.gather(
+                    *(tool_func(message=f"hello {i}") for i in range(5))
+                )
+
+        results = asyncio.run(run())
+        assert results == [f"hello {i}" for i in range(5)]
+        assert wrapper._backend_holders == 0
+
+    def test_identical_calls_are_coalesced(self, tmp_path: Path) -> None:
+        """Identical concurrent calls share one backend execution."""
+        config = _echo_config()
+        wrapper = MCPWrapper(_write_config(tmp_path, config))
+        adapter = CountingAdapter()
+        wrapper.adapter = adapter
+        tool_func = wrapper.create_tool_function(config["tools"][0])
+
+        async def run() -> list[Any]:
+            return await asyncio.gather(
+                *(tool_func(message=message) for message in ["a", "a", "a", "b"])
+            )
+
+        assert asyncio.run(run()) == ["say a", "say a", "say a", "say b"]
+        assert adapter.calls == 2
+        assert wrapper._in_flight == {}
+
+    def test_coalescing_opt_out(self, tmp_path: Path) -> None:
+        """Tools with coalesce disabled always reach the backend."""
+        config = _echo_config()
+        config["tools"][0]["coalesce"] = False
+        wrapper = MCPWrapper(_write_config(tmp_path, config))
+        adapter = CountingAdapter()
+        wrapper.adapter = adapter
+        tool_func = wrapper.create_tool_function(config["tools"][0])
+
+        async def run() -> list[Any]:
+            return await asyncio.gather(*(tool_func(message="a") for _ in range(3)))
+
+        assert asyncio.run(run()) == ["say a"] * 3
+        assert adapter.calls == 3
+
+    def test_tool_timeout(self, tmp_path: Path) -> None:
+        """Calls exceeding the tool's timeout return an error."""
+        config = _echo_config()
+        config["tools"][0]["timeout"] = 0.05
+        wrapper = MCPWrapper(_write_config(tmp_path, config))
+        wrapper.adapter = CountingAdapter(delay=1)
+        tool_func = wrapper.create_tool_function(config["tools"][0])
+
+        assert asyncio.run(tool_func(message="a")) == "Error: Tool execution timed out"
+
+    def test_max_concurrency_and_queue(self, tmp_path: Path) -> None:
+        """Calls beyond max_concurrency plus max_queue are rejected."""
+        config = _echo_config()
+        config["tools"][0].update(max_concurrency=1, max_queue=1, coalesce=False)
+        wrapper = MCPWrapper(_write_config(tmp_path, config))
+        adapter = CountingAdapter()
+        wrapper.adapter = adapter
+        tool_func = wrapper.create_tool_function(config["tools"][0])
+
+        async def run() -> list[Any]:
+            return await asyncio.gather(*(tool_func(message="a") for _ in range(3)))
+
+        results = asyncio.run(run())
+        assert results[:2] == ["say a", "say a"]
+        assert "is busy" in results[2]
+        assert adapter.calls == 2
+
+    def test_streaming_reports_progress(self, tmp_path: Path) -> None:
+        """Streaming tools report each chunk and return the whole output."""
+        config = _echo_config()
+        config["tools"][0]["stream"] = True
+        wrapper = MCPWrapper(_write_config(tmp_path, config))
+        wrapper.adapter = StreamingAdapter(["one ", "two ", "three"])
+        tool_func = wrapper.create_tool_function(config["tools"][0])
+        ctx = RecordingContext()
+
+        assert "mcp_context" in inspect.signature(tool_func).parameters
+        result = asyncio.run(tool_func(message="a", mcp_context=ctx))
+        assert result == "one two three"
+        assert ctx.reports == [(4, "one "), (8, "two "), (13, "three")]
+
+    def test_streaming_truncates_output(self, tmp_path: Path) -> None:
+        """Streamed output beyond max_output_bytes keeps its head and tail."""
+        config = _echo_config()
+        config["tools"][0].update(stream=True, max_output_bytes=6)
+        wrapper = MCPWrapper(_write_config(tmp_path, config))
+        adapter = StreamingAdapter(["abcd", "efgh", "ijkl"])
+        wrapper.adapter = adapter
+        tool_func = wrapper.create_tool_function(config["tools"][0])
+
+        result = asyncio.run(tool_func(message="a"))
+        assert result == "abc\n[... 6 bytes truncated ...]\njkl"
+        assert adapter.closed
+
+    def test_max_output_bytes(self, tmp_path: Path) -> None:
+        """Large command output is cut down to its head and tail."""
+        config = _python_config(
+            "import sys; sys.stdout.write('a' * 1000000 + 'END')", max_output_bytes=100
+        )
+        wrapper = MCPWrapper(_write_config(tmp_path, config))
+        tool_func = wrapper.create_tool_function(config["tools"][0])
+
+        result = asyncio.run(tool_func())
+        head, marker, tail = result.split("\n")
+        assert head == "a" * 50
+        assert marker == "[... 999903 bytes truncated ...]"
+        assert tail == "a" * 47 + "END"
+
+    def test_paginated_output(self, tmp_path: Path) -> None:
+        """Paginated output is served a page at a time through cursors."""
+        config = _python_config(
+            "print('\\n'.join(f'line {i:03}' for i in range(100)))",
+            max_output_bytes=400,
+            paginate=True,
+        )
+        wrapper = MCPWrapper(_write_config(tmp_path, config))
+        tool_func = wrapper.create_tool_function(config["tools"][0])
+
+        pages = []
+        response = asyncio.run(tool_func())
+        while True:
+            text, _, footer = response.partition("\n[bytes ")
+            pages.append(text)
+            if not footer:
+                break
+            cursor = footer.split('cursor "')[1].split('"')[0]
+            response = wrapper.read_output_page(cursor)
+
+        assert len(pages) == 3
+        assert "".join(pages) == "".join(f"line {i:03}\n" for i in range(100))
+        assert len(wrapper._spools) == 1
+
+        wrapper._discard_spools()
+        assert wrapper.read_output_page(cursor).startswith("Error:")
+
+    def test_optional_parameters(self, tmp_path: Path) -> None:
+        """Optional parameters default to None and drop their args."""
+        config = _echo_config()
+        config["tools"][0]["args"] = ["{message}", ["--times", "{times}"]]
+        config["tools"][0]["parameters"].append(
+            {
+                "name": "times",
+                "type": "integer",
+                "description": "Repeat count",
+                "required": False,
+            }
+        )
+        wrapper = MCPWrapper(_write_config(tmp_path, config))
+        tool_func = wrapper.create_tool_function(config["tools"][0])
+
+        assert inspect.signature(tool_func).parameters["times"].default is None
+        assert asyncio.run(tool_func(message="hi")) == "hi"
+        assert asyncio.run(tool_func(message="hi", times=2)) == "hi --times 2"
+
+    def test_optional_parameters_left_out(self, tmp_path: Path) -> None:
+        """Optional parameters left out don't reach the backend as None."""
+        socket_path = str(tmp_path / "api.sock")
+        (tmp_path / "tools.py").write_text(
+            "def scaled(value, scale=2):\n    return value * scale\n",
+            encoding="utf-8",
+        )
+        optional = {
+            "name": "scale",
+            "type": "integer",
+            "description": "Factor",
+            "required": False,
+        }
+        required = {"name": "value", "type": "integer", "description": "Value"}
+
+        async def items(request: web.Request) -> web.Response:
+            return web.Response(text=json.dumps(dict(request.query)))
+
+        http_config = {
+            "name": "http-api",
+            "backend": {
+                "type": "http",
+                "config": {"base_url": "http://localhost", "unix_socket": socket_path},
+            },
+            "tools": [
+                {
+                    "name": "items",
+                    "description": "List items",
+                    "endpoint": "/items",
+                    "method": "GET",
+                    "args": [],
+                    "parameters": [required, optional],
+                }
+            ],
+        }
+        python_config = {
+            "name": "python-api",
+            "backend": {
+                "type": "python",
+                "config": {"module": "tools.py", "cwd": str(tmp_path)},
+            },
+            "tools": [
+                {
+                    "name": "scaled",
+                    "description": "Scale a value",
+                    "args": [],
+                    "parameters": [required, optional],
+                }
+            ],
+        }
+        (tmp_path / "http").mkdir()
+        (tmp_path / "python").mkdir()
+        http = MCPWrapper(_write_config(tmp_path / "http", http_config))
+        python = MCPWrapper(_write_config(tmp_path / "python", python_config))
+
+        async def run() -> list[str]:
+            app = web.Application()
+            app.router.add_get("/items", items)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.UnixSite(runner, socket_path).start()
+            try:
+                # Go through FastMCP, which fills left out arguments with None
+                async with http._backend_lifespan(http.mcp):
+                    async with python._backend_lifespan(python.mcp):
+                        calls = [
+                            http.mcp.call_tool("items", {"value": 1}),
+                            http.mcp.call_tool("items", {"value": 1, "scale": 3}),
+                            python.mcp.call_tool("scaled", {"value": 5}),
+                            python.mcp.call_tool("scaled", {"value": 5, "scale": 3}),
+                        ]
+                        return [(await call)[0].text for call in calls]  # type: ignore[index,union-attr]
+            finally:
+                await runner.cleanup()
+
+        results = asyncio.run(run())
+        assert json.loads(results[0]) == {"value": "1"}
+        assert json.loads(results[1]) == {"value": "1", "scale": "3"}
+        assert results[2:] == ["10", "15"]
+
+    def test_http_app_holds_backend(self, tmp_path: Path) -> None:
+        """The backend outlives HTTP sessions and stops with the app."""
+        wrapper = MCPWrapper(_write_config(tmp_path, _echo_config()))
+        adapter = CountingAdapter()
+        wrapper.adapter = adapter
+        app = wrapper.mcp.streamable_http_app()
+
+        async def run() -> None:
+            async with app.router.lifespan_context(app):
+                for _ in range(3):
+                    async with wrapper._backend_lifespan(wrapper.mcp):
+                        pass
+                assert (adapter.starts, adapter.stops) == (1, 0)
+
+        asyncio.run(run())
+        assert (adapter.starts, adapter.stops) == (1, 1)
+
+    def test_health_reports_backend_state(self, tmp_path: Path) -> None:
+        """The health endpoint reflects whether the backend is up."""
+        wrapper = MCPWrapper(_write_config(tmp_path, _echo_config()))
+        adapter = CountingAdapter()
+        wrapper.adapter = adapter
+
+        response = asyncio.run(wrapper._health(None))  # type: ignore[arg-type]
+        assert response.status_code == 200
+
+        adapter.is_up = lambda: False  # type: ignore[method-assign]
+        response = asyncio.run(wrapper._health(None))  # type: ignore[arg-type]
+        assert response.status_code == 503
+        assert json.loads(response.body) == {
+            "status": "unavailable",
+            "backend_up": False,
+        }
+
+    def test_snapshot_start(self, tmp_path: Path) -> None:
+        """A compiled snapshot is loaded and serves the same tools."""
+        config_path = _write_config(tmp_path, _echo_config())
+        snapshot_path = compile_config(config_path)
+        assert snapshot_path == tmp_path / "config.snapshot"
+
+        wrapper = MCPWrapper(config_path)
+        assert wrapper._compiled_tools is not None
+
+        tools = asyncio.run(wrapper.mcp.list_tools())
+        assert [tool.name for tool in tools] == ["say"]
+        assert tools[0].inputSchema["required"] == ["message"]
+
+        result = asyncio.run(wrapper.mcp.call_tool("say", {"message": "hi"}))
+        assert result[0].text == "hi"  # type: ignore[index,union-attr]
+
+    def test_stale_snapshot_is_ignored(self, tmp_path: Path) -> None:
+        """Changing the configuration invalidates its snapshot."""
+        config_path = _write_config(tmp_path, _echo_config())
+        compile_config(config_path)
+
+        config = _echo_config()
+        config["tools"][0]["name"] = "shout"
+        _write_config(tmp_path, config)
+
+        wrapper = MCPWrapper(config_path)
+        assert wrapper._compiled_tools is None
+        assert [tool.name for tool in asyncio.run(wrapper.mcp.list_tools())] == [
+            "shout"
+        ]
+
+    def test_tools_built_on_first_call(self, tmp_path: Path) -> None:
+        """Tools are declared at startup and built when first called."""
+        wrapper = MCPWrapper(_write_config(tmp_path, _echo_config()))
+        assert list(wrapper._tool_manager.names) == ["say"]
+        assert wrapper._tool_manager.built("say") is None
+
+        result = asyncio.run(wrapper.mcp.call_tool("say", {"message": "hi"}))
+        assert result[0].text == "hi"  # type: ignore[index,union-attr]
+        assert wrapper._tool_manager.built("say") is not None
+
+    def test_tools_list_pages(self, tmp_path: Path) -> None:
+        """tools/list returns pages linked by nextCursor."""
+        config = _echo_config()
+        config["tools"] = [{**config["tools"][0], "name": f"say{i}"} for i in range(3)]
+        wrapper = MCPWrapper(_write_config(tmp_path, config))
+        wrapper.TOOLS_PAGE_SIZE = 2
+
+        first = asyncio.run(wrapper._list_tools_page(ListToolsRequest()))
+        assert [tool.name for tool in first.tools] == ["say0", "say1"]
+        assert first.nextCursor is not None
+
+        request = ListToolsRequest(
+            params=PaginatedRequestParams(cursor=first.nextCursor)
+        )
+        second = asyncio.run(wrapper._list_tools_page(request))
+        assert [tool.name for tool in second.tools] == ["say2"]
+        assert second.nextCursor is None
+        assert second.tools[0].inputSchema["required"] == ["message"]
+
+    def test_snapshot_listing_builds_nothing(self, tmp_path: Path) -> None:
+        """Listing snapshot tools uses the stored schemas."""
+        config_path = _write_config(tmp_path, _echo_config())
+        compile_config(config_path)
+        wrapper = MCPWrapper(config_path)
+
+        result = asyncio.run(wrapper._list_tools_page(ListToolsRequest()))
+        assert result.tools[0].inputSchema["required"] == ["message"]
+        assert wrapper._tool_manager.built("say") is None